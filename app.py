@@ -1,17 +1,42 @@
+import importlib
+
 import streamlit as st
-from login_page import show_login_page
-from dashboard_page import show_dashboard_page
-from fta_page import show_fta_page
-from team_page import show_team_page
-from fta_tracking import show_feedback_tracking_page
-from models import User, ATeamMember
-
-from db_session import init_db
-from db import (
-    sync_and_assign_fta_responses,
-    get_existing_assignments,
-    sync_a_team_members,
-)
+
+from log_config import setup_logging
+from bootstrap import bootstrap_process, start_sync_scheduler
+
+# Before anything logs; later reruns of this script are no-ops
+setup_logging()
+
+# Page modules pull in pandas, plotly and the sync code, so each one is
+# imported the first time its route is hit rather than on cold start.
+PAGES = {
+    "login": ("login_page", "show_login_page"),
+    "dashboard": ("dashboard_page", "show_dashboard_page"),
+    "fta": ("fta_page", "show_fta_page"),
+    "fta_tracking": ("fta_tracking", "show_feedback_tracking_page"),
+    "team": ("team_page", "show_team_page"),
+}
+
+
+def load_page(page):
+    module_name, func_name = PAGES[page]
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def load_session_data():
+    """Point this session at the shared FTA snapshot; every page after login needs it."""
+    from sync_coordinator import get_sync_coordinator
+
+    # The scheduler keeps the data fresh, so a render never starts a sync.
+    # Only a process with no data at all (not even the sheet cached on disk)
+    # waits here for the first sync.
+    snapshot = get_sync_coordinator().get_snapshot(st.secrets["secrets"]["gsheet_url"], refresh=False)
+
+    # References only: the frames are shared by every session and never modified
+    st.session_state["fta_data"] = snapshot.responses
+    st.session_state["fta_snapshot_version"] = snapshot.version
+
 
 # === CONFIG ===
 st.set_page_config(
@@ -21,23 +46,10 @@ st.set_page_config(
 )
 
 try:
-    # === Setup DB (create all tables using SQLAlchemy) ===
-    init_db()
-    sync_a_team_members()
-
-    GSHEET_URL = st.secrets["secrets"]["gsheet_url"]
-
-    # === Load session data once ===
-    if "fta_data" not in st.session_state:
-        st.session_state["fta_data"] = sync_and_assign_fta_responses(GSHEET_URL)
-
-    if "fta_assignments" not in st.session_state:
-        st.session_state["fta_assignments"] = get_existing_assignments()
-
-    # === Sync once per session ===
-    if "assigned_synced" not in st.session_state:
-        sync_and_assign_fta_responses(GSHEET_URL)
-        st.session_state["assigned_synced"] = True
+    # === Setup DB (schema + A-Team members), once per process ===
+    bootstrap_process()
+    # === Sheet sync, assignment and emails on a timer, once per process ===
+    start_sync_scheduler()
 
     # === Navigation Helper ===
     def go_to(page):
@@ -73,32 +85,36 @@ try:
 
     # === Routing Logic ===
     if st.session_state.page == "login":
-        show_login_page(go_to)
+        load_page("login")(go_to)
 
     elif st.session_state.page == "dashboard":
         if "email" not in st.session_state:
             st.warning("Please log in first.")
             go_to("login")
         else:
-            show_dashboard_page(go_to)
+            load_session_data()
+            load_page("dashboard")(go_to)
 
     elif st.session_state.page == "fta":
         if st.session_state.get("role") != "A-Team":
             st.error("🚫 You are not authorized to access the FTA page.")
             st.stop()
-        show_fta_page(go_to)
+        load_session_data()
+        load_page("fta")(go_to)
 
     elif st.session_state.page == "fta_tracking":
         if st.session_state.get("role") != "A-Team":
             st.error("🚫 You are not authorized to access the FTA Tracking page.")
             st.stop()
-        show_feedback_tracking_page(go_to)
+        load_session_data()
+        load_page("fta_tracking")(go_to)
 
     elif st.session_state.page == "team":
         if st.session_state.get("role") != "Admin":
             st.error("🚫 You are not authorized to access the A-Team Management page.")
             st.stop()
-        show_team_page(go_to)
+        load_session_data()
+        load_page("team")(go_to)
 
 except Exception as e:
     st.error("😢 **Something went wrong while trying to connect to the internet or initialize the app.**\n\nPlease check your connection and try again.")
@@ -0,0 +1,69 @@
+# benchmarks/bench_allocator.py
+# Compare the old re-sort-after-every-FTA assignment loop with the heap-based
+# LeastLoadedAllocator.
+#
+# Usage:
+#   python benchmarks/bench_allocator.py                       # 50k FTAs, 500 members
+#   python benchmarks/bench_allocator.py --ftas 10000 --members 100
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fta_allocator import LeastLoadedAllocator
+
+
+def legacy_plan(counts, items):
+    """The loop assign_new_ftas used before the allocator: re-sort after every pick."""
+    sorted_active = sorted(counts.items(), key=lambda x: x[1])
+    current_index = 0
+    plan = []
+    for item in items:
+        email = sorted_active[current_index][0]
+        plan.append((item, email))
+        sorted_active[current_index] = (email, sorted_active[current_index][1] + 1)
+        sorted_active.sort(key=lambda x: x[1])
+        current_index = (current_index + 1) % len(sorted_active)
+    return plan
+
+
+def heap_plan(counts, items):
+    return LeastLoadedAllocator(counts).plan(items)
+
+
+def final_loads(counts, plan):
+    loads = dict(counts)
+    for _, email in plan:
+        loads[email] += 1
+    return loads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FTA assignment strategies")
+    parser.add_argument("--ftas", type=int, default=50_000)
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Members start unevenly loaded, as they do after people join at different times
+    counts = {f"member{i:04d}@example.com": rng.randint(0, 200) for i in range(args.members)}
+    items = [f"FTA{i:07d}" for i in range(args.ftas)]
+
+    print(f"{args.ftas} FTAs across {args.members} members")
+    print(f"{'strategy':<8} {'seconds':>9} {'min load':>9} {'max load':>9} {'spread':>7}")
+    for name, planner in (("legacy", legacy_plan), ("heap", heap_plan)):
+        started = time.perf_counter()
+        plan = planner(counts, items)
+        elapsed = time.perf_counter() - started
+        loads = final_loads(counts, plan)
+        low, high = min(loads.values()), max(loads.values())
+        print(f"{name:<8} {elapsed:>9.3f} {low:>9} {high:>9} {high - low:>7}")
+
+
+if __name__ == "__main__":
+    main()
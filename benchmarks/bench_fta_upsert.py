@@ -0,0 +1,107 @@
+# benchmarks/bench_fta_upsert.py
+# Compare the old per-row ORM sync write path with the bulk upsert in fta_ingest.
+#
+# Usage:
+#   python benchmarks/bench_fta_upsert.py                  # 1k, 10k and 100k rows
+#   python benchmarks/bench_fta_upsert.py --sizes 1000 5000
+#
+# Each size runs two passes against a fresh temporary SQLite file:
+#   insert  - every row is new
+#   update  - every row already exists and is rewritten
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from fta_ingest import bulk_upsert_fta_responses
+from models import Base, FtaResponses
+
+
+def make_records(count, pass_no):
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "Timestamp": start + timedelta(minutes=i),
+            "Email_address": f"{pass_no}-{i:064d}"[-64:],
+            "Full_Name": f"name-{pass_no}-{i}",
+            "Phone_number": f"phone-{i}",
+            "Gender": "Female" if i % 2 else "Male",
+            "Home_Address": f"address-{i}",
+            "Service_Experience": 5,
+            "Worship_Experience": 4,
+            "Word_Experience": 4.5,
+            "General_Feedback": f"feedback pass {pass_no}",
+            "Invited_By": f"inviter-{i % 40}",
+            "Membership_Interest": "Yes",
+            "Consent": "Yes",
+            "Meeting_Date": start + timedelta(days=i % 30),
+            "FTA_ID": f"FTA{i:07d}",
+            "row_digest": f"{pass_no:064d}",
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_write(session, records):
+    """The pre-bulk path: one SELECT per row, then mutate or add an ORM object."""
+    for record in records:
+        existing = session.query(FtaResponses).filter(FtaResponses.FTA_ID == record["FTA_ID"]).first()
+        if existing:
+            for key, value in record.items():
+                setattr(existing, key, value)
+        else:
+            session.add(FtaResponses(**record))
+    session.commit()
+
+
+def bulk_write(session, records):
+    bulk_upsert_fta_responses(session, records)
+    session.commit()
+
+
+def run_case(write, count):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+
+        timings = {}
+        for pass_no, label in enumerate(("insert", "update"), start=1):
+            records = make_records(count, pass_no)
+            with Session() as session:
+                started = time.perf_counter()
+                write(session, records)
+                timings[label] = time.perf_counter() - started
+        engine.dispose()
+        return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-row and bulk fta_responses writes")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'path':<8} {'insert (s)':>11} {'update (s)':>11}")
+    for count in args.sizes:
+        results = {
+            "legacy": run_case(legacy_write, count),
+            "bulk": run_case(bulk_write, count),
+        }
+        for path, timings in results.items():
+            print(f"{count:>8} {path:<8} {timings['insert']:>11.3f} {timings['update']:>11.3f}")
+        speedup = (results["legacy"]["insert"] + results["legacy"]["update"]) / (
+            results["bulk"]["insert"] + results["bulk"]["update"]
+        )
+        print(f"{'':>8} speedup  {speedup:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+# benchmarks/bench_hot_paths.py
+# p50/p95 timings and peak memory of the sync, assignment, email log, page
+# aggregation and feedback write hot paths at several dataset sizes, written as JSON so runs can
+# be compared across commits.
+#
+# Usage:
+#   python benchmarks/bench_hot_paths.py                          # scales 1, 10 and 100, 5 runs each
+#   python benchmarks/bench_hot_paths.py --scales 1 10 --runs 10 --output before.json
+#   python benchmarks/bench_hot_paths.py --compare before.json after.json
+#
+# Each scale runs in a fresh process with FTA_DB_FILE pointing at a temporary
+# database made by generate_data.py; a local CSV stands in for the Google
+# Sheet. 1% of the sheet rows are not synced yet, so a sync has new rows to
+# insert and assign. Cases that write restore the database before every run
+# (not timed). Peak memory comes from one extra run under tracemalloc, so the
+# tracing overhead stays out of the timings. Welcome emails are queued in the
+# outbox as usual but never sent.
+
+import argparse
+import gc
+import json
+import logging
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+sys.path.insert(0, REPO_ROOT)
+
+# Share of sheet rows that the generated database has not synced yet
+NEW_ROW_FRACTION = 0.01
+# The date range the pages open with
+PAGE_START_DATE = date(2025, 1, 1)
+
+
+def measure(func, runs, warmup=1, setup=None):
+    """
+    Time `func` over `runs` runs, then trace one more run for peak memory.
+
+    Args:
+        func: Callable with no arguments
+        runs: Timed runs
+        warmup: Untimed runs first (imports, caches, SQLite page cache)
+        setup: Called before every run and left out of the timing, e.g. to
+            restore the database
+
+    Returns:
+        Dict with runs, p50_ms, p95_ms, min_ms, max_ms and peak_mb
+    """
+    timings = []
+    for i in range(warmup + runs):
+        if setup:
+            setup()
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        if i >= warmup:
+            timings.append((time.perf_counter() - started) * 1000)
+
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    p50, p95 = np.percentile(timings, [50, 95])
+    return {
+        "runs": runs,
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "min_ms": round(min(timings), 2),
+        "max_ms": round(max(timings), 2),
+        "peak_mb": round(peak / 2 ** 20, 2),
+    }
+
+
+def child(scale, workdir, runs, warmup):
+    """Generate the dataset for one scale and run every case against it; FTA_DB_FILE is already set."""
+    import pandas as pd
+
+    import db
+    import db_session
+    import generate_data
+    import sheet_cache
+    from fta_status import get_contact_counts, refresh_fta_status
+    from models import ATeamMember, Feedback
+    from page_metrics import assignment_summary, dashboard_metrics, feedback_breakdown, feedback_delete_options
+    from queries import (count_converted, get_feedback, get_feedback_members, get_feedback_rollup,
+                         get_invitee_rollup)
+    from rollups import refresh_feedback_days
+
+    logging.basicConfig(level=logging.ERROR)
+    # Queue welcome emails but never send them
+    db.dispatch_pending_emails_in_background = lambda: None
+
+    csv_path = os.path.join(workdir, "sheet.csv")
+    pristine = os.path.join(workdir, "pristine.db")
+    sizes = generate_data.scaled_sizes(scale)
+    stored = sizes["responses"] - math.ceil(sizes["responses"] * NEW_ROW_FRACTION)
+    # Everything already synced is assigned; the new rows are not
+    sizes["assignments"] = sizes["responses"]
+    rows = generate_data.generate(csv_path, pristine, sizes, stored=stored)
+
+    def restore():
+        db_session.engine.dispose()
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(db_session.DB_FILE + suffix):
+                os.remove(db_session.DB_FILE + suffix)
+        shutil.copyfile(pristine, db_session.DB_FILE)
+
+    def restore_cold():
+        restore()
+        shutil.rmtree(sheet_cache.CACHE_DIR, ignore_errors=True)
+
+    def deactivate_first_member():
+        restore()
+        with db_session.get_session() as session:
+            session.query(ATeamMember).filter_by(email="member000@example.com").update({"is_active": False})
+            session.commit()
+
+    restore()
+    sheet = pd.read_csv(csv_path)
+    sheet.columns = sheet.columns.str.strip()
+    end_date = date.today()
+
+    def load_team_page():
+        with db_session.get_session() as session:
+            get_feedback_members(session)
+            feedback = get_feedback(session, PAGE_START_DATE, end_date)
+        return db.get_all_a_team_members_with_status(), feedback
+
+    members_df, feedback_df = load_team_page()
+
+    def team_page_aggregations():
+        with db_session.get_session() as session:
+            contact_counts = get_contact_counts(session, PAGE_START_DATE, end_date)
+            feedback_rollup = get_feedback_rollup(session, PAGE_START_DATE, end_date)
+        assignment_summary(members_df, contact_counts)
+        feedback_breakdown(feedback_rollup)
+        feedback_delete_options(feedback_df)
+
+    def dashboard_aggregations():
+        with db_session.get_session() as session:
+            invitees = get_invitee_rollup(session, PAGE_START_DATE, end_date)
+            converted = count_converted(session, PAGE_START_DATE, end_date)
+        dashboard_metrics(invitees, converted)
+
+    def submit_feedback():
+        # What the Submit button on the tracking page writes
+        with db_session.get_session() as session:
+            feedback = Feedback(email="member000@example.com", fta_id=feedback_fta_id, call_type="2nd call",
+                                general_feedback="benchmark", submitted_at=datetime.now())
+            session.add(feedback)
+            refresh_fta_status(session, [feedback_fta_id])
+            refresh_feedback_days(session, [feedback.submitted_at.date()])
+            session.commit()
+
+    with db_session.get_session() as session:
+        feedback_fta_id = session.query(Feedback.fta_id).order_by(Feedback.id).limit(1).scalar()
+
+    cases = {}
+
+    def run(name, func, **kwargs):
+        print(f"  scale {scale:g}: {name}", file=sys.stderr, flush=True)
+        cases[name] = measure(func, runs, warmup, **kwargs)
+
+    run("sync_new_rows", lambda: db.sync_and_assign_fta_responses(csv_path), setup=restore_cold)
+    # Primed by the warm-up run: the sheet answers "not modified" and nothing is written
+    restore_cold()
+    run("sync_unchanged", lambda: db.sync_and_assign_fta_responses(csv_path))
+    run("assign_new_ftas", lambda: db.assign_new_ftas(sheet), setup=restore)
+    run("reassign_ftas_from_inactive_member",
+        lambda: db.reassign_ftas_from_inactive_member("member000@example.com"), setup=deactivate_first_member)
+    restore()
+    run("get_email_logs", db.get_email_logs)
+    run("team_page_load", load_team_page)
+    run("team_page_aggregations", team_page_aggregations)
+    run("dashboard_aggregations", dashboard_aggregations)
+    run("submit_feedback", submit_feedback, setup=restore)
+
+    return {"scale": scale, "rows": rows, "cases": cases}
+
+
+def run_scale(scale, runs, warmup):
+    with tempfile.TemporaryDirectory(prefix="fta-bench-") as workdir:
+        result_path = os.path.join(workdir, "result.json")
+        env = {**os.environ, "FTA_DB_FILE": os.path.join(workdir, "fta.db")}
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", "--scales", str(scale),
+             "--runs", str(runs), "--warmup", str(warmup), "--output", result_path],
+            cwd=REPO_ROOT, env=env, check=True,
+        )
+        with open(result_path) as f:
+            return json.load(f)
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def print_results(report):
+    for result in report["scales"]:
+        rows = result["rows"]
+        print(f"\nscale {result['scale']:g}x: {rows['sheet_rows']} sheet rows, {rows['assignments']} assignments, "
+              f"{rows['feedback']} feedback, {rows['email_logs']} email logs")
+        print(f"  {'case':<36} {'p50 ms':>10} {'p95 ms':>10} {'peak MB':>9}")
+        for name, stats in result["cases"].items():
+            print(f"  {name:<36} {stats['p50_ms']:>10.1f} {stats['p95_ms']:>10.1f} {stats['peak_mb']:>9.1f}")
+
+
+def compare(base_path, new_path):
+    """Print p50 and peak memory of two result files side by side."""
+    with open(base_path) as f:
+        base = {result["scale"]: result["cases"] for result in json.load(f)["scales"]}
+    with open(new_path) as f:
+        new = json.load(f)
+    for result in new["scales"]:
+        old_cases = base.get(result["scale"])
+        if old_cases is None:
+            continue
+        print(f"\nscale {result['scale']:g}x")
+        print(f"  {'case':<36} {'p50 before':>11} {'p50 after':>10} {'change':>8} {'peak MB':>16}")
+        for name, stats in result["cases"].items():
+            old = old_cases.get(name)
+            if old is None:
+                continue
+            change = (stats["p50_ms"] / old["p50_ms"] - 1) * 100 if old["p50_ms"] else float("nan")
+            print(f"  {name:<36} {old['p50_ms']:>11.1f} {stats['p50_ms']:>10.1f} {change:>+7.0f}% "
+                  f"{old['peak_mb']:>7.1f} -> {stats['peak_mb']:<7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sync, assignment and page aggregation hot paths")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 100],
+                        help="Dataset sizes as multiples of today's row counts")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per case")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs before the timed ones")
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/hot_paths_<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two result files and exit")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if args.child:
+        result = child(args.scales[0], os.path.dirname(args.output), args.runs, args.warmup)
+        with open(args.output, "w") as f:
+            json.dump(result, f, default=str)
+        return
+
+    commit, dirty = git_revision()
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "warmup": args.warmup,
+        "scales": [run_scale(scale, args.runs, args.warmup) for scale in args.scales],
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"hot_paths_{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print_results(report)
+    print(f"\nWrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_smtp_transport.py
+# Messages per second: one SMTP connection per message (the old db.send_email
+# behaviour) versus the pooled transport in smtp_transport.
+#
+# Usage:
+#   python benchmarks/bench_smtp_transport.py
+#   python benchmarks/bench_smtp_transport.py --messages 500 --handshake-delay 0.1 --threads 3
+#
+# Requires aiosmtpd for the local stand-in server.
+
+import argparse
+import os
+import smtplib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smtp_transport import SmtpPool
+
+from smtp_stub import StubSmtpServer
+
+
+def make_message(i):
+    message = EmailMessage()
+    message["Subject"] = "Welcome to The Standpoint Church"
+    message["From"] = "sender@example.com"
+    message["To"] = f"fta{i}@example.com"
+    message.set_content(f"Dear FTA {i}, thank you for worshipping with us.")
+    return message
+
+
+def send_fresh(server, messages, threads):
+    def send_one(message):
+        conn = smtplib.SMTP(server.host, server.port, timeout=10)
+        conn.ehlo()
+        conn.send_message(message)
+        conn.quit()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(send_one, messages))
+
+
+def send_pooled(server, messages, threads):
+    pool = SmtpPool(server.host, server.port, size=threads)
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(pool.send, messages))
+    finally:
+        pool.close_all()
+
+
+def run(name, sender, args):
+    messages = [make_message(i) for i in range(args.messages)]
+    with StubSmtpServer(handshake_delay=args.handshake_delay, data_delay=args.data_delay) as server:
+        started = time.perf_counter()
+        sender(server, messages, args.threads)
+        elapsed = time.perf_counter() - started
+        assert server.message_count == args.messages, server.message_count
+        print(f"{name:<8} {args.messages:>6} msgs  {elapsed:>7.2f}s  {args.messages / elapsed:>8.1f} msg/s  "
+              f"{server.connection_count:>4} connection(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fresh vs pooled SMTP connections")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--handshake-delay", type=float, default=0.05,
+                        help="Seconds added to each EHLO to mimic a TLS + login round trip")
+    parser.add_argument("--data-delay", type=float, default=0.0,
+                        help="Seconds added to each DATA command")
+    args = parser.parse_args()
+
+    run("fresh", send_fresh, args)
+    run("pooled", send_pooled, args)
+
+
+if __name__ == "__main__":
+    main()
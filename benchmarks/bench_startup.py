@@ -0,0 +1,151 @@
+# benchmarks/bench_startup.py
+# Cold-start cost of app.py: which modules the login page pulls in (from
+# `python -X importtime`) and how long the first render of the login page takes.
+#
+# Usage (from the repository root, so AppTest finds app.py and assets/):
+#   python benchmarks/bench_startup.py
+#   python benchmarks/bench_startup.py --runs 10 --importtime-log startup_imports.txt
+#
+# Each run is a fresh interpreter on a fresh temporary copy of database/fta.db
+# (FTA_DB_FILE), which the app's first run bootstraps and migrates exactly as
+# a real cold start does. The committed database is never opened for writing.
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DB = os.path.join(REPO_ROOT, "database", "fta.db")
+
+# Libraries and app modules worth watching on the login route
+WATCHED = [
+    "pandas", "plotly", "sqlalchemy", "bcrypt", "werkzeug",
+    "app", "bootstrap", "db", "db_session", "login_page", "dashboard_page",
+    "fta_page", "fta_tracking", "team_page", "sync_coordinator",
+]
+
+# Only what login needs; real values are not required to render the form
+PLACEHOLDER_SECRETS = {
+    "address": "sender@example.com",
+    "app_password": "unused",
+    "gsheet_url": "unused.csv",
+    "approved_domains": ["example.com"],
+    "admin_emails": ["admin@example.com"],
+}
+
+
+def child():
+    """Render the login page once and print the timing as JSON."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=120)
+    at.secrets["secrets"] = PLACEHOLDER_SECRETS
+    # Everything imported before this point (streamlit, AppTest) is the same for
+    # any app; importtime lines after the marker belong to app.py
+    print("import time: app-start-marker", file=sys.stderr, flush=True)
+    preloaded = set(sys.modules)
+    started = time.perf_counter()
+    at.run()
+    first_render = time.perf_counter() - started
+    if at.exception:
+        raise SystemExit(f"app.py raised: {at.exception[0].value}")
+
+    started = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - started
+    loaded = [name for name in WATCHED if name in sys.modules and name not in preloaded]
+    print(json.dumps({"first_render": first_render, "rerun": rerun, "loaded": loaded,
+                      "preloaded": [name for name in WATCHED if name in preloaded]}))
+
+
+def parse_importtime(stderr):
+    """
+    Return ({module: cumulative microseconds}, total microseconds) for imports
+    after the marker. Modules loaded with importlib.import_module (the lazy
+    pages) get no line of their own, only their dependencies do.
+    """
+    lines = stderr.splitlines()
+    try:
+        lines = lines[lines.index("import time: app-start-marker") + 1:]
+    except ValueError:
+        pass
+    imported, total = {}, 0
+    for line in lines:
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        imported.setdefault(name.strip(), int(cumulative))
+        # Top-level lines have a single space before the name; nested ones are
+        # indented further and already counted in their parent's cumulative time
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return imported, total
+
+
+def run_once():
+    with tempfile.TemporaryDirectory(prefix="fta-startup-") as workdir:
+        db_file = os.path.join(workdir, "fta.db")
+        # Commits may still be in the WAL, so it is copied along with the file
+        for suffix in ("", "-wal"):
+            if os.path.exists(SOURCE_DB + suffix):
+                shutil.copyfile(SOURCE_DB + suffix, db_file + suffix)
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child"],
+            cwd=REPO_ROOT, capture_output=True, text=True, env={**os.environ, "FTA_DB_FILE": db_file},
+        )
+    if result.returncode != 0:
+        raise SystemExit(result.stderr[-2000:])
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, result.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app.py cold start and login first render")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime-log", help="Write the raw -X importtime output of the first run here")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    first_renders, reruns = [], []
+    for i in range(args.runs):
+        timings, stderr = run_once()
+        first_renders.append(timings["first_render"])
+        reruns.append(timings["rerun"])
+        if i == 0:
+            loaded, preloaded = timings["loaded"], timings["preloaded"]
+            imports, total = parse_importtime(stderr)
+            if args.importtime_log:
+                with open(args.importtime_log, "w") as f:
+                    f.write(stderr)
+
+    print("Modules loaded by the login page (cumulative import ms, first run):")
+    for name in WATCHED:
+        if name in preloaded:
+            print(f"  {name:<18} {'-':>8}  already loaded by streamlit.testing")
+        elif name not in loaded:
+            print(f"  {name:<18} {'-':>8}  not loaded")
+        elif name in imports:
+            print(f"  {name:<18} {imports[name] / 1000:>8.1f}")
+        else:
+            print(f"  {name:<18} {'?':>8}  loaded lazily (no importtime line)")
+    print(f"  {'all app imports':<18} {total / 1000:>8.1f}")
+    print()
+    print(f"login first render  median {statistics.median(first_renders):.3f}s  "
+          f"min {min(first_renders):.3f}s  max {max(first_renders):.3f}s  ({args.runs} cold processes)")
+    print(f"login rerun         median {statistics.median(reruns):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# benchmarks/check_query_plans.py
+# Run EXPLAIN QUERY PLAN over the queries the pages and the sync issue most
+# often and fail if any of them stops using its index (e.g. after a model or
+# query change).
+#
+# Usage:
+#   python benchmarks/check_query_plans.py                    # fresh temporary database
+#   python benchmarks/check_query_plans.py --db copy_of_fta.db
+#
+# --db migrates the given file first, so point it at a copy of production data.
+
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import sqlite
+
+from db_migration import run_migrations
+from db_session import get_engine
+from models import (Base, EmailLogs, EmailOutbox, Feedback, FeedbackDaily, FtaAssignments, FtaResponses, FtaStatus,
+                    InviteeDaily, RejectedRow, SyncRun)
+
+MEMBER = "member@example.com"
+SINCE = datetime(2025, 1, 1)
+
+# (where the query runs, statement, index it must use)
+CHECKS = [
+    ("fta_tracking: my assigned FTAs",
+     select(FtaAssignments.fta_id).where(func.lower(FtaAssignments.assigned_to) == MEMBER),
+     "ix_fta_assignments_assigned_to_lower"),
+    ("fta_tracking: call types done per FTA",
+     select(FtaAssignments.fta_id, FtaStatus.stages)
+     .outerjoin(FtaStatus, FtaStatus.fta_id == FtaAssignments.fta_id)
+     .where(func.lower(FtaAssignments.assigned_to) == MEMBER),
+     "sqlite_autoindex_fta_status_1"),
+    ("fta_page: my FTAs' status",
+     select(FtaStatus.fta_id, FtaStatus.stages).where(FtaStatus.assigned_to == MEMBER),
+     "ix_fta_status_assigned_to_assigned_at"),
+    ("team_page: contacted per member",
+     select(FtaStatus.assigned_to, func.count(FtaStatus.first_contact_at))
+     .where(FtaStatus.assigned_to == MEMBER, FtaStatus.assigned_at >= SINCE)
+     .group_by(FtaStatus.assigned_to),
+     "ix_fta_status_assigned_to_assigned_at"),
+    ("fta_tracking / fta_page: my feedback",
+     select(Feedback.fta_id, Feedback.call_type).where(Feedback.email == MEMBER),
+     "ix_fta_feedback_email"),
+    ("team_page: a member's FTAs",
+     select(FtaAssignments.fta_id, FtaAssignments.name).where(FtaAssignments.assigned_to == MEMBER),
+     "ix_fta_assignments_assigned_to"),
+    ("team_page: feedback for an FTA",
+     select(Feedback).where(Feedback.fta_id == "FTA0001"),
+     "ix_fta_feedback_fta_id"),
+    ("team_page: feedback in a date range",
+     select(Feedback).where(Feedback.submitted_at >= SINCE, Feedback.submitted_at < SINCE + timedelta(days=30)),
+     "ix_fta_feedback_submitted_at"),
+    ("team_page: assignments in a date range",
+     select(FtaAssignments).where(FtaAssignments.assigned_at >= SINCE),
+     "ix_fta_assignments_assigned_at"),
+    ("db.email_already_sent",
+     select(EmailLogs.id).where(EmailLogs.fta_id == "FTA0001", EmailLogs.status == "sent"),
+     "ix_email_logs_fta_id_status"),
+    ("email_outbox.count_emails_sent_since",
+     select(func.count(EmailLogs.id)).where(EmailLogs.status == "sent", EmailLogs.timestamp >= SINCE),
+     "ix_email_logs_status_timestamp"),
+    ("email_outbox: claim pending",
+     select(EmailOutbox).where(EmailOutbox.status == "pending").order_by(EmailOutbox.created_at).limit(50),
+     "ix_email_outbox_status"),
+    ("sync: response by FTA ID",
+     select(FtaResponses).where(FtaResponses.FTA_ID == "FTA0001"),
+     "ux_fta_responses_fta_id"),
+    ("sync: known digests of incoming rows",
+     select(FtaResponses.FTA_ID, FtaResponses.row_digest).where(FtaResponses.FTA_ID.in_(["FTA0001", "FTA0002"])),
+     "ux_fta_responses_fta_id"),
+    ("sync: digests of rejected rows",
+     select(RejectedRow.fta_id, RejectedRow.row_digest).where(RejectedRow.fta_id.in_(["FTA0001", "FTA0002"])),
+     "sqlite_autoindex_rejected_rows_1"),
+    ("dashboard: responses since a date",
+     select(FtaResponses.Gender).where(FtaResponses.Timestamp >= SINCE),
+     "ix_fta_responses_Timestamp"),
+    ("team_page: feedback chart counts",
+     select(FeedbackDaily.call_type, func.sum(FeedbackDaily.count))
+     .where(FeedbackDaily.day >= SINCE.date(), FeedbackDaily.day <= SINCE.date() + timedelta(days=30))
+     .group_by(FeedbackDaily.call_type),
+     "ix_feedback_daily_day"),
+    ("dashboard: invitee counts",
+     select(InviteeDaily).where(InviteeDaily.day >= SINCE.date(), InviteeDaily.day <= SINCE.date() + timedelta(days=30)),
+     "ix_invitee_daily_day"),
+    ("rollups: recompute a day of feedback",
+     select(Feedback.call_type).where(Feedback.submitted_at >= SINCE, Feedback.submitted_at < SINCE + timedelta(days=1)),
+     "ix_fta_feedback_submitted_at"),
+    ("team_page: recent sync runs",
+     select(SyncRun).order_by(SyncRun.started_at.desc()).limit(50),
+     "ix_sync_runs_started_at"),
+]
+
+
+def explain(conn, statement):
+    # Named parameters so the compiled SQL can be re-run through text()
+    # (IN lists are expanded into one parameter per value)
+    compiled = statement.compile(dialect=sqlite.dialect(paramstyle="named"),
+                                 compile_kwargs={"render_postcompile": True})
+    rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"), compiled.params).all()
+    return [row[-1] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that hot queries use their indexes")
+    parser.add_argument("--db", help="SQLite file to check (default: a fresh temporary database)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or os.path.join(tmp, "plans.db")
+        engine = get_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+
+        failures = 0
+        with engine.connect() as conn:
+            for label, statement, index in CHECKS:
+                plan = explain(conn, statement)
+                ok = any(index in step for step in plan)
+                failures += not ok
+                print(f"{'ok ' if ok else 'BAD'}  {label:<42} {' | '.join(plan)}")
+        engine.dispose()
+
+    if failures:
+        print(f"\n{failures} quer{'y' if failures == 1 else 'ies'} not using the expected index")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
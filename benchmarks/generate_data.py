@@ -0,0 +1,493 @@
+# benchmarks/generate_data.py
+# Reproducible synthetic data for load and performance work: a CSV shaped
+# like the live Google Form sheet and a populated copy of fta.db.
+#
+# Usage:
+#   python benchmarks/generate_data.py                       # today's volume (1x)
+#   python benchmarks/generate_data.py --scale 100           # ~87k responses, 63k assignments, 70k feedback
+#   python benchmarks/generate_data.py --responses 5000 --assignments 4000 --feedback 3000 \
+#       --start 2025-01-01 --end 2025-06-30 --call-types "1st call=3" "2nd call=1" --seed 7
+#
+# Then point the app at the result:
+#   FTA_DB_FILE=benchmarks/data/fta_100x.db streamlit run app.py
+#   (with secrets["secrets"]["gsheet_url"] set to the CSV path)
+#
+# The same --seed and sizes always produce the same files. fta_responses is
+# written through the real ingest path (row digests, PII hashing), so a sync
+# against the CSV sees every stored row as unchanged and only the rows left
+# out with --stored-responses as new.
+
+import argparse
+import math
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from werkzeug.security import generate_password_hash
+
+from db_migration import run_migrations
+from db_session import get_engine
+from fta_ingest import (bulk_upsert_fta_responses, build_response_records, compute_row_digests,
+                        compute_sheet_digest, record_rejected_rows)
+from fta_schema import apply_schema, compile_mapping
+from fta_status import refresh_fta_status
+from rollups import rebuild_rollups
+from models import (ATeamMember, AssignmentTracker, Base, EmailLogs, Feedback, FtaAssignments,
+                    SyncState, User)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Row counts of the live database at the time of writing; --scale multiplies these
+BASELINE = {
+    "responses": 870,
+    "assignments": 629,
+    "feedback": 700,
+    "email_logs": 776,
+}
+DEFAULT_MEMBERS = 20
+DEFAULT_START = datetime(2025, 1, 1)
+DEFAULT_END = datetime(2025, 12, 31)
+MEMBER_PASSWORD = "password"
+
+# Headers exactly as the live form exports them, in sheet order
+SHEET_HEADERS = {
+    "timestamp": "Timestamp",
+    "email": "Email address",
+    "full_name": "Full Name",
+    "phone": "Phone number",
+    "gender": "Gender",
+    "location": "Home Address",
+    "service_experience": "How was your overall service experience?",
+    "worship_experience": "Amazing How will you rate your worship experience",
+    "word_experience": "How will you rate your word experience",
+    "general_feedback": "Any general feedback for us? (e.g how can we improve)",
+    "invited_by": "Who invited you to TSP?",
+    "membership_interest": "Would you like to be a member of TSP?",
+    "consent": "I consent that the my data provided in this form can be used by "
+               "The Standpoint Church as deemed appropriate.",
+    "meeting_date": "Select the most convenient date for your one-on-one meeting with Pastor Phil.",
+    "fta_id": "FTA ID",
+}
+
+# Call types in the order an FTA goes through them (fta_tracking.py); the
+# default weights follow the live fta_feedback table
+CALL_TYPES = ["1st call", "2nd call", "3rd call", "M&G Attended", "After Effect Confirmation"]
+DEFAULT_CALL_TYPES = {"1st call": 607, "2nd call": 72, "3rd call": 16, "M&G Attended": 6,
+                      "After Effect Confirmation": 3}
+DEFAULT_CALL_SUCCESS = {"Yes": 385, "Yes, but not reachable": 60, "Yes, but switched off": 27,
+                        "Yes, but didn't pick": 56, "Yes, sent TSP communique": 10,
+                        "Yes, sent a message": 72}
+FEEDBACK_1 = ["Close", "Just visiting", "Out of town", "Prayer request", "Transport needed",
+              "Would love to join", "Hope to visit again", "Others (Please specify)"]
+DEPARTMENTS = ["Audacity - Minister Gift", "Prayer - Pastor Paul", "Greeters - Rosemary",
+               "Help Desk - Pastor Yemi", "Media Projection - Joshua", "Traffic - Mr. Emmanuel"]
+
+FIRST_NAMES = ["Ada", "Chinedu", "Tolu", "Ifeoma", "Emeka", "Funke", "Segun", "Ngozi", "Kelechi",
+               "Bisi", "Obinna", "Amaka", "Tunde", "Chioma", "Yemi", "Zainab", "Femi", "Uche"]
+LAST_NAMES = ["Okafor", "Adeyemi", "Eze", "Balogun", "Nwosu", "Okonkwo", "Bello", "Ogunleye",
+              "Obi", "Adebayo", "Chukwu", "Lawal", "Nnamdi", "Afolabi", "Ibe", "Onyeka"]
+STREETS = ["Allen Avenue", "Admiralty Way", "Awolowo Road", "Herbert Macaulay Way",
+           "Ozumba Mbadiwe", "Ikorodu Road", "Adeola Odeku", "Bode Thomas"]
+GENERAL_FEEDBACK = ["Great service", "Loved the worship", "More parking please",
+                    "The sermon blessed me", "Start on time", "Friendly ushers"]
+INVITE_SOURCES = ["Friend", "Family", "Social media", "Colleague", "Walked in"]
+
+
+def parse_weights(items):
+    """Parse ["name=weight", ...] into {name: weight}; names may contain commas."""
+    weights = {}
+    for item in items:
+        name, sep, weight = item.rpartition("=")
+        if not sep or not name.strip():
+            raise argparse.ArgumentTypeError(f"expected NAME=WEIGHT, got {item!r}")
+        weights[name.strip()] = float(weight)
+    if not weights or min(weights.values()) < 0 or sum(weights.values()) <= 0:
+        raise argparse.ArgumentTypeError("weights must be non-negative and not all zero")
+    return weights
+
+
+def split_counts(total, weights):
+    """Split `total` across weights by largest remainder, so the parts add up exactly."""
+    names = list(weights)
+    shares = np.array([weights[name] for name in names], dtype=float)
+    exact = shares / shares.sum() * total
+    counts = np.floor(exact).astype(int)
+    for i in np.argsort(-(exact - counts))[: total - counts.sum()]:
+        counts[i] += 1
+    return dict(zip(names, counts.tolist()))
+
+
+def form_timestamp(values):
+    """Format datetimes the way the form export does: 9/1/2025 10:00:00."""
+    return [f"{v.month}/{v.day}/{v.year} {v:%H:%M:%S}" for v in values]
+
+
+def form_date(values):
+    return [f"{v.month}/{v.day}/{v.year}" for v in values]
+
+
+def random_datetimes(rng, count, start, end):
+    """`count` sorted datetimes spread uniformly between start and end."""
+    span = (end - start).total_seconds()
+    seconds = np.sort(rng.uniform(0, span, count))
+    return pd.to_datetime(start) + pd.to_timedelta(seconds.round(), unit="s")
+
+
+def make_members(count):
+    """A-Team members as dicts with name and email (member000@example.com, ...)."""
+    return [
+        {"name": f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i * 7) % len(LAST_NAMES)]}",
+         "email": f"member{i:03d}@example.com"}
+        for i in range(count)
+    ]
+
+
+def make_sheet(rng, count, start, end, members, blank_email_rate=0.0):
+    """
+    Google Form responses with the live headers, oldest first.
+
+    Args:
+        rng: numpy Generator
+        count: Number of rows
+        start, end: Range the form timestamps are spread over
+        members: Output of make_members; their names show up under "Who invited you?"
+        blank_email_rate: Share of rows with no email (rejected at ingest, as in the live sheet)
+
+    Returns:
+        DataFrame with the columns of SHEET_HEADERS, formatted like the export
+    """
+    timestamps = random_datetimes(rng, count, start, end)
+    first = rng.choice(FIRST_NAMES, count)
+    last = rng.choice(LAST_NAMES, count)
+    index = np.arange(count)
+
+    emails = pd.Series([f"{f}.{l}.{i}@mail.com".lower() for f, l, i in zip(first, last, index)], dtype=object)
+    emails[rng.random(count) < blank_email_rate] = None
+
+    inviters = np.array(INVITE_SOURCES + [member["name"] for member in members], dtype=object)
+    invited_by = pd.Series(rng.choice(inviters, count), dtype=object)
+    invited_by[rng.random(count) < 0.15] = None
+
+    feedback = pd.Series(rng.choice(GENERAL_FEEDBACK, count), dtype=object)
+    feedback[rng.random(count) < 0.4] = None
+
+    meeting = timestamps.normalize() + pd.to_timedelta(rng.integers(3, 30, count), unit="D")
+
+    sheet = pd.DataFrame({
+        "timestamp": form_timestamp(timestamps),
+        "email": emails,
+        "full_name": [f"{f} {l}" for f, l in zip(first, last)],
+        "phone": rng.integers(7_000_000_000, 9_999_999_999, count),
+        "gender": rng.choice(["Male", "Female"], count, p=[0.45, 0.55]),
+        "location": [f"{n} {s}" for n, s in zip(rng.integers(1, 200, count), rng.choice(STREETS, count))],
+        "service_experience": rng.choice([3, 4, 5], count, p=[0.1, 0.3, 0.6]),
+        "worship_experience": rng.choice([3, 4, 5], count, p=[0.1, 0.25, 0.65]),
+        "word_experience": rng.choice([3, 4, 5], count, p=[0.05, 0.25, 0.7]),
+        "general_feedback": feedback,
+        "invited_by": invited_by,
+        "membership_interest": rng.choice(["Yes", "No", "Maybe"], count, p=[0.55, 0.15, 0.3]),
+        "consent": rng.choice(["Yes", "No"], count, p=[0.85, 0.15]),
+        "meeting_date": form_date(meeting),
+        "fta_id": [f"FTA{i:06d}" for i in index],
+    })
+    return sheet.rename(columns=SHEET_HEADERS)
+
+
+def make_assignments(rng, responses, count, member_users, end):
+    """Assign the oldest `count` FTAs round-robin, shortly after each form was filled in."""
+    assigned = responses.head(count)
+    delay = pd.to_timedelta(rng.integers(1, 120, len(assigned)), unit="m")
+    assigned_at = (assigned["timestamp"] + delay).clip(upper=pd.Timestamp(end))
+    users = [member_users[i % len(member_users)] for i in range(len(assigned))]
+    return pd.DataFrame({
+        "fta_id": assigned["fta_id"].to_numpy(),
+        "name": assigned["full_name"].fillna("Unknown").to_numpy(),
+        "assigned_to": [user["email"] for user in users],
+        "assigned_by": [user["id"] for user in users],
+        "assigned_at": assigned_at.to_numpy(),
+    })
+
+
+def make_feedback(rng, assignments, count, call_types, call_success, end):
+    """
+    Feedback rows for assigned FTAs.
+
+    Each FTA gets at most one row per call type, and later call types are
+    given to FTAs that already had the earlier call where possible, so the
+    funnel on the team page looks like the live one. A call type that asks
+    for more rows than there are FTAs is capped.
+    """
+    order = [name for name in CALL_TYPES if name in call_types]
+    order += [name for name in call_types if name not in CALL_TYPES]
+    wanted = split_counts(count, {name: call_types[name] for name in order})
+
+    by_fta = assignments.set_index("fta_id")
+    end = pd.Timestamp(end)
+    frames, previous = [], None
+    for call_type in order:
+        k = min(wanted[call_type], len(assignments))
+        if k == 0:
+            continue
+        if previous is not None and len(previous) >= k:
+            # Continue the funnel from the FTAs that had the previous call
+            pool, after = previous["fta_id"].to_numpy(), previous.set_index("fta_id")["submitted_at"]
+        else:
+            pool, after = assignments["fta_id"].to_numpy(), by_fta["assigned_at"]
+        fta_ids = rng.choice(pool, k, replace=False)
+
+        gap = pd.to_timedelta(rng.uniform(0.1, 14, k), unit="D").round("s")
+        submitted_at = (pd.Series(after.loc[fta_ids].to_numpy()) + gap).clip(upper=end).to_numpy()
+        rows = pd.DataFrame({
+            "email": by_fta.loc[fta_ids, "assigned_to"].to_numpy(),
+            "fta_id": fta_ids,
+            "call_type": call_type,
+            "call_success": None,
+            "feedback_1": None,
+            "met_date": pd.NaT,
+            "mg_date": pd.NaT,
+            "department": None,
+            "general_feedback": None,
+            "submitted_at": submitted_at,
+        })
+        if call_type == "1st call":
+            names = list(call_success)
+            p = np.array([call_success[name] for name in names], dtype=float)
+            rows["call_success"] = rng.choice(names, k, p=p / p.sum())
+            rows["feedback_1"] = rng.choice(FEEDBACK_1, k)
+        elif call_type == "2nd call":
+            rows["met_date"] = rows["submitted_at"].dt.normalize()
+        elif call_type == "M&G Attended":
+            rows["mg_date"] = rows["submitted_at"].dt.normalize()
+        elif call_type == "After Effect Confirmation":
+            rows["department"] = rng.choice(DEPARTMENTS, k)
+        notes = rng.random(k) < 0.5
+        rows.loc[notes, "general_feedback"] = rng.choice(GENERAL_FEEDBACK, int(notes.sum()))
+
+        frames.append(rows)
+        previous = rows
+
+    if not frames:
+        return pd.DataFrame(columns=[column.name for column in Feedback.__table__.columns if column.name != "id"])
+    return pd.concat(frames, ignore_index=True).sort_values("submitted_at", ignore_index=True)
+
+
+def make_email_logs(rng, responses, count, failure_rate, end):
+    """Welcome-email log rows: one 'sent' per FTA, oldest first, a failure before some of them."""
+    subject = "Welcome to The Standpoint Church – We're Glad You Came!"
+    rows = []
+    for fta in responses.itertuples(index=False):
+        if len(rows) >= count:
+            break
+        if pd.isna(fta.email):
+            continue
+        sent_at = min(fta.timestamp + timedelta(minutes=int(rng.integers(1, 60))), end)
+        if rng.random() < failure_rate:
+            rows.append({"fta_id": fta.fta_id, "fta_name": fta.full_name, "email": fta.email,
+                         "subject": subject, "status": "failed",
+                         "error_message": "SMTP timeout", "timestamp": sent_at})
+            sent_at = min(sent_at + timedelta(minutes=10), end)
+        rows.append({"fta_id": fta.fta_id, "fta_name": fta.full_name, "email": fta.email,
+                     "subject": subject, "status": "sent", "error_message": None,
+                     "timestamp": sent_at})
+    return rows[:count]
+
+
+def records(df):
+    """DataFrame -> list of dicts with None for missing values and Python datetimes."""
+    out = df.astype(object).where(df.notna(), None)
+    return [
+        {key: value.to_pydatetime() if isinstance(value, pd.Timestamp) else value for key, value in row.items()}
+        for row in out.to_dict("records")
+    ]
+
+
+def populate(db_path, raw, stored, sizes, members, call_types, call_success, email_failure_rate, end, rng):
+    """Create the schema in `db_path` and fill every table; returns row counts."""
+    engine = get_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    run_migrations(engine)
+    Session = sessionmaker(bind=engine)
+
+    # The first `stored` sheet rows have already been synced
+    raw_stored = raw.head(stored)
+    row_digests = compute_row_digests(raw_stored)
+    df, invalid = apply_schema(raw_stored, return_invalid=True)
+    response_records, accepted_index, rejects = build_response_records(df, row_digests, invalid)
+    accepted = df.loc[accepted_index]
+
+    with Session() as session:
+        password = generate_password_hash(MEMBER_PASSWORD)
+        session.execute(insert(User.__table__), [
+            {"name": "Admin", "email": "admin@example.com", "password": password, "role": "Admin"},
+            *({"name": m["name"], "email": m["email"], "password": password, "role": "A-Team"} for m in members),
+        ])
+        session.execute(insert(ATeamMember.__table__), [
+            {"email": m["email"], "full_name": m["name"], "is_active": True} for m in members
+        ])
+        member_users = [
+            {"id": user_id, "email": email}
+            for user_id, email in session.query(User.id, User.email).filter(User.role == "A-Team").order_by(User.id)
+        ]
+
+        bulk_upsert_fta_responses(session, response_records)
+        record_rejected_rows(session, rejects, [], end)
+        session.add(SyncState(
+            id=1,
+            last_timestamp=df["timestamp"].max().to_pydatetime() if len(df) else None,
+            last_row_count=len(df),
+            last_sheet_digest=compute_sheet_digest(row_digests),
+            last_synced_at=end,
+        ))
+
+        assignments = make_assignments(rng, accepted, min(sizes["assignments"], len(accepted)), member_users, end)
+        if len(assignments):
+            session.execute(insert(FtaAssignments.__table__), records(assignments))
+        session.add(AssignmentTracker(id=1, last_assigned_index=len(assignments) - 1))
+
+        feedback = make_feedback(rng, assignments, sizes["feedback"], call_types, call_success, end)
+        if len(feedback):
+            session.execute(insert(Feedback.__table__), records(feedback))
+        refresh_fta_status(session)
+        rebuild_rollups(session)
+
+        email_logs = make_email_logs(rng, accepted, sizes["email_logs"], email_failure_rate, end)
+        if email_logs:
+            session.execute(insert(EmailLogs.__table__), email_logs)
+
+        session.commit()
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.exec_driver_sql("ANALYZE")
+    engine.dispose()
+
+    return {
+        "members": len(members),
+        "responses": len(response_records),
+        "rejected": len(rejects),
+        "assignments": len(assignments),
+        "feedback": len(feedback),
+        "feedback_by_call_type": feedback["call_type"].value_counts().to_dict() if len(feedback) else {},
+        "email_logs": len(email_logs),
+    }
+
+
+def scaled_sizes(scale):
+    """BASELINE row counts multiplied by `scale`, rounded up."""
+    return {name: math.ceil(base * scale) for name, base in BASELINE.items()}
+
+
+def generate(csv_path, db_path, sizes, stored=None, members=DEFAULT_MEMBERS,
+             start=DEFAULT_START, end=DEFAULT_END, call_types=None, call_success=None,
+             blank_email_rate=0.01, email_failure_rate=0.08, seed=42):
+    """
+    Write the sheet CSV and create the database. Both paths must not exist yet.
+
+    Args:
+        csv_path, db_path: Output files
+        sizes: Dict with responses, assignments, feedback and email_logs counts
+        stored: Sheet rows already synced into fta_responses (default: all)
+        members: Number of A-Team members
+        start, end: Range of form timestamps; nothing is dated after `end`
+        call_types, call_success: {value: weight} mixes (default: the live ones)
+        blank_email_rate: Share of sheet rows without an email address
+        email_failure_rate: Share of welcome emails that failed once first
+        seed: Seed for numpy's random generator
+
+    Returns:
+        Dict of row counts per table
+    """
+    # Guard against the generator and fta_schema drifting apart
+    if set(compile_mapping(tuple(SHEET_HEADERS.values())).values()) != set(SHEET_HEADERS):
+        raise RuntimeError("SHEET_HEADERS no longer match fta_schema.COLUMNS")
+
+    stored = sizes["responses"] if stored is None else min(stored, sizes["responses"])
+    rng = np.random.default_rng(seed)
+    member_rows = make_members(members)
+    sheet = make_sheet(rng, sizes["responses"], start, end, member_rows, blank_email_rate)
+    sheet.to_csv(csv_path, index=False)
+
+    # Read it back the way sheet_cache.fetch_sheet does, so the stored row
+    # digests match what a sync computes
+    raw = pd.read_csv(csv_path)
+    raw.columns = raw.columns.str.strip()
+    counts = populate(db_path, raw, stored, sizes, member_rows, call_types or DEFAULT_CALL_TYPES,
+                      call_success or DEFAULT_CALL_SUCCESS, email_failure_rate, end, rng)
+    return {"sheet_rows": len(raw), **counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic FTA sheet CSV and database")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply the live row counts (%s)" % ", ".join(f"{k}={v}" for k, v in BASELINE.items()))
+    parser.add_argument("--responses", type=int, help="Sheet rows (overrides --scale)")
+    parser.add_argument("--stored-responses", type=int,
+                        help="Sheet rows already synced into fta_responses; the rest are new on the next sync "
+                             "(default: all)")
+    parser.add_argument("--assignments", type=int, help="Assigned FTAs, oldest first (overrides --scale)")
+    parser.add_argument("--feedback", type=int, help="fta_feedback rows (overrides --scale)")
+    parser.add_argument("--email-logs", type=int, help="email_logs rows (overrides --scale)")
+    parser.add_argument("--members", type=int, default=DEFAULT_MEMBERS, help="A-Team members (not scaled)")
+    parser.add_argument("--start", type=datetime.fromisoformat, default=DEFAULT_START,
+                        help="First form timestamp (ISO date)")
+    parser.add_argument("--end", type=datetime.fromisoformat, default=DEFAULT_END,
+                        help="Last form timestamp (ISO date); nothing is dated after it")
+    parser.add_argument("--call-types", nargs="+", metavar="TYPE=WEIGHT",
+                        help="Share of feedback rows per call type (default: the live mix)")
+    parser.add_argument("--call-success", nargs="+", metavar="VALUE=WEIGHT",
+                        help="Share of 1st-call outcomes (default: the live mix)")
+    parser.add_argument("--blank-email-rate", type=float, default=0.01,
+                        help="Share of sheet rows without an email address")
+    parser.add_argument("--email-failure-rate", type=float, default=0.08,
+                        help="Share of welcome emails that failed once before being sent")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--csv", help="Where to write the sheet (default: benchmarks/data/sheet_<scale>x.csv)")
+    parser.add_argument("--db", help="Database to create (default: benchmarks/data/fta_<scale>x.db)")
+    parser.add_argument("--overwrite", action="store_true", help="Replace existing output files")
+    args = parser.parse_args()
+
+    if args.end <= args.start:
+        parser.error("--end must be after --start")
+    try:
+        call_types = parse_weights(args.call_types) if args.call_types else None
+        call_success = parse_weights(args.call_success) if args.call_success else None
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    sizes = scaled_sizes(args.scale)
+    sizes.update({name: getattr(args, name) for name in BASELINE if getattr(args, name) is not None})
+
+    label = f"{args.scale:g}x"
+    csv_path = args.csv or os.path.join(DATA_DIR, f"sheet_{label}.csv")
+    db_path = args.db or os.path.join(DATA_DIR, f"fta_{label}.db")
+    for path in (csv_path, db_path):
+        if os.path.exists(path):
+            if not args.overwrite:
+                parser.error(f"{path} exists; pass --overwrite to replace it")
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    counts = generate(
+        csv_path, db_path, sizes, stored=args.stored_responses, members=args.members,
+        start=args.start, end=args.end, call_types=call_types, call_success=call_success,
+        blank_email_rate=args.blank_email_rate, email_failure_rate=args.email_failure_rate, seed=args.seed,
+    )
+
+    print(f"Sheet:    {csv_path}")
+    print(f"Database: {db_path}")
+    for name, value in counts.items():
+        print(f"  {name:<22} {value}")
+    print(f"Members sign in as member000@example.com ... with password {MEMBER_PASSWORD!r}; "
+          f"admin@example.com is the Admin.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+# benchmarks/load_test.py
+# Many volunteers using the app at once, e.g. right after a service. Each
+# simulated session is a streamlit.testing AppTest driven from its own thread
+# of this process, the same way Streamlit runs browser sessions as threads of
+# one server process (so the engine pool, the FTA snapshot and the sync
+# scheduler are shared, as in production).
+#
+# Usage (needs aiosmtpd, see benchmarks/requirements.txt):
+#   python benchmarks/load_test.py                           # 1, 5, 10 and 30 sessions
+#   python benchmarks/load_test.py --concurrency 30 60 --scale 10 --output load.json
+#
+# Setup: a temporary database from generate_data.py (FTA_DB_FILE), its CSV as
+# the Google Sheet and smtp_stub.py in place of Gmail. A-Team sessions log in,
+# walk dashboard -> FTAs -> FTA Tracking and submit a 1st-call feedback; every
+# --admin-every'th session logs in as the Admin and walks dashboard -> Manage
+# A-Team instead. At the start of each level new rows are appended to the
+# sheet and a sync is requested, so the sync, assignment and welcome emails
+# run alongside the sessions.
+#
+# Reported per level: latency per route (p50/p95/max), time spent in SQLite
+# write statements (which includes waiting up to busy_timeout for the write
+# lock), "database is locked" errors, app errors and emails delivered.
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+ROUTES = ["login_page", "login", "dashboard", "fta", "fta_tracking", "submit_feedback", "team"]
+WRITE_VERBS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+SYNC_WAIT_SECONDS = 300
+
+
+def summarize(values_ms):
+    if not values_ms:
+        return {"count": 0}
+    p50, p95 = np.percentile(values_ms, [50, 95])
+    return {
+        "count": len(values_ms),
+        "p50_ms": round(float(p50), 1),
+        "p95_ms": round(float(p95), 1),
+        "max_ms": round(max(values_ms), 1),
+    }
+
+
+class Recorder:
+    """Thread-safe collection of route timings, errors and SQLite write timings for one level."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes = defaultdict(list)
+        self.route_errors = Counter()
+        self.errors = Counter()
+        self.writes = []
+        self.locked = 0
+        self.feedback_submitted = 0
+
+    def route(self, name, elapsed_ms, errors):
+        with self._lock:
+            self.routes[name].append(elapsed_ms)
+            for message in errors:
+                self.route_errors[name] += 1
+                self.errors[f"{name}: {message[:160]}"] += 1
+
+    def write(self, elapsed_ms):
+        with self._lock:
+            self.writes.append(elapsed_ms)
+
+    def lock_error(self):
+        with self._lock:
+            self.locked += 1
+
+    def feedback(self):
+        with self._lock:
+            self.feedback_submitted += 1
+
+    def report(self):
+        with self._lock:
+            routes = {}
+            for name in ROUTES:
+                if name in self.routes:
+                    routes[name] = {**summarize(self.routes[name]), "errors": self.route_errors[name]}
+            return {
+                "routes": routes,
+                "sqlite_writes": {**summarize(self.writes), "locked_errors": self.locked},
+                "feedback_submitted": self.feedback_submitted,
+                "errors": dict(self.errors.most_common(20)),
+            }
+
+
+_recorder = Recorder()
+
+
+def instrument_engine(engine):
+    """Time every write statement and count "database is locked" errors on the shared engine."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("load_test_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["load_test_started"].pop()
+        if statement.lstrip()[:7].upper().startswith(WRITE_VERBS):
+            _recorder.write((time.perf_counter() - started) * 1000)
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(context):
+        started = context.connection.info.get("load_test_started") if context.connection else None
+        if started:
+            started.pop()
+        if "database is locked" in str(context.original_exception):
+            _recorder.lock_error()
+
+
+def share_apptest_runtime():
+    """
+    Let concurrent AppTest runs share a Runtime.
+
+    AppTest installs its mock Runtime in a class attribute for the length of
+    one run and clears it afterwards, so with several runs in flight one
+    run's teardown pulls the Runtime from under the others ("Runtime hasn't
+    been created!"). Fall back to the last Runtime seen instead.
+    """
+    from streamlit.runtime.runtime import Runtime
+
+    seen = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            seen["runtime"] = cls._instance
+            return cls._instance
+        if "runtime" in seen:
+            return seen["runtime"]
+        raise RuntimeError("Runtime hasn't been created!")
+
+    Runtime.instance = classmethod(instance)
+
+
+def app_errors(at):
+    return [str(e.value) for e in at.exception]
+
+
+def step(at, route, action=None):
+    """Run one route (optionally after a widget action) and record how long it took."""
+    started = time.perf_counter()
+    try:
+        if action:
+            action()
+        at.run()
+        errors = app_errors(at)
+    except Exception as e:
+        errors = [f"{type(e).__name__}: {e}"]
+    _recorder.route(route, (time.perf_counter() - started) * 1000, errors)
+    return not errors
+
+
+def button(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+def walk_session(email, password, is_admin, timeout):
+    """One volunteer: log in, visit each route of their role, submit feedback as A-Team."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=timeout)
+    if not step(at, "login_page"):
+        return
+
+    def log_in():
+        at.text_input(key="login_email").input(email)
+        at.text_input(key="login_pass").input(password)
+        button(at.button, "Login").click()
+
+    if not step(at, "login", log_in) or "email" not in at.session_state:
+        _recorder.route("login", 0, [f"{email} was not logged in"])
+        return
+    # Logging in lands on the dashboard; visit it again the way the sidebar does
+    step(at, "dashboard", lambda: button(at.sidebar.button, "Go to Dashboard").click())
+
+    if is_admin:
+        step(at, "team", lambda: button(at.sidebar.button, "Manage A-Team").click())
+        return
+
+    step(at, "fta", lambda: button(at.sidebar.button, "Go to FTAs").click())
+    if not step(at, "fta_tracking", lambda: button(at.sidebar.button, "FTA Tracking").click()):
+        return
+
+    token = at.session_state["fta_form_token"] if "fta_form_token" in at.session_state else 0
+    submit_keys = {widget.key for widget in at.button}
+    if f"submit_{token}" not in submit_keys:
+        return  # nothing left to contact for this member
+
+    def submit():
+        at.selectbox(key=f"call_success_{token}").set_value("Yes")
+        at.selectbox(key=f"feedback_1_{token}").set_value("Would love to join")
+        at.text_area(key=f"general_feedback_{token}").input("Load test")
+        at.button(key=f"submit_{token}").click()
+
+    if step(at, "submit_feedback", submit):
+        _recorder.feedback()
+
+
+def append_sheet_rows(csv_path, count, members, rng):
+    """Add `count` new form responses, timestamped within the last hour, to the end of the sheet."""
+    import pandas as pd
+    from generate_data import SHEET_HEADERS, make_sheet
+
+    existing = len(pd.read_csv(csv_path, usecols=[SHEET_HEADERS["fta_id"]]))
+    now = datetime.now()
+    rows = make_sheet(rng, count, now - timedelta(hours=1), now, members)
+    rows[SHEET_HEADERS["fta_id"]] = [f"FTA{i:06d}" for i in range(existing, existing + count)]
+    rows.to_csv(csv_path, mode="a", header=False, index=False)
+
+
+def wait_for_sync(scheduler, requested_at, timeout=SYNC_WAIT_SECONDS):
+    """Wait until a sync that started after `requested_at` has finished; returns its status."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = scheduler.status()
+        last_run = status["last_run"]
+        if last_run and last_run["started_at"] >= requested_at and not status["running"]:
+            return last_run
+        time.sleep(0.2)
+    return None
+
+
+def wait_for_outbox(timeout=SYNC_WAIT_SECONDS):
+    """Wait until the welcome email outbox has nothing pending or in flight."""
+    from db_session import get_session
+    from models import EmailOutbox
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with get_session() as session:
+            busy = session.query(EmailOutbox).filter(EmailOutbox.status.in_(["pending", "sending"])).count()
+        if not busy:
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def run_level(sessions, args, csv_path, members, rng, stub):
+    """Run `sessions` concurrent sessions (each --iterations times) and report the level."""
+    global _recorder
+    from sync_scheduler import get_sync_scheduler
+
+    _recorder = Recorder()
+    emails_before = stub.message_count
+
+    # New responses arrive while everyone is logging in
+    append_sheet_rows(csv_path, args.new_rows, members, rng)
+    scheduler = get_sync_scheduler()
+    requested_at = datetime.now()
+    scheduler.request_run()
+
+    def worker(i):
+        barrier.wait()
+        is_admin = args.admin_every and i % args.admin_every == args.admin_every - 1
+        email = "admin@example.com" if is_admin else members[i % len(members)]["email"]
+        for _ in range(args.iterations):
+            walk_session(email, args.password, is_admin, args.timeout)
+
+    barrier = threading.Barrier(sessions)
+    threads = [threading.Thread(target=worker, args=(i,), name=f"load-session-{i}") for i in range(sessions)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    sync_run = wait_for_sync(scheduler, requested_at)
+    wait_for_outbox()
+
+    report = _recorder.report()
+    return {
+        "sessions": sessions,
+        "iterations": args.iterations,
+        "wall_s": round(wall, 2),
+        **report,
+        "sync": {k: str(v) if isinstance(v, datetime) else v for k, v in sync_run.items()} if sync_run else None,
+        "emails_sent": stub.message_count - emails_before,
+    }
+
+
+def print_level(level):
+    print(f"\n{level['sessions']} concurrent session(s), {level['wall_s']}s wall, "
+          f"{level['feedback_submitted']} feedback submitted, {level['emails_sent']} email(s) sent")
+    print(f"  {'route':<18} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'errors':>7}")
+    for name, stats in level["routes"].items():
+        print(f"  {name:<18} {stats['count']:>6} {stats.get('p50_ms', 0):>9.0f} {stats.get('p95_ms', 0):>9.0f} "
+              f"{stats.get('max_ms', 0):>9.0f} {stats['errors']:>7}")
+    writes = level["sqlite_writes"]
+    print(f"  sqlite writes: {writes['count']} statements, p50 {writes.get('p50_ms', 0):.1f} ms, "
+          f"p95 {writes.get('p95_ms', 0):.1f} ms, max {writes.get('max_ms', 0):.0f} ms, "
+          f"{writes['locked_errors']} 'database is locked'")
+    if level["sync"]:
+        print(f"  sync during the level: {level['sync']['duration']:.1f}s, error: {level['sync']['error']}")
+    for message, count in level["errors"].items():
+        print(f"  ! {count}x {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test of the Streamlit app")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 5, 10, 30],
+                        help="Concurrent sessions per level")
+    parser.add_argument("--iterations", type=int, default=1, help="Walks per session in each level")
+    parser.add_argument("--scale", type=float, default=1.0, help="Dataset size (generate_data.py --scale)")
+    parser.add_argument("--new-rows", type=int, default=20, help="Sheet rows added at the start of each level")
+    parser.add_argument("--admin-every", type=int, default=10,
+                        help="Every Nth session is the Admin (0 for A-Team only)")
+    parser.add_argument("--smtp-delay", type=float, default=0.05, help="Seconds the stub SMTP server adds per EHLO")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds one script run may take")
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/load_<commit>.json)")
+    parser.add_argument("--keep-data", action="store_true", help="Keep the temporary database and sheet")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="fta-load-")
+    # Before any app module is imported: db_session reads it at import time
+    os.environ["FTA_DB_FILE"] = os.path.join(workdir, "fta.db")
+    os.environ.setdefault("FTA_LOG_LEVEL", "WARNING")
+    os.chdir(REPO_ROOT)  # app.py loads assets/ relative to the working directory
+    sys.path.insert(0, REPO_ROOT)
+
+    import generate_data
+    from bench_hot_paths import git_revision
+    from smtp_stub import StubSmtpServer
+    from streamlit import config
+    from streamlit import logger as streamlit_logger
+
+    csv_path = os.path.join(workdir, "sheet.csv")
+    rows = generate_data.generate(csv_path, os.environ["FTA_DB_FILE"], generate_data.scaled_sizes(args.scale))
+    members = generate_data.make_members(generate_data.DEFAULT_MEMBERS)
+    args.password = generate_data.MEMBER_PASSWORD
+    rng = np.random.default_rng(7)
+
+    with StubSmtpServer(handshake_delay=args.smtp_delay) as stub:
+        # One secrets file for every session; AppTest.secrets swaps st.secrets
+        # per run, which is not safe with concurrent runs
+        secrets_path = os.path.join(workdir, "secrets.toml")
+        with open(secrets_path, "w") as f:
+            f.write(
+                "[secrets]\n"
+                'address = "sender@example.com"\n'
+                'app_password = "unused"\n'
+                f"gsheet_url = {json.dumps(csv_path)}\n"
+                'approved_domains = ["example.com"]\n'
+                'admin_emails = ["admin@example.com"]\n'
+                f'smtp_host = "{stub.host}"\n'
+                f"smtp_port = {stub.port}\n"
+                # Only the syncs this script requests, not the timer
+                "sync_interval_minutes = 600\n"
+            )
+        config.set_option("secrets.files", [secrets_path])
+
+        # Creating AppTests outside a script run warns once per thread
+        streamlit_logger.set_log_level("error")
+        share_apptest_runtime()
+
+        import db_session
+        instrument_engine(db_session.engine)
+
+        # Warm-up (not reported): bootstrap, scheduler start, first snapshot
+        print("Warming up...", file=sys.stderr, flush=True)
+        walk_session(members[0]["email"], args.password, False, args.timeout)
+
+        levels = []
+        for sessions in args.concurrency:
+            print(f"Running {sessions} session(s)...", file=sys.stderr, flush=True)
+            level = run_level(sessions, args, csv_path, members, rng, stub)
+            print_level(level)
+            levels.append(level)
+
+    commit, dirty = git_revision()
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "rows": rows,
+        "levels": levels,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"load_{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.keep_data:
+        print(f"Database and sheet kept in {workdir}")
+    else:
+        db_session.engine.dispose()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/smtp_stub.py
+# In-process stand-in for smtp.gmail.com, built on aiosmtpd (pip install aiosmtpd).
+#
+#   with StubSmtpServer(handshake_delay=0.05) as server:
+#       pool = SmtpPool(server.host, server.port)
+#       ...
+#       print(server.message_count)
+#
+# handshake_delay is added to every EHLO so the cost of opening a connection
+# is closer to a real TLS + login round trip than a loopback connect.
+
+import asyncio
+import socket
+import threading
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError as e:  # pragma: no cover - optional benchmark dependency
+    raise ImportError("The SMTP stub needs aiosmtpd: pip install aiosmtpd") from e
+
+
+class _CountingHandler:
+    def __init__(self, handshake_delay, data_delay):
+        self.handshake_delay = handshake_delay
+        self.data_delay = data_delay
+        self.messages = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        with self._lock:
+            self.connections += 1
+        if self.handshake_delay:
+            await asyncio.sleep(self.handshake_delay)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.data_delay:
+            await asyncio.sleep(self.data_delay)
+        with self._lock:
+            self.messages += 1
+        return "250 Message accepted for delivery"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StubSmtpServer:
+    """Local SMTP server that accepts and counts every message."""
+
+    def __init__(self, handshake_delay=0.0, data_delay=0.0, host="127.0.0.1", port=None):
+        self.host = host
+        self.port = port or _free_port()
+        self.handler = _CountingHandler(handshake_delay, data_delay)
+        self._controller = Controller(self.handler, hostname=self.host, port=self.port)
+
+    @property
+    def message_count(self):
+        return self.handler.messages
+
+    @property
+    def connection_count(self):
+        return self.handler.connections
+
+    def start(self):
+        self._controller.start()
+        return self
+
+    def stop(self):
+        self._controller.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    with StubSmtpServer(port=1025) as stub:
+        print(f"Stub SMTP server listening on {stub.host}:{stub.port} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            print(f"Received {stub.message_count} message(s).")
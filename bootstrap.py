@@ -0,0 +1,92 @@
+# bootstrap.py
+# Process-level setup. Streamlit re-runs app.py on every widget interaction,
+# but schema setup and A-Team member reconciliation only need to happen once
+# per process (or again after the database is replaced). This module stays
+# free of pandas so the login page can render before the heavy imports.
+
+import logging
+import threading
+from datetime import datetime
+
+import streamlit as st
+from sqlalchemy import text
+
+from db_session import get_session, init_db
+from sync_scheduler import DEFAULT_INTERVAL_MINUTES, get_sync_scheduler
+
+logger = logging.getLogger(__name__)
+
+_bootstrap_lock = threading.Lock()
+
+
+def sync_a_team_members():
+    """
+    Ensure all users with A-Team role exist in a_team_members table.
+
+    One INSERT ... SELECT adds the missing rows. Members without a name get
+    the capitalized first part of their email, as db.add_user_to_a_team_if_needed does.
+
+    Returns:
+        Number of members added
+    """
+    with get_session() as session:
+        added = session.execute(text("""
+            INSERT INTO a_team_members (email, full_name, is_active)
+            SELECT email,
+                   COALESCE(NULLIF(name, ''), upper(substr(first_part, 1, 1)) || lower(substr(first_part, 2))),
+                   1
+            FROM (
+                SELECT email, name,
+                       CASE WHEN instr(local_part, '.') > 0
+                            THEN substr(local_part, 1, instr(local_part, '.') - 1)
+                            ELSE local_part END AS first_part
+                FROM (
+                    SELECT u.email, u.name,
+                           CASE WHEN instr(u.email, '@') > 0
+                                THEN substr(u.email, 1, instr(u.email, '@') - 1)
+                                ELSE u.email END AS local_part
+                    FROM "User" u
+                    LEFT JOIN a_team_members m ON m.email = u.email
+                    WHERE u.role = 'A-Team' AND u.email IS NOT NULL AND m.email IS NULL
+                )
+            )
+        """)).rowcount
+        session.commit()
+    return added
+
+
+@st.cache_resource(show_spinner=False)
+def bootstrap_process():
+    """
+    Create/migrate the schema and add missing A-Team members, once per process.
+
+    st.cache_resource shares the result across every session; the lock also
+    covers callers outside a script run (e.g. background threads). A failure
+    is not cached, so the next rerun tries again; bootstrap_process.clear()
+    forces a re-run after the database file is replaced.
+
+    Returns:
+        Dict with when the bootstrap ran and how many members it added
+    """
+    with _bootstrap_lock:
+        init_db()
+        added = sync_a_team_members()
+
+    logger.info("Schema ready, %d A-Team member(s) added.", added)
+    return {"bootstrapped_at": datetime.now(), "members_added": added}
+
+
+@st.cache_resource(show_spinner=False)
+def start_sync_scheduler():
+    """
+    Start the background sheet sync (sync_scheduler.py), once per process.
+
+    The interval comes from secrets["secrets"]["sync_interval_minutes"].
+
+    Returns:
+        The running SyncScheduler
+    """
+    secrets = st.secrets["secrets"]
+    scheduler = get_sync_scheduler(secrets.get("sync_interval_minutes", DEFAULT_INTERVAL_MINUTES))
+    scheduler.start(secrets["gsheet_url"])
+    return scheduler
@@ -5,18 +5,11 @@ import plotly.graph_objects as go
 import datetime as dt
 import os
 from datetime import datetime
-from sqlalchemy import select
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
-from models import Feedback
+from db_session import get_session
+from page_metrics import dashboard_metrics
+from queries import count_converted, get_invitee_rollup
 
 
-def get_first_existing_column(df, options):
-    for col in options:
-        if col in df.columns:
-            return col
-    return None
-
 def show_dashboard_page(go_to):
     if "fta_data" not in st.session_state:
         st.error("FTA data not loaded. Please reload the application from the start.")
@@ -28,59 +21,17 @@ def show_dashboard_page(go_to):
         st.warning("FTA data not loaded.")
         st.stop()
 
-    fta_raw_df.columns = fta_raw_df.columns.str.strip().str.lower()
-
-    member_col = get_first_existing_column(
-        fta_raw_df, ["membership_interest", "would you like to be a member of tsp?"])
-    mg_col = get_first_existing_column(
-        fta_raw_df, ["consent", "i consent that the my data provided in this form can be used by the standpoint church as deemed appropriate.", "m&g consent"])
-    gender_col = get_first_existing_column(fta_raw_df, ["gender"])
-    invited_by_col = get_first_existing_column(
-        fta_raw_df, ["invited_by", "who invited you to tsp?"])
-    timestamp_col = get_first_existing_column(fta_raw_df, ["timestamp"])
-
-    if timestamp_col:
-        fta_raw_df[timestamp_col] = pd.to_datetime(fta_raw_df[timestamp_col], errors="coerce")
-        fta_raw_df["month"] = fta_raw_df[timestamp_col].dt.strftime("%b")
-        monthly_counts = fta_raw_df["month"].value_counts().sort_index()
-    else:
-        monthly_counts = pd.Series()
+    # The snapshot only tells us a sync has run; the numbers below come from
+    # the daily rollups for the selected window
 
     header, col_start, col_end, col_search = st.columns([3, 1, 1, 1.5])
     with header:
         st.markdown("### Welcome to the A-Team Dashboard")
     
     
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    DB_FILE = os.path.join(BASE_DIR, "database", "fta.db")
-
-    # Create the database folder if it doesn’t exist
-    os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
-
-    # SQLAlchemy connection string
-    DB_PATH = f"sqlite:///{DB_FILE}"
-    engine = create_engine(DB_PATH, connect_args={"check_same_thread": False})
-
-    # Create session factory
-    Session = sessionmaker(bind=engine)
-    session = Session()
-
-    
-    # Read with Pandas
-    with engine.connect() as conn:
-        all_feedback = pd.read_sql(select(Feedback), session.bind)
-
-    # Clean up column names
-    all_feedback.columns = all_feedback.columns.str.strip().str.lower()
-
-    if not all_feedback.empty:
-        # Clean up column names
-        all_feedback.columns = all_feedback.columns.str.strip().str.lower()
-        all_feedback["submitted_at"] = pd.to_datetime(all_feedback["submitted_at"], errors="coerce")
-
     min_date_str = "01/01/2025"
     min_date = datetime.strptime(min_date_str, "%m/%d/%Y").date()
-    # min_date = fta_raw_df[timestamp_col].min().date() if timestamp_col else dt.date.today()
+    # min_date = fta_raw_df["timestamp"].min().date()
     max_date = dt.date.today()
 
     with col_start:
@@ -94,40 +45,21 @@ def show_dashboard_page(go_to):
         st.error("Start date cannot be after end date.")
         st.stop()
 
-    if timestamp_col:
-        mask = (fta_raw_df[timestamp_col].dt.date >= start_date) & (fta_raw_df[timestamp_col].dt.date <= end_date)
-        df = fta_raw_df.loc[mask].copy()
-    else:
-        df = fta_raw_df.copy()
-
-    total_invitees = len(df)
-    member_intent = df[member_col].value_counts().to_dict() if member_col else {}
-
-    all_feedback["submitted_at"] = pd.to_datetime(all_feedback["submitted_at"], errors="coerce")
-    if all_feedback["submitted_at"].isna().all():
-        st.error("All values in 'submitted_at' failed to convert to datetime.")
-        st.stop()
-
-    if "submitted_at" in all_feedback:
-        mask = (all_feedback["submitted_at"].dt.date >= start_date) & (all_feedback["submitted_at"].dt.date <= end_date)
-        df_feedback = all_feedback.loc[mask].copy()
-    else:
-        df_feedback = all_feedback.copy()
-
-    mg_attended = "call_type"
-    converted = df_feedback[df_feedback[mg_attended] == "M&G Attended"]["fta_id"].drop_duplicates().count() if mg_attended else 0
-    conversion_rate = round((converted / total_invitees) * 100) if total_invitees else 0
-
-    mg_data = df[mg_col].value_counts().to_dict() if mg_col else {}
-    gender = df[gender_col].value_counts().to_dict() if gender_col else {}
-    member = df[member_col].value_counts().to_dict() if member_col else {}
-    invited_by = df[invited_by_col].value_counts().to_dict()
-
-    if timestamp_col:
-        df["month"] = df[timestamp_col].dt.strftime("%b")
-        monthly_counts = df["month"].value_counts().sort_index()
-    else:
-        monthly_counts = pd.Series(dtype=int)
+    # Daily invitee counts for the selected window (rollups.py) and one indexed count
+    with get_session() as session:
+        invitees = get_invitee_rollup(session, start_date, end_date)
+        converted = count_converted(session, start_date, end_date)
+
+    # Aggregations live in page_metrics.py so they can run without a browser
+    metrics = dashboard_metrics(invitees, converted)
+    total_invitees = metrics["total_invitees"]
+    converted = metrics["converted"]
+    conversion_rate = metrics["conversion_rate"]
+    member_intent = metrics["membership_interest"]
+    mg_data = metrics["consent"]
+    gender = metrics["gender"]
+    invited_by = metrics["invited_by"]
+    monthly_counts = metrics["monthly_counts"]
     
     
     st.markdown("""
@@ -243,10 +175,6 @@ def show_dashboard_page(go_to):
     #         st.plotly_chart(fig4, use_container_width=True)
     #     else:
     #         st.info("Monthly invitee data not available.")
-    # Ensure months are in chronological order
-    month_order = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    monthly_counts = monthly_counts.reindex(month_order).dropna()
-    
     bottom1, bottom2 = st.columns([2, 1])
     with bottom1:
         if not monthly_counts.empty:
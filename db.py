@@ -1,520 +1,43 @@
-# import streamlit as st
-# import bcrypt
-# import pandas as pd
-# from datetime import datetime
-# from sqlalchemy import or_, func, select, text
-# from sqlalchemy.exc import SQLAlchemyError
-# from sqlalchemy.orm import Session
-
-# from db_session import get_session  # ✅ single source of truth for sessions
-# from models import (
-#     User,
-#     ATeamMember,
-#     EmailLogs,
-#     FtaResponses,
-#     AssignmentTracker,
-#     FtaAssignments,
-#     Feedback,
-# )
-
-# from email.mime.text import MIMEText
-# from email.mime.multipart import MIMEMultipart
-# import smtplib
-# import hashlib
-
-# # =========================
-# # CONFIG (from Streamlit)
-# # =========================
-# sender_email = st.secrets["secrets"]["address"]
-# app_password = st.secrets["secrets"]["app_password"]
-
-# # =========================
-# # Helpers
-# # =========================
-
-# def _normalize_fta_id(fta_id):
-#     """Ensure FTA_ID is stored and compared consistently (string, stripped)."""
-#     if fta_id is None:
-#         return None
-#     return str(fta_id).strip()
-
-# def hash_pii(value):
-#     """Hash PII values using SHA-256 (store only hashed PII)."""
-#     if pd.isna(value) or value is None:
-#         return None
-#     return hashlib.sha256(str(value).encode("utf-8")).hexdigest()
-
-# # =========================
-# # A-Team sync utilities
-# # =========================
-
-# def sync_a_team_members():
-#     """Ensure all users with A-Team role exist in a_team_members table."""
-#     with get_session() as session:
-#         a_team_users = session.query(User).filter(User.role == "A-Team").all()
-#         for user in a_team_users:
-#             if not session.query(ATeamMember).filter_by(email=user.email).first():
-#                 full_name = user.name or user.email.split("@")[0].split(".")[0].capitalize()
-#                 session.add(ATeamMember(email=user.email, full_name=full_name))
-#         session.commit()
-
-# def add_user_to_a_team_if_needed(user: User, session: Session):
-#     """Add a new A-Team user to a_team_members."""
-#     if user.role == "A-Team":
-#         if not session.query(ATeamMember).filter_by(email=user.email).first():
-#             full_name = user.name or user.email.split("@")[0].split(".")[0].capitalize()
-#             session.add(ATeamMember(email=user.email, full_name=full_name))
-
-# # =========================
-# # Auth
-# # =========================
-
-# def authenticate_user(email, password):
-#     with get_session() as session:
-#         user = session.query(User).filter_by(email=email).first()
-#         if not user:
-#             return False
-#         stored = user.password_hash
-#         if isinstance(stored, str):
-#             stored = stored.encode()
-#         return bcrypt.checkpw(password.encode(), stored)
-
-# def get_user_role(email):
-#     with get_session() as session:
-#         user = session.query(User).filter_by(email=email).first()
-#         return user.role if user else None
-
-# def reset_password(email, new_password):
-#     with get_session() as session:
-#         user = session.query(User).filter_by(email=email).first()
-#         if user:
-#             user.password_hash = bcrypt.hashpw(new_password.encode(), bcrypt.gensalt())
-#             session.commit()
-
-# # =========================
-# # Email sending (idempotent)
-# # =========================
-
-# def send_email(receiver_email, fta_name):
-#     subject = "Welcome to The Standpoint Church – We're Glad You Came!"
-#     body = f"""
-#     <html>
-#       <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-#         <p>Dear {fta_name},</p>
-#         <p>
-#           We’re truly honored that you chose to worship with us at <strong>The Standpoint Church</strong>.
-#           On behalf of our Senior Pastor, <strong>Dr. Phil Ransom-Bello</strong>, and the entire Standpoint family,
-#           we want to say a big <strong>THANK YOU</strong> for fellowshipping with us!
-#         </p>
-#         <p>
-#           We believe that your presence is not by chance but part of God’s divine orchestration,
-#           and we are excited about all that God has in store for you from here.
-#         </p>
-#         <p>
-#           Whether this was your first time or you’ve visited before, please know that you're
-#           <strong>seen, valued, and loved</strong>. Our prayer is that you find purpose, truth, and transformation
-#           as you continue to encounter God's Word in this house.
-#         </p>
-#         <p>
-#           We look forward to seeing you again, growing together, and walking this journey of faith alongside you.
-#         </p>
-#         <br>
-#         <p style="margin-top: 30px;">
-#           With love and honor,<br>
-#           <strong>The A-Team</strong><br>
-#           <em>For Dr. Phil Ransom-Bello</em><br>
-#           <em>Lead Pastor, The Standpoint Church</em>
-#         </p>
-#       </body>
-#     </html>
-#     """
-#     message = MIMEMultipart("alternative")
-#     message["Subject"] = subject
-#     message["From"] = sender_email
-#     message["To"] = receiver_email
-#     message.attach(MIMEText(body, "html"))
-
-#     try:
-#         server = smtplib.SMTP("smtp.gmail.com", 587)
-#         server.starttls()
-#         server.login(sender_email, app_password)
-#         server.sendmail(sender_email, receiver_email, message.as_string())
-#         server.quit()
-#         return True, subject, None
-#     except Exception as e:
-#         return False, None, str(e)
-
-# def log_email_sent(session: Session, fta_id, email, fta_name, subject, status="sent", error_message=None):
-#     """Log an email attempt. Uses normalized FTA_ID and commits via passed session."""
-#     log = EmailLogs(
-#         fta_id=_normalize_fta_id(fta_id),
-#         fta_name=fta_name,
-#         email=email,
-#         subject=subject,
-#         status=status,
-#         error_message=error_message,
-#         timestamp=datetime.now(),  # store raw datetime; SQLAlchemy/SQLite will handle
-#     )
-#     session.add(log)
-
-# def email_already_sent(session: Session, fta_id) -> bool:
-#     """Return True if a successful 'sent' log exists for this FTA_ID (normalized)."""
-#     nid = _normalize_fta_id(fta_id)
-#     if nid is None:
-#         return False
-#     exists = (
-#         session.query(EmailLogs)
-#         .filter(
-#             EmailLogs.fta_id == nid,
-#             func.lower(EmailLogs.status) == "sent",
-#         )
-#         .first()
-#     )
-#     return exists is not None
-
-# # =========================
-# # Email logs management
-# # =========================
-
-# def get_email_logs():
-#     with get_session() as session:
-#         logs = session.query(EmailLogs).order_by(EmailLogs.timestamp.desc()).all()
-#         rows = [{
-#             "fta_id": log.fta_id,
-#             "fta_name": log.fta_name,
-#             "email": log.email,
-#             "subject": log.subject,
-#             "status": log.status,
-#             "error_message": log.error_message,
-#             "timestamp": log.timestamp,
-#         } for log in logs]
-#     return pd.DataFrame(rows)
-
-# def clear_email_logs():
-#     with get_session() as session:
-#         session.query(EmailLogs).delete()
-#         session.commit()
-
-# def delete_failed_email_logs():
-#     with get_session() as session:
-#         session.query(EmailLogs).filter(
-#             or_(
-#                 EmailLogs.status == None,
-#                 func.lower(EmailLogs.status).in_(["failed", "error"]),
-#             )
-#         ).delete(synchronize_session=False)
-#         session.commit()
-
-# def resend_failed_emails():
-#     """Attempt to resend only failed emails that have not since been sent successfully."""
-#     with get_session() as session:
-#         failed_logs = (
-#             session.query(EmailLogs)
-#             .filter(func.lower(EmailLogs.status) == "failed")
-#             .order_by(EmailLogs.timestamp.asc())
-#             .all()
-#         )
-
-#         if not failed_logs:
-#             st.info("✅ No failed email logs to resend.")
-#             return
-
-#         st.write(f"🔄 Attempting to resend {len(failed_logs)} failed emails...")
-
-#         for flog in failed_logs:
-#             # Skip if a successful send has already happened later for the same FTA_ID
-#             if email_already_sent(session, flog.fta_id):
-#                 continue
-
-#             success, subject, err = send_email(flog.email, flog.fta_name)
-
-#             # Update the same log row to avoid log explosion
-#             if success:
-#                 flog.status = "sent"
-#                 flog.subject = subject
-#                 flog.error_message = None
-#             else:
-#                 flog.status = "failed"
-#                 flog.error_message = err or "Retry failed"
-#             flog.timestamp = datetime.now()
-
-#         session.commit()
-#         st.success("✅ Resend attempt completed.")
-
-# # =========================
-# # A-Team members
-# # =========================
-
-# def get_all_a_team_members():
-#     with get_session() as session:
-#         members = session.query(User).filter(User.role == "A-Team").all()
-#         rows = [{
-#             "id": m.id,
-#             "name": m.name,
-#             "email": m.email,
-#             "role": m.role,
-#         } for m in members]
-#     return pd.DataFrame(rows)
-
-# def add_a_team_member(email, full_name):
-#     with get_session() as session:
-#         existing = session.query(User).filter_by(email=email).first()
-#         if not existing:
-#             member = User(email=email, name=full_name, role="A-Team")
-#             session.add(member)
-#             # keep a-team mirror table in sync
-#             add_user_to_a_team_if_needed(member, session)
-#             session.commit()
-
-# # =========================
-# # Assignment utilities
-# # =========================
-
-# def init_assignment_tracker():
-#     with get_session() as session:
-#         tracker = session.query(AssignmentTracker).filter_by(id=1).first()
-#         if not tracker:
-#             tracker = AssignmentTracker(id=1, last_assigned_index=-1)
-#             session.add(tracker)
-#             session.commit()
-
-# def get_existing_assignments():
-#     with get_session() as session:
-#         assignments = session.query(FtaAssignments).all()
-#         rows = [{
-#             "fta_id": a.fta_id,
-#             "name": a.name,
-#             "assigned_to": a.assigned_to,
-#             "assigned_at": a.assigned_at,
-#         } for a in assignments]
-#     return pd.DataFrame(rows)
-
-# def assign_new_ftas(fta_df: pd.DataFrame):
-#     """Round-robin assign only unassigned FTA IDs to A-Team members."""
-#     fta_df = fta_df.copy()
-#     fta_df.columns = fta_df.columns.str.strip()
-
-#     if "FTA ID" not in fta_df.columns:
-#         raise ValueError("Missing 'FTA ID' column in FTA data (Google Sheet).")
-
-#     # Normalize to strings for consistent matching
-#     fta_df["FTA ID"] = fta_df["FTA ID"].map(_normalize_fta_id)
-
-#     # Existing assignments
-#     try:
-#         existing = get_existing_assignments()
-#         assigned_ids = set(existing["fta_id"].astype(str)) if not existing.empty else set()
-#     except Exception as e:
-#         print(f"[Assign Info] No existing assignments found: {e}")
-#         assigned_ids = set()
-
-#     unassigned = fta_df[~fta_df["FTA ID"].isin(assigned_ids)].copy()
-#     if unassigned.empty:
-#         print("[Assign Info] No unassigned FTAs found.")
-#         return get_existing_assignments()
-
-#     with get_session() as session:
-#         members = session.query(User).filter(User.role == "A-Team").all()
-#         member_count = len(members)
-#         if member_count == 0:
-#             raise Exception("No A-Team members available for assignment.")
-
-#         tracker = session.query(AssignmentTracker).filter_by(id=1).first()
-#         last_index = tracker.last_assigned_index if tracker else -1
-#         current_index = (last_index + 1) % member_count
-
-#         to_add = []
-#         for _, row in unassigned.iterrows():
-#             assigned_to_user = members[current_index]
-#             a = FtaAssignments(
-#                 fta_id=_normalize_fta_id(row["FTA ID"]),
-#                 name=row.get("Full Name", "Unknown"),
-#                 assigned_to=assigned_to_user.email,
-#                 assigned_by=assigned_to_user.id,
-#                 assigned_at=datetime.now(),
-#             )
-#             to_add.append(a)
-#             current_index = (current_index + 1) % member_count
-
-#         try:
-#             session.add_all(to_add)
-#             if tracker:
-#                 tracker.last_assigned_index = (current_index - 1) % member_count
-#             else:
-#                 session.add(AssignmentTracker(id=1, last_assigned_index=(current_index - 1) % member_count))
-#             session.commit()
-#             print(f"[Assign Success] Assigned {len(to_add)} new FTAs.")
-#         except SQLAlchemyError as e:
-#             session.rollback()
-#             print(f"[DB Error] Assignment failed: {e}")
-
-#     return get_existing_assignments()
-
-# # =========================
-# # Sync & email pipeline
-# # =========================
-
-# def sync_and_assign_fta_responses(gsheet_url):
-#     """
-#     Pulls CSV from Google Sheet, upserts FtaResponses,
-#     idempotently sends welcome email once per FTA_ID, and assigns FTAs.
-#     """
-#     print("\n=== [SYNC START] ===")
-#     # ---- fetch data
-#     try:
-#         df = pd.read_csv(gsheet_url)
-#         df.columns = df.columns.str.strip()
-#         print(f"[Sync Info] Pulled {len(df)} rows from Google Sheets.")
-#         print(f"[Sync Info] Columns found: {list(df.columns)}")
-#         # normalize FTA ID column name
-#         for alias in ["fta_id", "Fta Id"]:
-#             if alias in df.columns:
-#                 df.rename(columns={alias: "FTA ID"}, inplace=True)
-#         if "FTA ID" not in df.columns:
-#             print("[Sync Error] 'FTA ID' column is missing in the sheet.")
-#             return pd.DataFrame()
-#         # normalize FTA_ID to string
-#         df["FTA ID"] = df["FTA ID"].map(_normalize_fta_id)
-#         # dedupe by FTA_ID
-#         df = df.drop_duplicates(subset=["FTA ID"]).reset_index(drop=True)
-#         if df.empty:
-#             print("[Sync Info] No data available after deduplication.")
-#             return pd.DataFrame()
-#     except Exception as e:
-#         print(f"[Sync Error] Failed to fetch sheet: {e}")
-#         return pd.DataFrame()
-
-#     # ---- upsert & email (single session, consistent commits)
-#     with get_session() as session:
-#         try:
-#             for _, row in df.iterrows():
-#                 fta_id = row.get("FTA ID")
-#                 if not fta_id:
-#                     print(f"[Skip] Missing FTA ID for row: {row.to_dict()}")
-#                     continue
-
-#                 name_raw = row.get("Full Name", "FTA")
-#                 email_raw = row.get("Email address")
-#                 if not email_raw:
-#                     print(f"[Skip] Missing email for FTA ID {fta_id}")
-#                     continue
-
-#                 # Hash PII for storage
-#                 hashed_email = hash_pii(email_raw)
-#                 hashed_name = hash_pii(name_raw)
-#                 hashed_phone = hash_pii(row.get("Phone number"))
-#                 hashed_address = hash_pii(row.get("Home Address"))
-
-#                 existing = session.query(FtaResponses).filter(FtaResponses.FTA_ID == fta_id).first()
-
-#                 # parse dates robustly (no locale ambiguity)
-#                 ts = pd.to_datetime(row.get("Timestamp"), errors="coerce") if row.get("Timestamp") else None
-#                 mtg = pd.to_datetime(row.get("Meeting Date"), errors="coerce") if row.get("Meeting Date") else None
-
-#                 if existing:
-#                     # update existing
-#                     existing.Timestamp = ts
-#                     existing.Email_address = hashed_email
-#                     existing.Full_Name = hashed_name
-#                     existing.Phone_number = hashed_phone
-#                     existing.Gender = row.get("Gender")
-#                     existing.Home_Address = hashed_address
-#                     existing.Service_Experience = int(row.get("Service Experience", 0) or 0)
-#                     existing.Worship_Experience = int(row.get("Worship Experience", 0) or 0)
-#                     existing.Word_Experience = float(row.get("Word Experience", 0.0) or 0.0)
-#                     existing.General_Feedback = row.get("General Feedback")
-#                     existing.Invited_By = row.get("Invited By")
-#                     existing.Membership_Interest = row.get("Membership Interest")
-#                     existing.Consent = row.get("Consent")
-#                     existing.Meeting_Date = mtg
-#                 else:
-#                     # insert new
-#                     new_response = FtaResponses(
-#                         Timestamp=ts,
-#                         Email_address=hashed_email,
-#                         Full_Name=hashed_name,
-#                         Phone_number=hashed_phone,
-#                         Gender=row.get("Gender"),
-#                         Home_Address=hashed_address,
-#                         Service_Experience=int(row.get("Service Experience", 0) or 0),
-#                         Worship_Experience=int(row.get("Worship Experience", 0) or 0),
-#                         Word_Experience=float(row.get("Word Experience", 0.0) or 0.0),
-#                         General_Feedback=row.get("General Feedback"),
-#                         Invited_By=row.get("Invited By"),
-#                         Membership_Interest=row.get("Membership Interest"),
-#                         Consent=row.get("Consent"),
-#                         Meeting_Date=mtg,
-#                         FTA_ID=fta_id,
-#                     )
-#                     session.add(new_response)
-
-#                 # ---- Idempotent email send: only if never successfully sent before
-#                 if not email_already_sent(session, fta_id):
-#                     success, subject, err = send_email(email_raw, name_raw)
-#                     if success:
-#                         log_email_sent(session, fta_id, email_raw, name_raw, subject, status="sent")
-#                     else:
-#                         # log failure but do NOT block commit/upsert
-#                         log_email_sent(session, fta_id, email_raw, name_raw, subject or "No Subject", status="failed", error_message=err)
-
-#             # OPTIONAL: checkpoint WAL so external tools see changes immediately
-#             # session.execute(text("PRAGMA wal_checkpoint(FULL);"))
-#             session.commit()
-#             print("[Sync Success] Changes committed to database.")
-#         except SQLAlchemyError as e:
-#             session.rollback()
-#             print(f"[DB Commit Error] {e}")
-
-#     # ---- Assign after saving
-#     try:
-#         if not df.empty:
-#             assign_new_ftas(df)
-#             print("[Assignment] FTA assignments updated successfully.")
-#     except Exception as e:
-#         print(f"[Assignment Error] {e}")
-
-#     print("=== [SYNC END] ===\n")
-#     return df
-
-# ___--------------------------------------------------------------------------------------------
+import logging
 import streamlit as st
 import bcrypt
-import os
 import pandas as pd
 from datetime import datetime
 from sqlalchemy.orm import Session
-from models import Feedback, EmailLogs, User
-from sqlalchemy import or_, func
+from models import Feedback, EmailLogs, EmailOutbox, User
+from sqlalchemy import or_, func, text
 from sqlalchemy.exc import SQLAlchemyError
-from db_session import SessionLocal
+from db_session import SessionLocal, engine
 from email_utils import send_email_to_fta
-import hashlib
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from models import FtaResponses, AssignmentTracker, FtaAssignments
+from models import AssignmentTracker, FtaAssignments, SyncState
+from smtp_transport import get_transport
+from email_dispatcher import send_concurrently
+from email_outbox import enqueue_welcome_emails, dispatch_pending_emails_in_background, remaining_daily_quota
+from fta_allocator import LeastLoadedAllocator
+from fta_status import refresh_fta_status
+from rollups import days_of, refresh_invitee_days, stored_response_days
+from fta_ingest import (compute_row_digests, compute_sheet_digest, dedupe_sheet_rows, load_known_digests,
+                        select_changed_rows, build_response_records, bulk_upsert_fta_responses,
+                        record_rejected_rows)
+from fta_schema import apply_schema, compile_mapping, conform_column
+from sheet_cache import fetch_sheet
+from sync_journal import SyncJournal
 from sqlalchemy.orm import Session
 from db_session import get_session
 from models import User, ATeamMember
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+# Re-exported: it lives in bootstrap so the login page can start without importing this module
+from bootstrap import sync_a_team_members
 
+logger = logging.getLogger(__name__)
 
-# ============ CONFIG ============
-sender_email = st.secrets["secrets"]["address"]
-app_password = st.secrets["secrets"]["app_password"]
 
+# ============ CONFIG ============
+def get_sender_email():
+    """Sender address from Streamlit secrets, read on first send rather than at import."""
+    return st.secrets["secrets"]["address"]
 
-def sync_a_team_members():
-    """Ensure all users with A-Team role exist in a_team_members table."""
-    with get_session() as session:
-        a_team_users = session.query(User).filter(User.role == "A-Team").all()
-        for user in a_team_users:
-            exists = session.query(ATeamMember).filter_by(email=user.email).first()
-            if not exists:
-                full_name = user.name or user.email.split("@")[0].split(".")[0].capitalize()
-                session.add(ATeamMember(email=user.email, full_name=full_name))
-        session.commit()
 
 def add_user_to_a_team_if_needed(user: User, session: Session):
     """Add a new A-Team user to a_team_members."""
@@ -539,15 +62,13 @@ def toggle_a_team_member_status(email, is_active):
                 member.is_active = is_active
                 session.commit()
                 session.flush()  # Ensure changes are written
-                print(f"✅ Toggled {email} to is_active={is_active}")
+                logger.info("Set %s is_active=%s", email, is_active)
                 return True
             else:
-                print(f"❌ Member {email} not found")
+                logger.warning("Member %s not found", email)
                 return False
-    except Exception as e:
-        print(f"❌ Error toggling status: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Could not toggle status for %s", email)
         return False
 
 def get_active_a_team_members():
@@ -562,7 +83,6 @@ def get_active_a_team_members():
 
 def get_all_a_team_members_with_status():
     """Get all A-Team members with their active status"""
-    # import pandas as pd
     with get_session() as session:
         members = session.query(ATeamMember).all()
         return pd.DataFrame([{
@@ -580,36 +100,29 @@ def toggle_a_team_member_status_direct(email, is_active):
         email: Email of the A-Team member
         is_active: Boolean - True to activate, False to deactivate
     """
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    DB_FILE = os.path.join(BASE_DIR, "database", "fta.db")
-    DB_PATH = f"sqlite:///{DB_FILE}"
-    
-    engine = create_engine(DB_PATH, connect_args={"check_same_thread": False})
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    session = SessionLocal()
     
     try:
         member = session.query(ATeamMember).filter_by(email=email).first()
         
         if member:
-            print(f"Found member: {member.email}, current status: {member.is_active}")
+            logger.debug("Found member %s, current status %s", member.email, member.is_active)
             member.is_active = is_active
             session.commit()
-            print(f"Updated {email} to is_active={is_active}")
-            
-            # Verify the change
-            session.refresh(member)
-            print(f"Verified: {member.email} is now is_active={member.is_active}")
-            
+            logger.info("Set %s is_active=%s", email, is_active)
+
+            # Verify the change (an extra read, so only when debugging)
+            if logger.isEnabledFor(logging.DEBUG):
+                session.refresh(member)
+                logger.debug("Verified %s is now is_active=%s", member.email, member.is_active)
+
             return True
         else:
-            print(f"Member {email} not found in database")
+            logger.warning("Member %s not found in database", email)
             return False
             
-    except Exception as e:
-        print(f"Error toggling status: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Could not toggle status for %s", email)
         session.rollback()
         return False
     finally:
@@ -621,45 +134,39 @@ def toggle_a_team_member_status_sql(email, is_active):
     """
     Toggle using raw SQL - most reliable method
     """
-    import sqlite3
-    
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    DB_FILE = os.path.join(BASE_DIR, "database", "fta.db")
-    
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        
-        # Check if member exists
-        cursor.execute("SELECT email, is_active FROM a_team_members WHERE email = ?", (email,))
-        result = cursor.fetchone()
-        
-        if result:
-            print(f"Current status for {email}: {result[1]}")
+        # Shared engine, so the WAL/busy_timeout pragmas apply here too
+        with engine.begin() as conn:
+            # Check if member exists
+            result = conn.execute(
+                text("SELECT email, is_active FROM a_team_members WHERE email = :email"),
+                {"email": email}
+            ).fetchone()
             
-            # Update the status
-            cursor.execute(
-                "UPDATE a_team_members SET is_active = ? WHERE email = ?",
-                (1 if is_active else 0, email)
-            )
-            conn.commit()
-            
-            # Verify
-            cursor.execute("SELECT is_active FROM a_team_members WHERE email = ?", (email,))
-            new_status = cursor.fetchone()[0]
-            print(f"New status for {email}: {new_status}")
-            
-            conn.close()
-            return True
-        else:
-            print(f"Member {email} not found")
-            conn.close()
-            return False
+            if result:
+                logger.debug("Current status for %s: %s", email, result[1])
+                
+                # Update the status
+                conn.execute(
+                    text("UPDATE a_team_members SET is_active = :is_active WHERE email = :email"),
+                    {"is_active": 1 if is_active else 0, "email": email}
+                )
+                
+                # Verify (an extra read, so only when debugging)
+                if logger.isEnabledFor(logging.DEBUG):
+                    new_status = conn.execute(
+                        text("SELECT is_active FROM a_team_members WHERE email = :email"),
+                        {"email": email}
+                    ).scalar()
+                    logger.debug("New status for %s: %s", email, new_status)
+                logger.info("Set %s is_active=%s", email, is_active)
+                return True
+            else:
+                logger.warning("Member %s not found", email)
+                return False
             
-    except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Could not toggle status for %s", email)
         return False
 # ============ AUTH ============
 
@@ -727,20 +234,13 @@ def send_email(receiver_email, fta_name):
     """
     message = MIMEMultipart("alternative")
     message["Subject"] = subject
-    message["From"] = sender_email
+    message["From"] = get_sender_email()
     message["To"] = receiver_email
     message.attach(MIMEText(body, "html"))
 
-    try:
-        server = smtplib.SMTP("smtp.gmail.com", 587)
-        server.starttls()
-        server.login(sender_email, app_password)
-        server.sendmail(sender_email, receiver_email, message.as_string())
-        server.quit()
-        return True, subject
-    except Exception as e:
-        print(f"[Email Error] {e}")
-        return False, None
+    # SMTP errors propagate: send_concurrently keeps their text for email_logs
+    get_transport().send(message)
+    return True, subject
 
 
 def log_email_sent(fta_id, email, fta_name, subject, status="sent", error_message=None):
@@ -765,35 +265,86 @@ def email_already_sent(fta_id):
     return exists is not None
 
 # --- New function to resend failed emails ---
-def resend_failed_emails():
+def get_failed_email_jobs():
+    """
+    One resend job per FTA whose emails have only ever failed.
+
+    FTAs with any 'sent' log are skipped, and repeated failures for the same
+    FTA collapse into a single job (the most recent address and name).
+    """
     db = SessionLocal()
-    failed_logs = db.query(EmailLogs).filter(EmailLogs.status == "failed").all()
-    db.close()
+    try:
+        sent_ids = db.query(EmailLogs.fta_id).filter(EmailLogs.status == "sent")
+        latest = (
+            db.query(EmailLogs.fta_id, func.max(EmailLogs.id).label("log_id"))
+            .filter(EmailLogs.status == "failed", EmailLogs.fta_id.notin_(sent_ids))
+            .group_by(EmailLogs.fta_id)
+            .subquery()
+        )
+        rows = (
+            db.query(EmailLogs.fta_id, EmailLogs.email, EmailLogs.fta_name)
+            .join(latest, EmailLogs.id == latest.c.log_id)
+            .order_by(EmailLogs.timestamp.asc())
+            .all()
+        )
+        return [{"fta_id": r.fta_id, "email": r.email, "fta_name": r.fta_name} for r in rows]
+    finally:
+        db.close()
+
 
-    if not failed_logs:
+# --- Resend failed emails concurrently, within Gmail's quota ---
+def resend_failed_emails():
+    jobs = get_failed_email_jobs()
+
+    if not jobs:
         st.info("✅ No failed email logs to resend.")
         return
 
-    st.write(f"🔄 Attempting to resend {len(failed_logs)} failed emails...")
+    remaining_quota = remaining_daily_quota()
+    if remaining_quota <= 0:
+        st.warning("⚠️ Daily Gmail sending limit reached. Please try again tomorrow.")
+        return
+    if len(jobs) > remaining_quota:
+        st.warning(f"⚠️ Only {remaining_quota} email(s) left in today's Gmail quota; resending the oldest first.")
+        jobs = jobs[:remaining_quota]
+
+    st.write(f"🔄 Attempting to resend {len(jobs)} failed emails...")
+    progress = st.progress(0.0)
+    status_text = st.empty()
+    tally = {"sent": 0, "failed": 0}
 
-    for log in failed_logs:
-        success, subject = send_email(log.email, log.fta_name)
+    def on_progress(done, total, result):
+        tally["sent" if result[1] else "failed"] += 1
+        progress.progress(done / total)
+        status_text.write(f"{done}/{total} processed — {tally['sent']} sent, {tally['failed']} failed")
 
-        # Capture new log with error message if failed
-        if success:
-            log_email_sent(log.fta_id, log.email, log.fta_name, subject, status="sent")
-        else:
-            log_email_sent(
-                log.fta_id,
-                log.email,
-                log.fta_name,
-                subject or "No Subject",
-                status="failed",
-                error_message="Retry failed"  # Will be overwritten by send_email's error message handling
+    results = send_concurrently(jobs, send_email, on_progress=on_progress)
+
+    # Record every outcome in one transaction
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+        for job, sent, subject, error in results:
+            db.add(EmailLogs(
+                fta_id=job["fta_id"],
+                fta_name=job["fta_name"],
+                email=job["email"],
+                subject=subject if sent else (subject or "No Subject"),
+                status="sent" if sent else "failed",
+                error_message=None if sent else (error or "Retry failed"),
+                timestamp=now,
+            ))
+        sent_ids = [job["fta_id"] for job, sent, _, _ in results if sent]
+        if sent_ids:
+            db.query(EmailOutbox).filter(EmailOutbox.fta_id.in_(sent_ids)).update(
+                {"status": "sent", "sent_at": now, "last_error": None}, synchronize_session=False
             )
+        db.commit()
+    finally:
+        db.close()
+
+    st.success(f"✅ Resend attempt completed: {tally['sent']} sent, {tally['failed']} failed.")
 
-    st.success("✅ Resend attempt completed.")
-    
 
 def get_all_a_team_members():
     db = SessionLocal()
@@ -812,6 +363,7 @@ def add_a_team_member(email, full_name):
     if not existing:
         new_member = User(email=email, name=full_name, role="A-Team")
         db.add(new_member)
+        add_user_to_a_team_if_needed(new_member, db)
         db.commit()
     db.close()
 
@@ -865,6 +417,7 @@ def add_a_team_member(email, full_name):
     if not existing:
         member = User(email=email, name=full_name, role="A-Team")
         db.add(member)
+        add_user_to_a_team_if_needed(member, db)
         db.commit()
     db.close()
 
@@ -895,6 +448,39 @@ def get_existing_assignments():
         "assigned_at": a.assigned_at
     } for a in assignments])
 
+def get_unassigned_fta_ids(session, fta_ids):
+    """
+    Return the subset of `fta_ids` that has no row in fta_assignments.
+
+    The incoming IDs go into a temp table and are anti-joined against
+    fta_assignments in SQLite (using its unique fta_id index), so the cost
+    depends on the size of the sheet rather than the assignment history.
+
+    Args:
+        session: Open SQLAlchemy session
+        fta_ids: Iterable of normalized FTA ID strings
+
+    Returns:
+        Set of FTA IDs that still need assigning
+    """
+    fta_ids = {fta_id for fta_id in fta_ids if fta_id}
+    if not fta_ids:
+        return set()
+
+    session.execute(text("CREATE TEMP TABLE IF NOT EXISTS incoming_fta_ids (fta_id TEXT PRIMARY KEY)"))
+    session.execute(text("DELETE FROM incoming_fta_ids"))
+    session.execute(
+        text("INSERT INTO incoming_fta_ids (fta_id) VALUES (:fta_id)"),
+        [{"fta_id": fta_id} for fta_id in fta_ids],
+    )
+    rows = session.execute(text(
+        "SELECT i.fta_id FROM incoming_fta_ids i "
+        "LEFT JOIN fta_assignments a ON a.fta_id = i.fta_id "
+        "WHERE a.fta_id IS NULL"
+    )).all()
+    session.execute(text("DELETE FROM incoming_fta_ids"))
+    return {row[0] for row in rows}
+
 def get_active_a_team_members_for_assignment():
     """
     Get ONLY active A-Team members for new FTA assignments.
@@ -918,103 +504,35 @@ def get_active_a_team_members_for_assignment():
     
 
 
-# def assign_new_ftas(fta_df):
-#     fta_df.columns = fta_df.columns.str.strip()
-
-#     # Ensure the FTA ID column exists in the sheet data
-#     if "FTA ID" not in fta_df.columns:
-#         raise ValueError("Missing 'FTA ID' column in FTA data (Google Sheet).")
-
-#     # Get existing assignments from DB (empty if none)
-#     try:
-#         existing_assignments = get_existing_assignments()
-#         assigned_ids = set(existing_assignments['fta_id']) if not existing_assignments.empty else set()
-#     except Exception as e:
-#         print(f"[Assign Info] No existing assignments found: {e}")
-#         assigned_ids = set()
-
-#     # Only assign FTAs that are not already assigned
-#     unassigned_ftas = fta_df[~fta_df['FTA ID'].isin(assigned_ids)].copy()
-#     if unassigned_ftas.empty:
-#         print("[Assign Info] No unassigned FTAs found.")
-#         return existing_assignments
-
-#     db = SessionLocal()
-
-#     # Get A-Team members
-#     members = db.query(User).filter(User.role == "A-Team").all()
-#     member_count = len(members)
-#     if member_count == 0:
-#         db.close()
-#         raise Exception("No A-Team members available for assignment.")
-
-#     # Get last assigned index for round-robin distribution
-#     tracker = db.query(AssignmentTracker).filter_by(id=1).first()
-#     last_index = tracker.last_assigned_index if tracker else -1
-
-#     assignments = []
-#     current_index = (last_index + 1) % member_count
-
-#     for _, row in unassigned_ftas.iterrows():
-#         assigned_to_user = members[current_index]
-#         assignment = FtaAssignments(
-#             fta_id=row["FTA ID"],
-#             name=row.get("Full Name", "Unknown"),
-#             assigned_to=assigned_to_user.email,
-#             assigned_by=assigned_to_user.id,
-#             assigned_at=datetime.now()
-#         )
-#         assignments.append(assignment)
-#         current_index = (current_index + 1) % member_count
-
-#     try:
-#         db.add_all(assignments)
-
-#         # Update tracker
-#         if tracker:
-#             tracker.last_assigned_index = (current_index - 1) % member_count
-#         else:
-#             tracker = AssignmentTracker(id=1, last_assigned_index=(current_index - 1) % member_count)
-#             db.add(tracker)
-
-#         db.commit()
-#         print(f"[Assign Success] Assigned {len(assignments)} new FTAs.")
-#     except SQLAlchemyError as e:
-#         db.rollback()
-#         print(f"[DB Error] Assignment failed: {e}")
-#     finally:
-#         db.close()
-
-#     return get_existing_assignments()
-
-def assign_new_ftas(fta_df):
+def assign_new_ftas(fta_df, return_assignments=False):
     """
-    Assign new FTAs only to ACTIVE A-Team members using round-robin distribution.
+    Assign new FTAs only to ACTIVE A-Team members, always picking the member
+    with the fewest assignments (see fta_allocator.LeastLoadedAllocator).
     Skips FTAs that are already assigned.
+
+    Args:
+        fta_df: Sheet data with raw or canonical headers; only the FTA ID and
+            full name columns are read (see fta_schema.conform_column)
+        return_assignments: Also load and return every assignment afterwards.
+            Off by default because that read grows with the whole history.
+
+    Returns:
+        DataFrame of all assignments if return_assignments is True,
+        otherwise the number of FTAs assigned by this call
     """
-    fta_df = fta_df.copy()
-    fta_df.columns = fta_df.columns.str.strip()
+    fta_df = pd.DataFrame({"fta_id": conform_column(fta_df, "fta_id"),
+                           "full_name": conform_column(fta_df, "full_name")})
+    fta_df = fta_df[fta_df["fta_id"].notna()]
 
-    if "FTA ID" not in fta_df.columns:
-        raise ValueError("Missing 'FTA ID' column in FTA data (Google Sheet).")
+    # Let the database work out which incoming IDs have no assignment yet
+    with get_session() as session:
+        unassigned_ids = get_unassigned_fta_ids(session, fta_df["fta_id"])
 
-    # Normalize FTA IDs to strings
-    fta_df["FTA ID"] = fta_df["FTA ID"].astype(str).str.strip()
+    unassigned_ftas = fta_df[fta_df["fta_id"].isin(unassigned_ids)].drop_duplicates(subset=["fta_id"])
 
-    # Get existing assignments
-    try:
-        existing_assignments = get_existing_assignments()
-        assigned_ids = set(existing_assignments['fta_id'].astype(str)) if not existing_assignments.empty else set()
-    except Exception as e:
-        print(f"[Assign Info] No existing assignments found: {e}")
-        assigned_ids = set()
-
-    # Filter out already assigned FTAs
-    unassigned_ftas = fta_df[~fta_df['FTA ID'].isin(assigned_ids)].copy()
-    
     if unassigned_ftas.empty:
-        print("[Assign Info] No unassigned FTAs found.")
-        return get_existing_assignments()
+        logger.debug("No unassigned FTAs found.")
+        return get_existing_assignments() if return_assignments else 0
 
     db = SessionLocal()
 
@@ -1025,10 +543,10 @@ def assign_new_ftas(fta_df):
         
         if member_count == 0:
             db.close()
-            print("[Assign Error] ❌ No active A-Team members available for assignment.")
+            logger.error("No active A-Team members available for assignment.")
             raise Exception("No active A-Team members available for assignment. Please activate at least one member.")
 
-        print(f"[Assign Info] Found {member_count} active A-Team member(s) for assignment.")
+        logger.debug("Found %d active A-Team member(s) for assignment.", member_count)
         
         # Get active member emails
         active_emails = [m.email for m in active_members]
@@ -1049,51 +567,42 @@ def assign_new_ftas(fta_df):
         for email, count in active_assignment_counts:
             counts[email] = count
 
-        # Sort active members by current assignment count (least assigned first)
-        sorted_active = sorted(
-            [(m, counts.get(m.email, 0)) for m in active_members],
-            key=lambda x: x[1]
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            for email in sorted(counts, key=lambda e: (counts[e], e)):
+                logger.debug("Current load: %s has %d assignment(s)", email, counts[email])
 
-        print(f"[Assign Info] Current assignment distribution among active members:")
-        for member, count in sorted_active:
-            print(f"  - {member.email}: {count} assignments")
+        # Always hand the next FTA to the least-loaded active member
+        allocator = LeastLoadedAllocator(counts)
+        users_by_email = {m.email: m for m in active_members}
+        fta_ids = unassigned_ftas["fta_id"]
+        names = unassigned_ftas["full_name"].fillna("Unknown")
 
-        current_index = 0
+        assigned_at = datetime.now()
         assignments = []
-
-        for _, row in unassigned_ftas.iterrows():
-            assigned_to_user = sorted_active[current_index][0]
-            
-            assignment = FtaAssignments(
-                fta_id=str(row["FTA ID"]).strip(),
-                name=row.get("Full Name", "Unknown"),
+        for (fta_id, name), email in allocator.plan(zip(fta_ids, names)):
+            assigned_to_user = users_by_email[email]
+            assignments.append(FtaAssignments(
+                fta_id=fta_id,
+                name=name,
                 assigned_to=assigned_to_user.email,
                 assigned_by=assigned_to_user.id,
-                assigned_at=datetime.now()
-            )
-            assignments.append(assignment)
-            
-            print(f"[Assign] FTA {row['FTA ID']} → {assigned_to_user.email}")
-            
-            # Update count and re-sort
-            sorted_active[current_index] = (assigned_to_user, sorted_active[current_index][1] + 1)
-            sorted_active.sort(key=lambda x: x[1])
-            
-            current_index = (current_index + 1) % member_count
+                assigned_at=assigned_at
+            ))
+            logger.debug("Assign FTA %s → %s", fta_id, assigned_to_user.email)
 
         db.add_all(assignments)
+        refresh_fta_status(db, [a.fta_id for a in assignments])
         db.commit()
-        print(f"[Assign Success] ✅ Assigned {len(assignments)} new FTAs to active members only.")
+        logger.info("Assigned %d new FTA(s) across %d active member(s).", len(assignments), member_count)
         
     except SQLAlchemyError as e:
         db.rollback()
-        print(f"[DB Error] ❌ Assignment failed: {e}")
+        logger.error("Assignment failed: %s", e)
         raise
     finally:
         db.close()
 
-    return get_existing_assignments()
+    return get_existing_assignments() if return_assignments else len(assignments)
 
 
 def reassign_ftas_from_inactive_member(inactive_email):
@@ -1108,14 +617,14 @@ def reassign_ftas_from_inactive_member(inactive_email):
         ).all()
         
         if not inactive_assignments:
-            print(f"[Reassign] No assignments found for {inactive_email}")
+            logger.info("No assignments found for %s", inactive_email)
             return 0
         
         # Get active members
         active_members = get_active_a_team_members_for_assignment()
         
         if not active_members:
-            print("[Reassign Error] ❌ No active members available for reassignment")
+            logger.error("No active members available for reassignment")
             raise Exception("No active members available to reassign FTAs")
         
         # Get current counts for active members
@@ -1134,155 +643,200 @@ def reassign_ftas_from_inactive_member(inactive_email):
         for email, count in counts_query:
             counts[email] = count
         
-        # Sort by least assigned
-        sorted_members = sorted(counts.items(), key=lambda x: x[1])
-        
-        print(f"[Reassign] Reassigning {len(inactive_assignments)} FTAs from {inactive_email}")
-        
-        # Reassign each FTA
-        current_index = 0
-        for assignment in inactive_assignments:
-            new_assignee_email = sorted_members[current_index][0]
+        logger.info("Reassigning %d FTA(s) from %s", len(inactive_assignments), inactive_email)
+
+        # Reassign each FTA to whoever is least loaded at that point
+        allocator = LeastLoadedAllocator(counts)
+        reassigned_at = datetime.now()
+        plan = allocator.plan(sorted(inactive_assignments, key=lambda a: a.fta_id or ""))
+        for assignment, new_assignee_email in plan:
             assignment.assigned_to = new_assignee_email
-            assignment.assigned_at = datetime.now()
-            
-            print(f"  - FTA {assignment.fta_id} → {new_assignee_email}")
-            
-            # Update count and re-sort
-            sorted_members[current_index] = (new_assignee_email, sorted_members[current_index][1] + 1)
-            sorted_members.sort(key=lambda x: x[1])
-            
-            current_index = (current_index + 1) % len(sorted_members)
-        
+            assignment.assigned_at = reassigned_at
+
+            logger.debug("Reassign FTA %s → %s", assignment.fta_id, new_assignee_email)
+
+        refresh_fta_status(session, [a.fta_id for a in inactive_assignments])
         session.commit()
-        print(f"[Reassign Success] ✅ Reassigned all FTAs from {inactive_email}")
+        logger.info("Reassigned all FTAs from %s", inactive_email)
         return len(inactive_assignments)
 
 
+def sync_and_assign_fta_responses(gsheet_url):
+    """
+    Pull the sheet, write new and edited rows to fta_responses, queue welcome
+    emails and assign new FTAs. Every run is recorded in sync_runs with its
+    counts and per-phase timings (sync_journal.py).
 
-def hash_pii(value):
-    """Hash PII values using SHA-256."""
-    if pd.isna(value) or value is None:
-        return None
-    return hashlib.sha256(str(value).encode('utf-8')).hexdigest()
+    Args:
+        gsheet_url: CSV export URL of the FTA Google Sheet
 
-def sync_and_assign_fta_responses(gsheet_url):
-    print("\n=== [SYNC START] ===")
+    Returns:
+        The deduplicated sheet rows, raw headers and values (empty if the sheet
+        could not be read); fta_snapshot.build_snapshot conforms them. If the
+        database write or the assignment failed, df.attrs["sync_error"] says why.
+    """
+    journal = SyncJournal()
     try:
-        # Fetch data from Google Sheet
-        df = pd.read_csv(gsheet_url)
-        df.columns = df.columns.str.strip()
-
-        print(f"[Sync Info] Pulled {len(df)} rows from Google Sheets.")
-        print(f"[Sync Info] Columns found: {list(df.columns)}")
-
-        # Normalize column names
-        col_map = {
-            "FTA ID": "FTA ID",
-            "fta_id": "FTA ID",
-            "Fta Id": "FTA ID"
-        }
-        df.rename(columns={k: v for k, v in col_map.items() if k in df.columns}, inplace=True)
-
-        if "FTA ID" not in df.columns:
-            print("[Sync Error] 'FTA ID' column is missing in the sheet.")
+        # Fetch data from Google Sheet (a conditional request; an unchanged
+        # sheet comes back from the local cache)
+        with journal.phase("fetch"):
+            cached, sheet_modified = fetch_sheet(gsheet_url)
+            raw = cached.df
+        journal.sheet_modified = sheet_modified
+        journal.count(rows_fetched=len(raw))
+
+        logger.debug("Pulled %d rows from Google Sheets%s.", len(raw), "" if sheet_modified else " (not modified)")
+        logger.debug("Columns found: %s", list(raw.columns))
+
+        if "fta_id" not in compile_mapping(tuple(raw.columns)).values():
+            logger.error("'FTA ID' column is missing in the sheet.")
+            journal.finish(error="'FTA ID' column is missing in the sheet")
             return pd.DataFrame()
 
-        # Drop duplicates
-        df = df.drop_duplicates(subset=["FTA ID"]).reset_index(drop=True)
+        # Only the FTA ID is read from every row; the other columns are
+        # coerced for new and edited rows only, further down
+        with journal.phase("parse"):
+            df, fta_ids = dedupe_sheet_rows(raw)
 
         if df.empty:
-            print("[Sync Info] No data available after deduplication.")
+            logger.info("No data available after deduplication.")
+            journal.finish(error="no data after deduplication")
             return pd.DataFrame()
 
     except Exception as e:
-        print(f"[Sync Error] Failed to fetch sheet: {e}")
+        logger.error("Failed to fetch sheet: %s", e)
+        journal.finish(error=f"failed to fetch sheet: {e}")
         return pd.DataFrame()
 
     # === DB Session ===
+    error = None
     db = SessionLocal()
     try:
-        for _, row in df.iterrows():
-            fta_id = row.get("FTA ID")
-            name = row.get("Full Name", "FTA")
-            email = row.get("Email address")
-
-            if not fta_id:
-                print(f"[Skip] Missing FTA ID for row: {row.to_dict()}")
-                continue
-            if not email:
-                print(f"[Skip] Missing email for FTA ID {fta_id}")
-                continue
-
-            # Hash PII before storing
-            hashed_email = hash_pii(email)
-            hashed_name = hash_pii(name)
-            hashed_phone = hash_pii(row.get("Phone number"))
-            hashed_address = hash_pii(row.get("Home Address"))
-
-            existing = db.query(FtaResponses).filter(FtaResponses.FTA_ID == fta_id).first()
-
-            if existing:
-                print(f"[Update] Updating existing FTA ID {fta_id}")
-                existing.Timestamp = pd.to_datetime(row.get("Timestamp")) if row.get("Timestamp") else None
-                existing.Email_address = hashed_email
-                existing.Full_Name = hashed_name
-                existing.Phone_number = hashed_phone
-                existing.Gender = row.get("Gender")
-                existing.Home_Address = hashed_address
-                existing.Service_Experience = int(row.get("Service Experience", 0))
-                existing.Worship_Experience = int(row.get("Worship Experience", 0))
-                existing.Word_Experience = float(row.get("Word Experience", 0.0))
-                existing.General_Feedback = row.get("General Feedback")
-                existing.Invited_By = row.get("Invited By")
-                existing.Membership_Interest = row.get("Membership Interest")
-                existing.Consent = row.get("Consent")
-                existing.Meeting_Date = pd.to_datetime(row.get("Meeting Date")) if row.get("Meeting Date") else None
+        # === Skip rows that have not changed since the last sync ===
+        state = db.query(SyncState).filter_by(id=1).first()
+        if not state:
+            state = SyncState(id=1)
+            db.add(state)
+
+        with journal.phase("hash"):
+            if not sheet_modified and state.last_synced_at is not None and state.last_synced_at >= cached.fetched_at:
+                # Not modified since a sync that was written after it was downloaded
+                logger.debug("Sheet not modified since the last sync; nothing to write.")
+                row_digests, sheet_digest = pd.Series(None, index=df.index, dtype=object), state.last_sheet_digest
             else:
-                print(f"[Insert] Adding new FTA ID {fta_id}")
-                new_response = FtaResponses(
-                    Timestamp=pd.to_datetime(row.get("Timestamp")) if row.get("Timestamp") else None,
-                    Email_address=hashed_email,
-                    Full_Name=hashed_name,
-                    Phone_number=hashed_phone,
-                    Gender=row.get("Gender"),
-                    Home_Address=hashed_address,
-                    Service_Experience=int(row.get("Service Experience", 0)),
-                    Worship_Experience=int(row.get("Worship Experience", 0)),
-                    Word_Experience=float(row.get("Word Experience", 0.0)),
-                    General_Feedback=row.get("General Feedback"),
-                    Invited_By=row.get("Invited By"),
-                    Membership_Interest=row.get("Membership Interest"),
-                    Consent=row.get("Consent"),
-                    Meeting_Date=pd.to_datetime(row.get("Meeting Date")) if row.get("Meeting Date") else None,
-                    FTA_ID=fta_id
-                )
-                db.add(new_response)
+                # Digests are taken over the raw row so they match earlier syncs
+                row_digests = compute_row_digests(df)
+                sheet_digest = compute_sheet_digest(row_digests)
 
-                # Email sending logic (use unhashed values for actual sending)
-                if not email_already_sent(fta_id):
-                    sent, subject = send_email(email, name)
-                    status = "sent" if sent else "failed"
-                    log_email_sent(fta_id, email, name, subject, status, None if sent else "Send error")
+            if state.last_sheet_digest == sheet_digest:
+                logger.debug("Sheet unchanged since last sync; nothing to write.")
+                new_mask = modified_mask = pd.Series(False, index=df.index)
+            else:
+                stored_digests, rejected_digests = load_known_digests(db, fta_ids)
+                new_mask, modified_mask = select_changed_rows(fta_ids, row_digests, stored_digests, rejected_digests)
+                logger.debug(
+                    "%d new, %d modified, %d unchanged row(s).",
+                    int(new_mask.sum()), int(modified_mask.sum()), int((~(new_mask | modified_mask)).sum()),
+                )
 
-        db.commit()
-        print("[Sync Success] Changes committed to database.")
+        with journal.phase("parse"):
+            changed, invalid = apply_schema(df[new_mask | modified_mask], return_invalid=True)
+
+        if state.last_timestamp is not None:
+            # Submissions after the watermark are new form entries; anything older
+            # that we have never seen was added to the sheet by hand
+            late = int((changed.loc[new_mask[changed.index], "timestamp"] <= state.last_timestamp).sum())
+            if late:
+                logger.info("%d new row(s) are older than the last sync watermark.", late)
+
+        with journal.phase("hash"):
+            # Hash PII and coerce types column by column; bad rows are reported, not raised
+            records, accepted_index, rejects = build_response_records(changed, row_digests, invalid)
+        if rejects:
+            reasons = pd.Series([rejected["reason"] for rejected in rejects]).value_counts()
+            logger.warning("Rejected %d row(s): %s", len(rejects), ", ".join(f"{n} {r}" for r, n in reasons.items()))
+            for rejected in rejects:
+                logger.debug("Skip FTA ID %s: %s", rejected["fta_id"], rejected["reason"])
+
+        accepted = changed.loc[accepted_index]
+        new_rows = accepted[new_mask[accepted_index]]
+
+        # Queue welcome emails in this transaction (unhashed values are needed to send);
+        # the outbox dispatcher sends them after commit
+        with journal.phase("email"):
+            queued = enqueue_welcome_emails(db, [
+                {
+                    "fta_id": row["fta_id"],
+                    "fta_name": row["full_name"] if pd.notna(row["full_name"]) else "FTA",
+                    "email": row["email"],
+                }
+                for _, row in new_rows.iterrows()
+            ])
+
+        # One INSERT ... ON CONFLICT(FTA_ID) DO UPDATE for the whole batch
+        with journal.phase("upsert"):
+            # Edited rows may move to another day; count their old day again too
+            rollup_days = stored_response_days(db, accepted.loc[~new_mask[accepted_index], "fta_id"])
+            bulk_upsert_fta_responses(db, records)
+            refresh_invitee_days(db, rollup_days | days_of(accepted["timestamp"]))
+            # Unchanged rejected rows are skipped next time (select_changed_rows)
+            record_rejected_rows(db, rejects, accepted["fta_id"], datetime.now())
+
+            # === Move the watermark forward ===
+            newest = changed["timestamp"].max()
+            if pd.notna(newest) and (state.last_timestamp is None or newest > state.last_timestamp):
+                state.last_timestamp = newest.to_pydatetime()
+            state.last_row_count = len(df)
+            state.last_sheet_digest = sheet_digest
+            state.last_synced_at = datetime.now()
+
+            db.commit()
+        journal.count(
+            rows_inserted=len(new_rows),
+            rows_updated=len(accepted) - len(new_rows),
+            rows_skipped=len(raw) - len(accepted),
+            rows_rejected=len(rejects),
+            emails_queued=queued,
+        )
 
     except SQLAlchemyError as commit_err:
         db.rollback()
-        print(f"[DB Commit Error] {commit_err}")
+        error = f"database error: {commit_err}"
+        logger.error("Sync write failed and was rolled back: %s", commit_err)
+    except Exception as e:
+        # e.g. a bad value in build_response_records or the rollup refresh;
+        # still rolled back and recorded in sync_runs below
+        db.rollback()
+        error = f"sync write failed: {e}"
+        logger.exception("Sync write failed and was rolled back: %s", e)
     finally:
         db.close()
 
+    # === Send queued emails outside the write transaction ===
+    with journal.phase("email"):
+        dispatch_pending_emails_in_background()
+
     # === Assign FTAs AFTER saving, using the same Google Sheet data ===
     try:
-        if not df.empty:
-            assign_new_ftas(df)
-            print("[Assignment] FTA assignments updated successfully.")
+        with journal.phase("assign"):
+            assigned = assign_new_ftas(df)
+        journal.count(assignments_made=assigned)
     except Exception as e:
-        print(f"[Assignment Error] {e}")
-
-    print("=== [SYNC END] ===\n")
+        error = error or f"assignment failed: {e}"
+        logger.error("Assignment after sync failed: %s", e)
+
+    journal.finish(error=error)
+    # One summary line per sync; row-level detail is at DEBUG
+    logger.info(
+        "Sync %s in %.0f ms%s: %d fetched, %d inserted, %d updated, %d rejected, "
+        "%d email(s) queued, %d assigned.",
+        "failed" if error else "finished", journal.elapsed_ms(),
+        " (sheet not modified)" if journal.sheet_modified is False else "",
+        journal.counts["rows_fetched"], journal.counts["rows_inserted"], journal.counts["rows_updated"],
+        journal.counts["rows_rejected"], journal.counts["emails_queued"], journal.counts["assignments_made"],
+    )
+    # The rows are still worth serving, but the caller must not report success
+    df.attrs["sync_error"] = error
     return df
 
 
@@ -1293,83 +847,3 @@ def get_available_a_team_members():
     with get_session() as session:
         active_members = session.query(ATeamMember).filter_by(is_active=True).all()
         return [member.email for member in active_members]
-
-# def assign_ftas_to_active_members(fta_list):
-#     """
-#     Distribute FTAs only among active A-Team members
-    
-#     Args:
-#         fta_list: List of FTA records to assign
-    
-#     Returns:
-#         Dictionary mapping FTA IDs to assigned member emails
-#     """
-#     with get_session() as session:
-#         # Get active members only
-#         active_members = session.query(ATeamMember).filter_by(is_active=True).all()
-        
-#         if not active_members:
-#             raise ValueError("No active A-Team members available for assignment")
-        
-#         # Get current assignment counts for active members only
-#         active_emails = [m.email for m in active_members]
-#         assignment_counts = (
-#             session.query(
-#                 FtaAssignments.assigned_to,
-#                 func.count(FtaAssignments.id).label('count')
-#             )
-#             .filter(FtaAssignments.assigned_to.in_(active_emails))
-#             .group_by(FtaAssignments.assigned_to)
-#             .all()
-#         )
-        
-#         # Create count dictionary
-#         counts = {email: 0 for email in active_emails}
-#         for email, count in assignment_counts:
-#             counts[email] = count
-        
-#         # Sort members by current assignment count (least assigned first)
-#         sorted_members = sorted(counts.items(), key=lambda x: x[1])
-        
-#         # Distribute FTAs
-#         assignments = {}
-#         member_index = 0
-        
-#         for fta in fta_list:
-#             assigned_email = sorted_members[member_index][0]
-#             assignments[fta['id']] = assigned_email
-            
-#             # Update count for next iteration
-#             sorted_members[member_index] = (assigned_email, sorted_members[member_index][1] + 1)
-#             sorted_members.sort(key=lambda x: x[1])  # Re-sort after increment
-            
-#             # Move to next member (round-robin style)
-#             member_index = (member_index + 1) % len(sorted_members)
-        
-#         return assignments
-
-# Example usage in your assignment workflow:
-# def process_fta_assignments(uploaded_ftas):
-#     """
-#     Process FTA assignments - only assigns to active members
-#     """
-#     try:
-#         assignments = assign_ftas_to_active_members(uploaded_ftas)
-        
-#         with get_session() as session:
-#             for fta_id, email in assignments.items():
-#                 assignment = FtaAssignments(
-#                     fta_id=fta_id,
-#                     assigned_to=email,
-#                     assigned_at=datetime.now()
-#                     # ... other fields
-#                 )
-#                 session.add(assignment)
-#             session.commit()
-        
-#         return True, f"Successfully assigned {len(assignments)} FTAs to active members"
-    
-#     except ValueError as e:
-#         return False, str(e)
-#     except Exception as e:
-#         return False, f"Assignment failed: {str(e)}"
@@ -1,32 +1,176 @@
 # db_migration.py
-# Run this once to add the 'is_active' column to your existing database
+# Versioned schema migrations. db_session.init_db() runs every migration that is
+# not yet recorded in schema_migrations, so an existing database picks up new
+# columns and indexes without a reset. Each step must be safe to re-run.
+#
+#   python db_migration.py          # apply pending migrations to database/fta.db
 
-import os
-from sqlalchemy import create_engine, text
+import logging
+import threading
+from datetime import datetime
+from sqlalchemy import text
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_FILE = os.path.join(BASE_DIR, "database", "fta.db")
-DB_PATH = f"sqlite:///{DB_FILE}"
+logger = logging.getLogger(__name__)
 
-def add_active_status_column():
+_migrate_lock = threading.Lock()
+
+
+def add_active_status_column(conn):
     """Add is_active column to a_team_members table if it doesn't exist"""
-    engine = create_engine(DB_PATH)
-    
-    with engine.connect() as conn:
-        # Check if column exists
-        result = conn.execute(text("PRAGMA table_info(a_team_members)"))
-        columns = [row[1] for row in result]
-        
-        if 'is_active' not in columns:
-            # Add the column with default value TRUE
-            conn.execute(text("""
-                ALTER TABLE a_team_members 
-                ADD COLUMN is_active BOOLEAN DEFAULT 1
-            """))
-            conn.commit()
-            print("✅ Successfully added 'is_active' column to a_team_members table")
-        else:
-            print("ℹ️ Column 'is_active' already exists")
+    # Check if column exists
+    result = conn.execute(text("PRAGMA table_info(a_team_members)"))
+    columns = [row[1] for row in result]
+
+    if 'is_active' not in columns:
+        # Add the column with default value TRUE
+        conn.execute(text("""
+            ALTER TABLE a_team_members
+            ADD COLUMN is_active BOOLEAN DEFAULT 1
+        """))
+        logger.info("Added 'is_active' column to a_team_members table")
+
+def add_row_digest_column(conn):
+    """Add row_digest column to fta_responses table if it doesn't exist"""
+    result = conn.execute(text("PRAGMA table_info(fta_responses)"))
+    columns = [row[1] for row in result]
+
+    if 'row_digest' not in columns:
+        # Existing rows start without a digest, so the next sync rewrites them once
+        conn.execute(text("ALTER TABLE fta_responses ADD COLUMN row_digest VARCHAR(64)"))
+        logger.info("Added 'row_digest' column to fta_responses table")
+
+def add_fta_responses_unique_index(conn):
+    """Remove duplicate FTA_IDs from fta_responses and add the unique index the sync upsert relies on"""
+    result = conn.execute(text("PRAGMA index_list(fta_responses)"))
+    indexes = [row[1] for row in result]
+
+    if 'ux_fta_responses_fta_id' not in indexes:
+        # Keep the most recently written row for each FTA_ID
+        removed = conn.execute(text("""
+            DELETE FROM fta_responses
+            WHERE FTA_ID IS NOT NULL
+              AND id NOT IN (SELECT MAX(id) FROM fta_responses GROUP BY FTA_ID)
+        """)).rowcount
+        conn.execute(text("CREATE UNIQUE INDEX ux_fta_responses_fta_id ON fta_responses (FTA_ID)"))
+        logger.info("Added unique index on fta_responses.FTA_ID (removed %d duplicate row(s))", removed)
+
+# Columns the pages and the sync filter or sort on. The names match the
+# index=True / Index() declarations in models.py, so a fresh database built by
+# create_all already has them and this step is a no-op there.
+HOT_PATH_INDEXES = {
+    "ix_fta_assignments_assigned_to": "fta_assignments (assigned_to)",
+    # fta_tracking matches the logged-in member case-insensitively
+    "ix_fta_assignments_assigned_to_lower": "fta_assignments (lower(assigned_to))",
+    "ix_fta_assignments_assigned_at": "fta_assignments (assigned_at)",
+    "ix_fta_feedback_email": "fta_feedback (email)",
+    "ix_fta_feedback_fta_id": "fta_feedback (fta_id)",
+    "ix_fta_feedback_submitted_at": "fta_feedback (submitted_at)",
+    "ix_email_logs_fta_id_status": "email_logs (fta_id, status)",
+    "ix_email_logs_status_timestamp": "email_logs (status, timestamp)",
+    "ix_fta_responses_Timestamp": 'fta_responses ("Timestamp")',
+    "ix_email_outbox_status": "email_outbox (status, created_at)",
+}
+
+def add_hot_path_indexes(conn):
+    """Index the columns used in hot filters; fta_responses.FTA_ID is covered by ux_fta_responses_fta_id"""
+    for name, target in HOT_PATH_INDEXES.items():
+        conn.execute(text(f'CREATE INDEX IF NOT EXISTS "{name}" ON {target}'))
+    # Give the query planner row counts for the new indexes
+    conn.execute(text("ANALYZE"))
+    logger.info("Ensured %d hot-path indexes", len(HOT_PATH_INDEXES))
+
+
+def create_fta_status_table(conn):
+    """Create fta_status and fill it from the existing assignments and feedback"""
+    # Imported here so importing db_session (and the login page) does not pull in pandas
+    from models import FtaStatus
+    from fta_status import refresh_fta_status
+
+    FtaStatus.__table__.create(conn, checkfirst=True)
+    for index in FtaStatus.__table__.indexes:
+        index.create(conn, checkfirst=True)
+    written = refresh_fta_status(conn)
+    conn.execute(text("ANALYZE fta_status"))
+    logger.info("Filled fta_status with %d row(s)", written)
+
+
+def create_daily_rollup_tables(conn):
+    """Create feedback_daily and invitee_daily and fill them from the existing rows"""
+    # Imported here so importing db_session (and the login page) does not pull in pandas
+    from models import FeedbackDaily, InviteeDaily
+    from rollups import rebuild_rollups
+
+    for model in (FeedbackDaily, InviteeDaily):
+        model.__table__.create(conn, checkfirst=True)
+        for index in model.__table__.indexes:
+            index.create(conn, checkfirst=True)
+    rebuild_rollups(conn)
+    conn.execute(text("ANALYZE feedback_daily"))
+    conn.execute(text("ANALYZE invitee_daily"))
+    logger.info("Filled feedback_daily and invitee_daily")
+
+
+# (version, description, step). Append only: never renumber or edit a step
+# that has shipped, add a new one instead.
+MIGRATIONS = [
+    (1, "a_team_members.is_active column", add_active_status_column),
+    (2, "fta_responses.row_digest column", add_row_digest_column),
+    (3, "unique index on fta_responses.FTA_ID", add_fta_responses_unique_index),
+    (4, "hot-path indexes", add_hot_path_indexes),
+    (5, "fta_status table", create_fta_status_table),
+    (6, "daily rollup tables", create_daily_rollup_tables),
+]
+
+
+def get_schema_version(conn):
+    """Highest applied migration version (0 for a database that has none)."""
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at DATETIME
+        )
+    """))
+    return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")).scalar()
+
+def run_migrations(engine):
+    """
+    Apply every migration newer than the recorded schema version.
+
+    Each step and its schema_migrations row are committed together, so a
+    failure leaves the database at the last good version and the step is
+    retried on the next start.
+
+    Args:
+        engine: SQLAlchemy engine for the database to migrate
+
+    Returns:
+        The schema version after migrating
+    """
+    with _migrate_lock:
+        with engine.begin() as conn:
+            version = get_schema_version(conn)
+
+        for step_version, description, step in MIGRATIONS:
+            if step_version <= version:
+                continue
+            with engine.begin() as conn:
+                step(conn)
+                conn.execute(
+                    text("INSERT OR IGNORE INTO schema_migrations (version, description, applied_at) "
+                         "VALUES (:version, :description, :applied_at)"),
+                    {"version": step_version, "description": description, "applied_at": datetime.now()},
+                )
+            version = step_version
+            logger.info("Applied migration %d: %s", step_version, description)
+
+        return version
+
 
 if __name__ == "__main__":
-    add_active_status_column()
\ No newline at end of file
+    from db_session import engine, init_db
+    from log_config import setup_logging
+    setup_logging()
+    init_db()
+    with engine.connect() as conn:
+        print(f"Schema version: {get_schema_version(conn)}")
@@ -4,14 +4,17 @@
 # from models import Base
 # db_session.py
 import os
-from sqlalchemy import create_engine
+import tempfile
+import threading
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from models import Base
 # import models  # ✅ Ensures all models are registered with Base before creating tables
 
-# Absolute path to the database file
+# Absolute path to the database file. FTA_DB_FILE points the app at another
+# file, e.g. one written by benchmarks/generate_data.py.
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_FILE = os.path.join(BASE_DIR, "database", "fta.db")
+DB_FILE = os.environ.get("FTA_DB_FILE") or os.path.join(BASE_DIR, "database", "fta.db")
 
 # Create the database folder if it doesn’t exist
 os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
@@ -19,13 +22,76 @@ os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
 # SQLAlchemy connection string
 DATABASE_URL = f"sqlite:///{DB_FILE}"
 
+# Applied to every new SQLite connection. WAL lets page reads carry on while a
+# sync or a feedback save holds the write lock, and busy_timeout makes a second
+# writer wait for the lock instead of failing with "database is locked".
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "busy_timeout": 5000,          # ms
+    "synchronous": "NORMAL",       # safe with WAL; skips an fsync per commit
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64000,          # negative means KiB, so ~64 MB per connection
+}
+
+# One engine (and connection pool) per database URL for the whole process.
+# Streamlit runs every browser session as a thread in this process, so pages
+# must share it instead of calling create_engine on each rerun.
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def get_engine(url=DATABASE_URL):
+    """Return the shared engine for `url`, creating and tuning it on first use."""
+    with _engines_lock:
+        shared = _engines.get(url)
+        if shared is None:
+            shared = create_engine(
+                url,
+                connect_args={"check_same_thread": False},
+                pool_size=10,
+                max_overflow=20,
+                pool_timeout=30,
+            )
+            event.listen(shared, "connect", _apply_sqlite_pragmas)
+            _engines[url] = shared
+        return shared
+
+
+def database_snapshot():
+    """
+    A consistent copy of the database as bytes, e.g. for a download.
+
+    VACUUM INTO reads inside one transaction, commits still in the WAL
+    included, so unlike copying fta.db as a file it needs no checkpoint and
+    never holds up a writer.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fta.db")
+        with engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM INTO ?", (path,))
+        with open(path, "rb") as f:
+            return f.read()
+
+
 # Create engine and session
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = get_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def init_db():
     """Create all tables in the database."""
     Base.metadata.create_all(bind=engine)
 
+    # create_all skips tables that already exist, so later columns and indexes
+    # reach existing databases through the versioned migrations
+    from db_migration import run_migrations
+    run_migrations(engine)
+
 def get_session():
     return SessionLocal()
@@ -0,0 +1,93 @@
+# email_dispatcher.py
+# Send a batch of emails on a few worker threads, paced by a token bucket so
+# we stay inside Gmail's sending limits.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from smtp_transport import DEFAULT_POOL_SIZE
+
+# Gmail caps a regular account at 500 messages per rolling 24 hours
+# (Google Workspace accounts get 2000).
+GMAIL_DAILY_LIMIT = 500
+# Gmail does not publish a per-second limit; short bursts at this pace have
+# not triggered its rate limiting, and it keeps 300 resends under a minute.
+SEND_RATE_PER_SECOND = 10
+SEND_BURST = 20
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate=SEND_RATE_PER_SECOND, capacity=SEND_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# One bucket for the whole process, so the outbox dispatcher and an admin
+# resend running at the same time share Gmail's pace instead of doubling it
+_send_bucket = TokenBucket()
+
+
+def get_send_bucket():
+    """The TokenBucket every send in this process draws from."""
+    return _send_bucket
+
+
+def send_concurrently(jobs, send, max_workers=DEFAULT_POOL_SIZE, bucket=None, on_progress=None):
+    """
+    Send a batch of emails in parallel.
+
+    Args:
+        jobs: List of dicts with at least 'email' and 'fta_name'
+        send: Callable (receiver_email, fta_name) -> (success, subject); an
+            exception counts as a failure and its text becomes the error
+        max_workers: Worker threads; more than the SMTP pool size only adds waiting
+        bucket: TokenBucket shared by the workers (the process-wide one by default)
+        on_progress: Optional callback (done, total, result) called on the
+            caller's thread as each email finishes, so it may update Streamlit
+            elements
+
+    Returns:
+        List of (job, sent, subject, error) tuples in completion order
+    """
+    if not jobs:
+        return []
+
+    bucket = bucket or get_send_bucket()
+
+    def run(job):
+        bucket.acquire()
+        try:
+            sent, subject = send(job["email"], job["fta_name"])
+            error = None if sent else "Send error"
+        except Exception as e:
+            sent, subject, error = False, None, str(e)
+        return job, sent, subject, error
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="email-send") as executor:
+        futures = [executor.submit(run, job) for job in jobs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results.append(result)
+            if on_progress:
+                on_progress(done, len(jobs), result)
+    return results
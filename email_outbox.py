@@ -0,0 +1,221 @@
+# email_outbox.py
+# Welcome emails are queued in email_outbox inside the sync transaction and
+# sent afterwards by a dispatcher, so SMTP latency never holds the SQLite
+# write lock.
+
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from db_session import SessionLocal
+from email_dispatcher import GMAIL_DAILY_LIMIT, send_concurrently
+from models import EmailLogs, EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+MAX_SEND_ATTEMPTS = 3
+DISPATCH_BATCH_SIZE = 50
+# A row left in "sending" this long belongs to a dispatcher that died mid-batch
+STALE_CLAIM_AFTER = timedelta(minutes=10)
+
+_dispatch_lock = threading.Lock()
+
+
+def enqueue_welcome_emails(session, rows):
+    """
+    Queue welcome emails for newly synced FTAs in the caller's transaction.
+
+    FTAs that already have a 'sent' email log or an outbox entry are skipped.
+
+    Args:
+        session: Open SQLAlchemy session (the sync transaction)
+        rows: List of dicts with 'fta_id', 'fta_name' and 'email'
+
+    Returns:
+        Number of emails added to the outbox (rows already queued are not counted)
+    """
+    if not rows:
+        return 0
+
+    fta_ids = [row["fta_id"] for row in rows]
+    already_sent = {
+        fta_id for (fta_id,) in session.query(EmailLogs.fta_id)
+        .filter(EmailLogs.fta_id.in_(fta_ids), EmailLogs.status == "sent")
+        .distinct()
+    }
+
+    now = datetime.now()
+    values = [
+        {
+            "fta_id": row["fta_id"],
+            "fta_name": row["fta_name"],
+            "email": row["email"],
+            "status": "pending",
+            "attempts": 0,
+            "created_at": now,
+        }
+        for row in rows
+        if row["fta_id"] not in already_sent
+    ]
+    if not values:
+        return 0
+
+    stmt = sqlite_insert(EmailOutbox.__table__).on_conflict_do_nothing(index_elements=["fta_id"])
+    return session.execute(stmt, values).rowcount
+
+
+def count_emails_sent_since(since):
+    """Number of 'sent' email_logs rows since `since`."""
+    db = SessionLocal()
+    try:
+        return db.query(func.count(EmailLogs.id)).filter(
+            EmailLogs.status == "sent", EmailLogs.timestamp >= since
+        ).scalar()
+    finally:
+        db.close()
+
+
+def remaining_daily_quota():
+    """Emails Gmail will still take in the current rolling 24 hours."""
+    return max(0, GMAIL_DAILY_LIMIT - count_emails_sent_since(datetime.now() - timedelta(days=1)))
+
+
+def _claim_pending(limit, started_at):
+    """Mark up to `limit` pending rows as 'sending' and return them as plain dicts.
+
+    Rows already attempted since `started_at` are left for the next dispatch.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+        db.query(EmailOutbox).filter(
+            EmailOutbox.status == "sending",
+            EmailOutbox.last_attempt_at < now - STALE_CLAIM_AFTER,
+        ).update({"status": "pending"}, synchronize_session=False)
+
+        pending = (
+            db.query(EmailOutbox)
+            .filter(
+                EmailOutbox.status == "pending",
+                or_(EmailOutbox.last_attempt_at.is_(None), EmailOutbox.last_attempt_at < started_at),
+            )
+            .order_by(EmailOutbox.created_at.asc(), EmailOutbox.id.asc())
+            .limit(limit)
+            .all()
+        )
+        claimed = []
+        for item in pending:
+            item.status = "sending"
+            item.last_attempt_at = now
+            claimed.append({
+                "id": item.id,
+                "fta_id": item.fta_id,
+                "fta_name": item.fta_name,
+                "email": item.email,
+                "attempts": item.attempts or 0,
+            })
+        db.commit()
+        return claimed
+    finally:
+        db.close()
+
+
+def _record_results(results):
+    """Write outbox status and email_logs rows for a finished batch in one transaction."""
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+        for item, sent, subject, error in results:
+            attempts = item["attempts"] + 1
+            if sent:
+                status = "sent"
+            elif attempts >= MAX_SEND_ATTEMPTS:
+                status = "failed"
+            else:
+                status = "pending"
+            if not sent:
+                logger.debug("Welcome email for FTA %s failed (attempt %d, now %s): %s",
+                             item["fta_id"], attempts, status, error)
+
+            db.query(EmailOutbox).filter(EmailOutbox.id == item["id"]).update({
+                "status": status,
+                "attempts": attempts,
+                "last_error": None if sent else error,
+                "sent_at": now if sent else None,
+            }, synchronize_session=False)
+
+            db.add(EmailLogs(
+                fta_id=item["fta_id"],
+                fta_name=item["fta_name"],
+                email=item["email"],
+                subject=subject,
+                status="sent" if sent else "failed",
+                error_message=None if sent else error,
+                timestamp=now,
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def dispatch_pending_emails(send=None, batch_size=DISPATCH_BATCH_SIZE):
+    """
+    Drain the outbox: send every pending email and record the outcome.
+
+    Only one dispatcher runs at a time per process; a second caller returns
+    immediately. Once the Gmail daily quota is used up the remaining rows
+    stay pending for a later dispatch.
+
+    Args:
+        send: Callable (receiver_email, fta_name) -> (success, subject) that
+            may raise on failure; defaults to db.send_email
+        batch_size: Rows claimed per round trip to the database
+
+    Returns:
+        (sent, failed) counts, or None if another dispatcher is already running
+    """
+    if not _dispatch_lock.acquire(blocking=False):
+        return None
+
+    try:
+        if send is None:
+            from db import send_email as send
+
+        started_at = datetime.now()
+        sent_count = failed_count = 0
+        last_error = None
+        while True:
+            # Checked per batch, as an admin resend may be sending meanwhile
+            quota = remaining_daily_quota()
+            if quota <= 0:
+                logger.warning("Daily Gmail sending limit reached; pending welcome emails wait for the next dispatch.")
+                break
+            batch = _claim_pending(min(batch_size, quota), started_at)
+            if not batch:
+                break
+
+            results = send_concurrently(batch, send)
+
+            _record_results(results)
+            sent_count += sum(1 for _, sent, _, _ in results if sent)
+            failed_count += sum(1 for _, sent, _, _ in results if not sent)
+            last_error = next((error for _, sent, _, error in results if not sent), last_error)
+
+        if failed_count:
+            logger.warning("Sent %d welcome email(s), %d failed (e.g. %s).", sent_count, failed_count, last_error)
+        elif sent_count:
+            logger.info("Sent %d welcome email(s).", sent_count)
+        return sent_count, failed_count
+    finally:
+        _dispatch_lock.release()
+
+
+def dispatch_pending_emails_in_background():
+    """Start a daemon thread that drains the outbox without blocking the caller."""
+    thread = threading.Thread(target=dispatch_pending_emails, name="email-outbox-dispatcher", daemon=True)
+    thread.start()
+    return thread
+
@@ -1,6 +1,8 @@
-import streamlit as st
-import smtplib
+import logging
 from email.message import EmailMessage
+from smtp_transport import get_transport
+
+logger = logging.getLogger(__name__)
 
 def send_email_to_fta(email, fta_name, subject, sender):
     msg = EmailMessage()
@@ -17,8 +19,6 @@ The TSP Team
 """)
 
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as smtp:
-            smtp.login(sender, st.secrets["secrets"]["app_password"])
-            smtp.send_message(msg)
+        get_transport().send(msg)
     except Exception as e:
-        print(f"Email failed to {email}: {e}")
\ No newline at end of file
+        logger.error("Email to %s failed: %s", email, e)
\ No newline at end of file
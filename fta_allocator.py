@@ -0,0 +1,37 @@
+# fta_allocator.py
+# Least-loaded assignment of FTAs to A-Team members.
+
+import heapq
+
+
+class LeastLoadedAllocator:
+    """
+    Give each FTA to the member with the fewest assignments.
+
+    Members sit in a min-heap keyed by (current load, member email), so each
+    pick is O(log m) and ties always go to the same member for the same
+    input, which keeps plans deterministic.
+
+    Args:
+        loads: Dict of member email -> number of FTAs currently assigned
+    """
+
+    def __init__(self, loads):
+        if not loads:
+            raise ValueError("LeastLoadedAllocator needs at least one member.")
+        self._heap = [(load, email) for email, load in loads.items()]
+        heapq.heapify(self._heap)
+
+    def next(self):
+        """Return the least-loaded member and count one more FTA against them."""
+        load, email = self._heap[0]
+        heapq.heapreplace(self._heap, (load + 1, email))
+        return email
+
+    def plan(self, items):
+        """Return [(item, member_email), ...] for every item, in order."""
+        return [(item, self.next()) for item in items]
+
+    def loads(self):
+        """Current load per member, including everything handed out so far."""
+        return {email: load for load, email in self._heap}
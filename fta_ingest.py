@@ -0,0 +1,232 @@
+# fta_ingest.py
+# Helpers for turning the Google Sheet export into fta_responses writes.
+# Kept free of Streamlit so it can be imported from scripts and benchmarks.
+
+import hashlib
+import logging
+from functools import lru_cache
+
+import pandas as pd
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from fta_schema import COLUMNS, conform_column
+from models import FtaResponses, RejectedRow
+from sql_batches import chunked
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=65536)
+def _sha256_text(value):
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def hash_pii(value):
+    """Hash PII values using SHA-256."""
+    if value is None or pd.isna(value):
+        return None
+    return _sha256_text(str(value))
+
+
+def hash_pii_column(series):
+    """
+    Hash a whole column of PII values.
+
+    Each distinct value is hashed once (and memoised across calls), so a name
+    that appears on hundreds of rows, such as a regular inviter, costs one hash.
+    Missing values stay None.
+    """
+    present = series.notna()
+    text_values = series[present].astype(str)
+    mapping = {value: _sha256_text(value) for value in text_values.unique()}
+
+    hashed = pd.Series(None, index=series.index, dtype=object)
+    hashed[present] = text_values.map(mapping)
+    return hashed
+
+
+def build_response_records(df, row_digests, invalid):
+    """
+    Turn sheet rows into fta_responses records, one column at a time.
+
+    Args:
+        df: Sheet rows to write, conformed by fta_schema.apply_schema
+        row_digests: Series from compute_row_digests, aligned with df
+        invalid: The invalid masks apply_schema returned with the frame
+
+    Returns:
+        (records, accepted_index, rejects)
+        records: list of dicts ready for bulk_upsert_fta_responses
+        accepted_index: index labels of df that produced a record
+        rejects: list of dicts with 'fta_id', 'reason' and 'row_digest' for rows that were left out
+    """
+    if df.empty:
+        return [], df.index, []
+
+    rejects = []
+    keep = pd.Series(True, index=df.index)
+
+    def reject(mask, reason):
+        for label in df.index[mask & keep]:
+            rejects.append({"fta_id": df.at[label, "fta_id"], "reason": reason, "row_digest": row_digests.get(label)})
+        keep[mask] = False
+
+    reject(df["fta_id"].isna() | (df["fta_id"] == ""), "missing FTA ID")
+    reject(df["email"].isna() | (df["email"].str.strip() == ""), "missing email")
+
+    out = pd.DataFrame(index=df.index)
+    for column in COLUMNS:
+        if column.db_column is None:
+            continue
+        if column.dtype != "text":
+            failed = invalid[column.name].reindex(df.index, fill_value=False)
+            reason = "unreadable" if column.dtype == "datetime" else "non-numeric"
+            reject(failed, f"{reason} {column.name}")
+        out[column.db_column] = hash_pii_column(df[column.name]) if column.pii else df[column.name]
+    out["row_digest"] = row_digests.reindex(df.index)
+
+    out = out[keep]
+    values = out.astype(object).where(out.notna(), None)
+    return values.to_dict("records"), out.index, rejects
+
+
+def compute_row_digests(df):
+    """SHA-256 of every raw sheet row, used to tell edited rows from unchanged ones."""
+    ordered = df[sorted(df.columns)]
+    text = ordered.astype(object).where(ordered.notna(), "").astype(str)
+    joined = text.iloc[:, 0].str.cat(text.iloc[:, 1:], sep="\x1f")
+    return joined.map(lambda value: hashlib.sha256(value.encode("utf-8")).hexdigest())
+
+
+def compute_sheet_digest(row_digests):
+    """Single digest for the whole sheet, so an unchanged sheet is detected in one comparison."""
+    sheet_hash = hashlib.sha256()
+    for digest in row_digests:
+        sheet_hash.update(digest.encode("ascii"))
+    return sheet_hash.hexdigest()
+
+
+def dedupe_sheet_rows(raw):
+    """
+    Drop sheet rows without an FTA ID and all but the first row of each FTA ID.
+
+    Only the FTA ID column is coerced, so this is cheap to run on the whole sheet.
+
+    Args:
+        raw: Sheet rows with raw Google Form headers (or a conformed frame)
+
+    Returns:
+        (rows, fta_ids): the rows kept, headers untouched, and their FTA IDs
+    """
+    fta_ids = conform_column(raw, "fta_id")
+    keep = fta_ids.notna() & (fta_ids != "") & ~fta_ids.duplicated()
+    if not keep.all():
+        logger.debug("Dropped %d sheet row(s) with a missing or repeated FTA ID.", int((~keep).sum()))
+    return raw[keep], fta_ids[keep]
+
+
+def load_known_digests(session, fta_ids):
+    """
+    Row digests already seen for the given FTA IDs.
+
+    Args:
+        session: Open SQLAlchemy session
+        fta_ids: FTA IDs of the incoming sheet rows
+
+    Returns:
+        (stored, rejected): dicts of FTA_ID -> row_digest for the rows in
+        fta_responses and for the rows the sync last rejected
+    """
+    stored, rejected = {}, {}
+    for chunk in chunked(fta_ids):
+        stored.update(session.execute(
+            select(FtaResponses.FTA_ID, FtaResponses.row_digest).where(FtaResponses.FTA_ID.in_(chunk))
+        ).all())
+        rejected.update(session.execute(
+            select(RejectedRow.fta_id, RejectedRow.row_digest).where(RejectedRow.fta_id.in_(chunk))
+        ).all())
+    return stored, rejected
+
+
+def select_changed_rows(fta_ids, row_digests, stored_digests, rejected_digests=None):
+    """
+    Pick the sheet rows that need to be read and written to fta_responses.
+
+    A row is new whenever fta_responses has no row for its FTA ID, even if an
+    earlier version of it was rejected. A row still identical to the version
+    that was rejected is skipped, so it is not read and reported again.
+
+    Args:
+        fta_ids: FTA IDs of the deduplicated sheet rows (see dedupe_sheet_rows)
+        row_digests: Series of raw row digests (compute_row_digests), aligned with fta_ids
+        stored_digests, rejected_digests: Dicts of FTA_ID -> row_digest from load_known_digests
+
+    Returns:
+        (new_mask, modified_mask) boolean Series aligned with fta_ids
+    """
+    stored = fta_ids.isin(stored_digests.keys())
+    unchanged_reject = fta_ids.map(rejected_digests or {}) == row_digests
+
+    new_mask = ~stored & ~unchanged_reject
+    modified_mask = stored & (fta_ids.map(stored_digests) != row_digests) & ~unchanged_reject
+    return new_mask, modified_mask
+
+
+def record_rejected_rows(session, rejects, accepted_ids, rejected_at):
+    """
+    Remember the digests of rejected rows and forget the FTAs that were accepted.
+
+    Args:
+        session: Open SQLAlchemy session; the caller owns the transaction
+        rejects: Rejected rows from build_response_records
+        accepted_ids: FTA IDs written to fta_responses in this sync
+        rejected_at: When the rows were rejected
+    """
+    records = [
+        {"fta_id": rejected["fta_id"], "row_digest": rejected["row_digest"],
+         "reason": rejected["reason"], "rejected_at": rejected_at}
+        for rejected in rejects
+        if rejected["fta_id"] is not None and pd.notna(rejected["fta_id"])
+    ]
+    if records:
+        stmt = sqlite_insert(RejectedRow)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RejectedRow.fta_id],
+            set_={key: stmt.excluded[key] for key in ("row_digest", "reason", "rejected_at")},
+        )
+        session.execute(stmt, records)
+
+    for chunk in chunked(accepted_ids):
+        session.execute(delete(RejectedRow).where(RejectedRow.fta_id.in_(chunk)))
+
+
+def bulk_upsert_fta_responses(session, records):
+    """
+    Insert or update a batch of fta_responses rows in one statement.
+
+    Uses INSERT ... ON CONFLICT(FTA_ID) DO UPDATE, which relies on the unique
+    index on fta_responses.FTA_ID. The caller owns the transaction.
+
+    Args:
+        session: Open SQLAlchemy session
+        records: List of dicts keyed by FtaResponses column names; every dict
+            must have the same keys and include FTA_ID
+
+    Returns:
+        Number of records written
+    """
+    if not records:
+        return 0
+
+    table = FtaResponses.__table__
+    stmt = sqlite_insert(table)
+    update_columns = {
+        key: stmt.excluded[key]
+        for key in records[0]
+        if key not in ("id", "FTA_ID")
+    }
+    stmt = stmt.on_conflict_do_update(index_elements=[table.c.FTA_ID], set_=update_columns)
+
+    session.execute(stmt, records)
+    return len(records)
@@ -25,7 +25,7 @@ def show_fta_page(go_to):
     # -----------------------------------------
     # === Validate Required Data in Session ===
     # -----------------------------------------
-    if "fta_data" not in st.session_state or "fta_assignments" not in st.session_state:
+    if "fta_data" not in st.session_state:
         st.error("FTA data not available. Please return to the dashboard first.")
         st.stop()
 
@@ -33,7 +33,6 @@ def show_fta_page(go_to):
     # === Load Session Data ===
     # --------------------------------
     df_fta_response = st.session_state["fta_data"]
-    assignments_df = st.session_state["fta_assignments"]
     user_email = st.session_state.get("email", "unknown")
 
     # Extract name before '@' and title-case it
@@ -62,84 +61,26 @@ def show_fta_page(go_to):
         else:
             st.info(f"No entries in: {title}")
                 
-    # ----------------------------------------------------
-    # === Normalize and Rename Columns in FTA Response ===
-    # ----------------------------------------------------
-    if not df_fta_response.empty and len(df_fta_response.columns) > 0:
-        df_fta_response.columns = df_fta_response.columns.astype(str).str.strip().str.lower()
-        df_fta_response.rename(columns={
-            "timestamp": "timestamp",
-            "email address": "email",
-            "full name": "full_name",
-            "phone number": "phone",
-            "gender": "gender",
-            "home address": "location",
-            "how was your overall service experience?": "service_experience",
-            "amazing how will you rate your worship experience": "worship_experience",
-            "how will you rate your word experience": "word_experience",
-            "any general feedback for us? (e.g how can we improve)": "general_feedback",
-            "who invited you to tsp?": "invited_by",
-            "would you like to be a member of tsp?": "membership_interest",
-            "i consent that the my data provided in this form can be used by the standpoint church as deemed appropriate.": "consent",
-            "select the most convenient date for your one-on-one meeting with pastor phil.": "meeting_date",
-            "fta id": "fta_id"
-        }, inplace=True)
-    else:
+    # The responses come from the shared, already-normalized snapshot
+    # (fta_snapshot.py) and must not be modified here
+    if df_fta_response.empty:
         st.warning("No data available to process or column headers are missing.")
 
-
-    # -----------------------------------------
-    # === Data Cleaning and Type Conversion ===
-    # -----------------------------------------
-    df_fta_response["fta_id"] = df_fta_response["fta_id"].astype(str).str.strip()
-    df_fta_response["phone"] = df_fta_response["phone"].astype(str).str.strip()
-    df_fta_response["timestamp"] = pd.to_datetime(df_fta_response["timestamp"], errors="coerce")
-    assignments_df.columns = assignments_df.columns.str.strip().str.lower()
-    assignments_df["fta_id"] = assignments_df["fta_id"].astype(str).str.strip()
-    assignments_df["assigned_at"] = pd.to_datetime(assignments_df["assigned_at"], errors="coerce")
-
     # ------------------------------------------------
     # === Get Only FTAs Assigned to Logged-in User ===
     # ------------------------------------------------
-    user_ftas = assignments_df[assignments_df["assigned_to"] == user_email]
-    user_fta_ids = user_ftas["fta_id"].unique()
-
-    # -------------------------------------------
-    # === Join Responses with Assignment Info ===
-    # -------------------------------------------
-    enriched_ftas = pd.merge(
-        df_fta_response[df_fta_response["fta_id"].isin(user_fta_ids)],
-        user_ftas[["fta_id", "assigned_at"]],
-        on="fta_id", how="left"
-    )
-
-    # ---------------------------------------
-    # === Load Feedback Data from SQLite ===
-    # ---------------------------------------
-    # with sqlite3.connect(DB_PATH) as conn:
-    #     feedback_df = pd.read_sql_query("SELECT * FROM fta_feedback WHERE email = ?", conn, params=(user_email,))
+    # fta_status has the user's FTAs with the call types done for each, kept
+    # up to date on every feedback write; the queries below only read the
+    # user's rows and, once the dates are picked, the selected window
     from db_session import get_session
-    from models import Feedback
+    from fta_status import ALL_STAGES, get_member_status, stage_bit
+    from queries import get_feedback, get_feedback_call_types
 
     with get_session() as session:
-        feedback_records = (
-            session.query(Feedback)
-            .filter(Feedback.email == user_email)
-            .all()
-        )
-
-    # Convert to DataFrame
-    # feedback_df = pd.DataFrame([record.__dict__ for record in feedback_records]).drop(columns=["_sa_instance_state"])
-    # Extract only table columns into a DataFrame
-    columns = Feedback.__table__.columns.keys()
-    feedback_df = pd.DataFrame([{col: getattr(record, col) for col in columns} for record in feedback_records])
-
-    if not feedback_df.empty:
-        feedback_df["submitted_at"] = pd.to_datetime(
-            feedback_df["submitted_at"], errors="coerce"
-        )
-    if not feedback_df.empty:
-        feedback_df["fta_id"] = feedback_df["fta_id"].astype(str).str.strip()
+        user_ftas = get_member_status(session, user_email)
+        call_types = get_feedback_call_types(session, user_email)
+    user_ftas["assigned_at"] = pd.to_datetime(user_ftas["assigned_at"], errors="coerce")
+    has_feedback = bool(call_types)
 
     # ---------------------------------------------
     # === Set Default Date Range for Filtering ===
@@ -176,35 +117,50 @@ def show_fta_page(go_to):
                                  max_value=max_date
                                  )
     with calltype:
-        if not feedback_df.empty:
+        if has_feedback:
             call_type_filter = st.selectbox(
             label="Filter by Call Type",
-            options=["All"] + feedback_df["call_type"].dropna().unique().tolist()
+            options=["All"] + call_types
         )
 
-    # ----------------------------------
-    # === Apply Date Filter to FTAs ===
-    # ----------------------------------
-    filtered_ftas = enriched_ftas[
-        (enriched_ftas["timestamp"].dt.date >= pd.to_datetime(start_date).date()) &
-        (enriched_ftas["timestamp"].dt.date <= pd.to_datetime(end_date).date())
-    ]
+    # ---------------------------------------------------
+    # === Load the Selected Window from the Database ===
+    # ---------------------------------------------------
+    with get_session() as session:
+        # The user's feedback submitted in the window
+        feedback_df = get_feedback(session, start_date, end_date, member=user_email)
+
+    # ----------------------------------------------------
+    # === User's FTAs Whose Form Was Sent in the Window ===
+    # ----------------------------------------------------
+    # Taken from the snapshot rather than fta_responses, which has no row for
+    # sheet rows rejected at ingest (e.g. no email) although they are assigned
+    submitted = df_fta_response["timestamp"].dt.date
+    filtered_ftas = pd.merge(
+        df_fta_response[
+            df_fta_response["fta_id"].isin(user_ftas["fta_id"]) &
+            (submitted >= start_date) & (submitted <= end_date)
+        ],
+        user_ftas[["fta_id", "assigned_at"]],
+        on="fta_id", how="left"
+    )
 
     # ----------------------------------------
     # === Apply Call Type Filter if Needed ===
     # ----------------------------------------
-    if not feedback_df.empty:
+    stage_mask = ALL_STAGES
+    if has_feedback:
         if call_type_filter != "All":
             feedback_df = feedback_df[feedback_df["call_type"] == call_type_filter]
+            stage_mask = stage_bit(call_type_filter)
 
     # --------------------------------
     # === Compute Contact Status ===
     # --------------------------------
-    if not feedback_df.empty:
-        contacted_ids = feedback_df["fta_id"].unique()
-        today = datetime.now()
-    
-    if not feedback_df.empty:
+    contacted_ids = user_ftas.loc[(user_ftas["stages"] & stage_mask) != 0, "fta_id"]
+    today = datetime.now()
+
+    if has_feedback:
         new_ftas = filtered_ftas[
             (~filtered_ftas["fta_id"].isin(contacted_ids)) &
             ((today - filtered_ftas["assigned_at"]).dt.days <= 2)
@@ -223,17 +179,13 @@ def show_fta_page(go_to):
         (user_ftas["assigned_at"].dt.date >= pd.to_datetime(start_date).date()) &
         (user_ftas["assigned_at"].dt.date <= pd.to_datetime(end_date).date())
     ]
-    if not feedback_df.empty:
-        filtered_feedback_df = feedback_df[
-            (feedback_df["submitted_at"].dt.date >= pd.to_datetime(start_date).date()) &
-            (feedback_df["submitted_at"].dt.date <= pd.to_datetime(end_date).date())
-        ]
+    filtered_feedback_df = feedback_df
 
     # --------------------------------
     # === Summary Metrics ===
     # --------------------------------
     no_assigned_fta = len(filtered_user_ftas)
-    if feedback_df.empty:
+    if not has_feedback:
         no_of_contacted_fta = 0
     else:
         no_of_contacted_fta = len(filtered_feedback_df["fta_id"].unique())
@@ -317,7 +269,7 @@ def show_fta_page(go_to):
         # Assign colors in order
         return {k: color_list[i % len(color_list)] for i, (k, _) in enumerate(sorted_items)}
 
-    if feedback_df.empty:
+    if not has_feedback:
         st.warning("No feedback available yet!")
     else:
         calltype_data = filtered_feedback_df["call_type"].value_counts().to_dict() if "call_type" else {}
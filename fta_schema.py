@@ -0,0 +1,204 @@
+# fta_schema.py
+# The one place that knows the FTA Google Form headers. Every sheet frame is
+# passed through apply_schema() once, when it is ingested: headers are mapped
+# to canonical snake_case names and values are coerced to their dtype. The
+# sync, the snapshot and the pages only ever see the canonical names.
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Bump when a column is added or its dtype changes, so frames conformed by an
+# older definition are conformed again
+SCHEMA_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    One sheet column.
+
+    Attributes:
+        name: Canonical snake_case name used everywhere after ingest
+        dtype: "text", "datetime", "int" or "float"
+        db_column: fta_responses column the value is stored in (None if not stored)
+        aliases: Other headers the column has had (matched case-insensitively)
+        pii: Hash the value before it is stored
+        strip: Strip surrounding whitespace from text values
+    """
+    name: str
+    dtype: str
+    db_column: str = None
+    aliases: tuple = ()
+    pii: bool = False
+    strip: bool = False
+
+
+COLUMNS = (
+    Column("timestamp", "datetime", "Timestamp"),
+    Column("email", "text", "Email_address", ("email address",), pii=True),
+    Column("full_name", "text", "Full_Name", ("full name",), pii=True),
+    Column("phone", "text", "Phone_number", ("phone number",), pii=True, strip=True),
+    Column("gender", "text", "Gender"),
+    Column("location", "text", "Home_Address", ("home address",), pii=True),
+    Column("service_experience", "int", "Service_Experience",
+           ("how was your overall service experience?", "service experience")),
+    Column("worship_experience", "int", "Worship_Experience",
+           ("amazing how will you rate your worship experience", "worship experience")),
+    Column("word_experience", "float", "Word_Experience",
+           ("how will you rate your word experience", "word experience")),
+    Column("general_feedback", "text", "General_Feedback",
+           ("any general feedback for us? (e.g how can we improve)", "general feedback")),
+    Column("invited_by", "text", "Invited_By", ("who invited you to tsp?", "invited by")),
+    Column("membership_interest", "text", "Membership_Interest",
+           ("would you like to be a member of tsp?", "membership interest")),
+    Column("consent", "text", "Consent",
+           ("i consent that the my data provided in this form can be used by the standpoint church as deemed appropriate.",
+            "m&g consent")),
+    Column("meeting_date", "datetime", "Meeting_Date",
+           ("select the most convenient date for your one-on-one meeting with pastor phil.", "meeting date")),
+    Column("fta_id", "text", "FTA_ID", ("fta id", "fta-id"), strip=True),
+)
+
+COLUMNS_BY_NAME = {column.name: column for column in COLUMNS}
+CANONICAL_NAMES = [column.name for column in COLUMNS]
+
+# Lower-cased header (or canonical name) -> canonical name
+_ALIASES = {
+    alias: column.name
+    for column in COLUMNS
+    for alias in (column.name, *column.aliases)
+}
+
+
+def _header_key(header):
+    return " ".join(str(header).strip().lower().split())
+
+
+@lru_cache(maxsize=32)
+def compile_mapping(headers):
+    """
+    Work out the renames for one header signature.
+
+    The sheet's headers only change when the form is edited, so this runs
+    once per process for each distinct set of headers.
+
+    Args:
+        headers: Tuple of the frame's column names, in order
+
+    Returns:
+        Dict of header -> canonical name for every recognised header. When two
+        headers map to the same name the first one wins; unrecognised headers
+        are left out and keep their name.
+    """
+    mapping, taken = {}, set()
+    for header in headers:
+        name = _ALIASES.get(_header_key(header))
+        if name is not None and name not in taken:
+            mapping[header] = name
+            taken.add(name)
+    return mapping
+
+
+def _is_blank(series):
+    return series.isna() | (series.astype(str).str.strip() == "")
+
+
+def coerce_datetime_column(series):
+    """Parse a column of dates in one call, falling back to per-value parsing only for stragglers."""
+    parsed = pd.to_datetime(series, errors="coerce")
+    retry = parsed.isna() & ~_is_blank(series)
+    if retry.any():
+        parsed[retry] = pd.to_datetime(series[retry], errors="coerce", format="mixed")
+    return parsed
+
+
+def _coerce(column, series):
+    """Return (values with the column's dtype, mask of values that could not be coerced)."""
+    if column.dtype == "datetime":
+        values = coerce_datetime_column(series)
+    elif column.dtype in ("int", "float"):
+        values = pd.to_numeric(series, errors="coerce")
+        if column.dtype == "int":
+            values = pd.Series(np.trunc(values), index=series.index).astype("Int64")
+        else:
+            values = values.astype("float64")
+    else:
+        # map() infers float64 for an all-missing column, which has no .str
+        values = series.astype(object).map(str, na_action="ignore").astype(object)
+        if column.strip:
+            values = values.str.strip()
+        return values, pd.Series(False, index=series.index)
+    return values, values.isna() & ~_is_blank(series)
+
+
+def is_conformed(df):
+    """True if `df` already came out of apply_schema."""
+    return df.attrs.get("fta_schema") == SCHEMA_VERSION
+
+
+def conform_column(df, name):
+    """
+    One canonical column of `df`, coerced to its dtype, without conforming the rest.
+
+    Args:
+        df: Sheet rows with raw Google Form headers, or an already conformed frame
+        name: Canonical column name
+
+    Returns:
+        Series aligned with df (all missing if the sheet lacks the column)
+    """
+    if is_conformed(df):
+        return df[name]
+    sources = {canonical: header for header, canonical in compile_mapping(tuple(df.columns)).items()}
+    if name in sources:
+        series = df[sources[name]]
+    else:
+        series = pd.Series(None, index=df.index, dtype=object)
+    return _coerce(COLUMNS_BY_NAME[name], series)[0]
+
+
+def apply_schema(df, return_invalid=False):
+    """
+    Rename sheet headers to canonical names and coerce every known column to its dtype.
+
+    Every canonical column is present in the result (all missing if the sheet
+    lacks it), so callers never need to check. Unrecognised columns are kept
+    as they are. `df` is not modified, and a frame that is already conformed
+    is returned unchanged.
+
+    Args:
+        df: Sheet rows with raw Google Form headers
+        return_invalid: Also return which values could not be coerced
+
+    Returns:
+        The conformed DataFrame, or (DataFrame, invalid) if return_invalid is
+        True, where invalid maps each canonical name to a boolean Series of
+        non-blank values that failed to parse
+    """
+    if df is None:
+        df = pd.DataFrame()
+
+    if is_conformed(df):
+        invalid = {name: pd.Series(False, index=df.index) for name in CANONICAL_NAMES}
+        return (df, invalid) if return_invalid else df
+
+    mapping = compile_mapping(tuple(df.columns))
+    sources = {name: header for header, name in mapping.items()}
+    out = pd.DataFrame(index=df.index)
+    invalid = {}
+    for column in COLUMNS:
+        if column.name in sources:
+            series = df[sources[column.name]]
+        else:
+            series = pd.Series(None, index=df.index, dtype=object)
+        out[column.name], invalid[column.name] = _coerce(column, series)
+
+    extra = [header for header in df.columns if header not in mapping and header not in out.columns]
+    if extra:
+        out = pd.concat([out, df[extra]], axis=1)
+
+    out.attrs["fta_schema"] = SCHEMA_VERSION
+    return (out, invalid) if return_invalid else out
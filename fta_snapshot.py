@@ -0,0 +1,50 @@
+# fta_snapshot.py
+# One normalized, read-only copy of the sheet data, shared by every session
+# in the process and replaced (never edited) after each sync run.
+
+from dataclasses import dataclass
+from datetime import datetime
+
+import pandas as pd
+
+from fta_schema import apply_schema
+
+
+def normalize_responses(df):
+    """Return the sheet rows under canonical names and types (see fta_schema.py); `df` is not modified."""
+    return apply_schema(df)
+
+
+@dataclass(frozen=True)
+class FtaSnapshot:
+    """
+    Shared view of the FTA data after one sync run.
+
+    Sessions keep a reference to the snapshot, never a copy. The frames must
+    be treated as read-only: derive filtered or extended frames with .loc[],
+    .assign() or .copy() instead of assigning columns on them.
+
+    Attributes:
+        version: Increases by one for every snapshot the process builds
+        responses: Sheet rows conformed by fta_schema.apply_schema
+        built_at: When the snapshot was built
+    """
+    version: int
+    responses: pd.DataFrame
+    built_at: datetime
+
+    @property
+    def empty(self):
+        return self.responses.empty
+
+
+def build_snapshot(version, raw_responses):
+    """Normalize freshly synced data into a new snapshot."""
+    return FtaSnapshot(
+        version=version,
+        responses=normalize_responses(raw_responses),
+        built_at=datetime.now(),
+    )
+
+
+EMPTY_SNAPSHOT = build_snapshot(0, None)
@@ -0,0 +1,146 @@
+# fta_status.py
+# fta_status holds one row per FTA with its assignment and contact progress,
+# so the pages can tell contacted / not contacted / new FTAs apart with an
+# indexed lookup instead of loading every feedback row.
+#
+# Every write to fta_assignments or fta_feedback calls refresh_fta_status()
+# for the FTAs it touched, before committing, so the status rows change in the
+# same transaction as the rows they are derived from.
+
+import pandas as pd
+from sqlalchemy import delete, func, insert, select
+
+from models import Feedback, FtaAssignments, FtaStatus
+from queries import date_range
+from sql_batches import chunked, flush_pending
+
+# Call types in the order they happen; bit i of fta_status.stages is CALL_STAGES[i]
+CALL_STAGES = ("1st call", "2nd call", "3rd call", "M&G Attended", "After Effect Confirmation")
+ALL_STAGES = (1 << len(CALL_STAGES)) - 1
+
+
+def stage_bit(call_type):
+    """Bit of `call_type` in fta_status.stages (0 for an unknown call type)."""
+    try:
+        return 1 << CALL_STAGES.index(call_type)
+    except ValueError:
+        return 0
+
+
+def _blank_status(fta_id):
+    return {
+        "fta_id": fta_id,
+        "assigned_to": None,
+        "assigned_at": None,
+        "first_contact_at": None,
+        "last_call_type": None,
+        "stages": 0,
+        "last_feedback_at": None,
+    }
+
+
+def _build_status_rows(conn, id_filter):
+    """Status rows for the FTAs matched by `id_filter` (a function of the fta_id column, or None for all)."""
+    assignments = select(FtaAssignments.fta_id, FtaAssignments.assigned_to, FtaAssignments.assigned_at)
+    feedback = (
+        select(Feedback.fta_id, Feedback.call_type, Feedback.submitted_at)
+        .order_by(Feedback.submitted_at, Feedback.id)
+    )
+    if id_filter is not None:
+        assignments = assignments.where(id_filter(FtaAssignments.fta_id))
+        feedback = feedback.where(id_filter(Feedback.fta_id))
+
+    rows = {}
+    for fta_id, assigned_to, assigned_at in conn.execute(assignments):
+        row = rows[fta_id] = _blank_status(fta_id)
+        row["assigned_to"] = assigned_to
+        row["assigned_at"] = assigned_at
+
+    # Oldest first, so the last row seen for an FTA is its latest feedback
+    for fta_id, call_type, submitted_at in conn.execute(feedback):
+        if fta_id is None:
+            continue
+        row = rows.setdefault(fta_id, _blank_status(fta_id))
+        if row["first_contact_at"] is None:
+            row["first_contact_at"] = submitted_at
+        row["last_call_type"] = call_type
+        row["last_feedback_at"] = submitted_at
+        row["stages"] |= stage_bit(call_type)
+
+    return list(rows.values())
+
+
+def refresh_fta_status(conn, fta_ids=None):
+    """
+    Recompute the fta_status rows of the given FTAs from fta_assignments and
+    fta_feedback, without committing.
+
+    Call it after adding, changing or deleting assignments or feedback and
+    before the commit. FTAs with neither an assignment nor feedback lose
+    their status row.
+
+    Args:
+        conn: Session or Connection holding the open transaction
+        fta_ids: FTA IDs to refresh, or None to rebuild the whole table
+
+    Returns:
+        Number of status rows written
+    """
+    flush_pending(conn)
+
+    if fta_ids is None:
+        rows = _build_status_rows(conn, None)
+        conn.execute(delete(FtaStatus))
+        if rows:
+            conn.execute(insert(FtaStatus), rows)
+        return len(rows)
+
+    fta_ids = sorted({fta_id for fta_id in fta_ids if fta_id is not None})
+    written = 0
+    for chunk in chunked(fta_ids):
+        rows = _build_status_rows(conn, lambda column: column.in_(chunk))
+        conn.execute(delete(FtaStatus).where(FtaStatus.fta_id.in_(chunk)))
+        if rows:
+            conn.execute(insert(FtaStatus), rows)
+        written += len(rows)
+    return written
+
+
+def get_member_status(session, email):
+    """
+    fta_id, assigned_at, first_contact_at and stages of every FTA assigned to `email`.
+
+    Returns:
+        DataFrame with one row per FTA
+    """
+    rows = session.execute(
+        select(FtaStatus.fta_id, FtaStatus.assigned_at, FtaStatus.first_contact_at, FtaStatus.stages)
+        .where(FtaStatus.assigned_to == email)
+    ).all()
+    return pd.DataFrame(rows, columns=["fta_id", "assigned_at", "first_contact_at", "stages"])
+
+
+def get_contact_counts(session, start_date, end_date, member="All"):
+    """
+    Assigned and contacted FTAs per member, for FTAs assigned in a date range.
+
+    Args:
+        session: Open session
+        start_date, end_date: Inclusive range of assigned_at dates (datetime.date)
+        member: Only count this email's FTAs ("All" for everyone)
+
+    Returns:
+        DataFrame with email, total and contacted, one row per member that has FTAs in the range
+    """
+    query = (
+        select(
+            FtaStatus.assigned_to,
+            func.count(),
+            func.count(FtaStatus.first_contact_at),
+        )
+        .where(FtaStatus.assigned_to.is_not(None), date_range(FtaStatus.assigned_at, start_date, end_date))
+        .group_by(FtaStatus.assigned_to)
+    )
+    if member != "All":
+        query = query.where(FtaStatus.assigned_to == member)
+    return pd.DataFrame(session.execute(query).all(), columns=["email", "total", "contacted"])
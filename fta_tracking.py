@@ -1,28 +1,19 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine, func
-from models import Feedback, FtaAssignments
-import os
-from sqlalchemy import create_engine
+from sqlalchemy import func
+from models import Feedback, FtaAssignments, FtaStatus
+from db_session import SessionLocal as Session
+from fta_status import CALL_STAGES, refresh_fta_status, stage_bit
+from rollups import refresh_feedback_days
 
+def show_feedback_tracking_page(go_to):
+    # Close the session (returning its pooled connection) however the page exits
+    with Session() as session:
+        _render_feedback_tracking_page(go_to, session)
 
-# Absolute path to the database file
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_FILE = os.path.join(BASE_DIR, "database", "fta.db")
-
-# Create the database folder if it doesn’t exist
-os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
-
-# SQLAlchemy connection string
-DB_PATH = f"sqlite:///{DB_FILE}"
-engine = create_engine(DB_PATH, connect_args={"check_same_thread": False})
-
-# Create session factory
-Session = sessionmaker(bind=engine)
 
-def show_feedback_tracking_page(go_to):
+def _render_feedback_tracking_page(go_to, session):
     df_fta_response = st.session_state["fta_data"]
     col1, col2, col3 = st.columns([1, 3, 1])
     with col1:
@@ -33,16 +24,16 @@ def show_feedback_tracking_page(go_to):
         if not email:
             st.warning("You must be logged in to access this page.")
             return
-    
-        session = Session()
-    
-        # Fetch assigned FTAs for this user (case-insensitive match)
+
+        # Fetch assigned FTAs for this user (case-insensitive match) with the
+        # call types already done for each, from fta_status
         assigned_ftas = (
-            session.query(FtaAssignments.fta_id)
+            session.query(FtaAssignments.fta_id, func.coalesce(FtaStatus.stages, 0))
+            .outerjoin(FtaStatus, FtaStatus.fta_id == FtaAssignments.fta_id)
             .filter(func.lower(FtaAssignments.assigned_to) == email.lower())
             .all()
         )
-        assigned_ftas = pd.DataFrame(assigned_ftas, columns=["fta_id"])
+        assigned_ftas = pd.DataFrame(assigned_ftas, columns=["fta_id", "stages"])
     
         if assigned_ftas.empty:
             st.info("You don't have any assigned FTAs.")
@@ -55,20 +46,10 @@ def show_feedback_tracking_page(go_to):
                 how="left"
             )
         
-            # Fetch feedback history for this user
-            feedback_records = session.query(Feedback.fta_id, Feedback.call_type).filter_by(email=email).all()
-            feedback_df = pd.DataFrame(feedback_records, columns=["fta_id", "call_type"])
-    
-            call_type = st.selectbox("Type of Call", [
-                "1st call", "2nd call", "3rd call", "M&G Attended", "After Effect Confirmation"
-            ])
+            call_type = st.selectbox("Type of Call", list(CALL_STAGES))
         
             # Filter out FTAs that already have this call_type feedback
-            if not feedback_df.empty:
-                contacted_ids = feedback_df[feedback_df["call_type"] == call_type]["fta_id"].unique().tolist()
-                available_ftas = assigned_ftas[~assigned_ftas["fta_id"].isin(contacted_ids)]
-            else:
-                available_ftas = assigned_ftas
+            available_ftas = assigned_ftas[(assigned_ftas["stages"] & stage_bit(call_type)) == 0]
         
             if available_ftas.empty:
                 st.info(f"✅ All FTAs have already received '{call_type}' feedback.")
@@ -210,6 +191,8 @@ def show_feedback_tracking_page(go_to):
                 )
 
                 session.add(feedback)
+                refresh_fta_status(session, [selected_fta])
+                refresh_feedback_days(session, [feedback.submitted_at.date()])
                 session.commit()
 
                 st.success("✅ Feedback submitted successfully!")
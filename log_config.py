@@ -0,0 +1,100 @@
+# log_config.py
+# Process-wide logging for the app and its background threads.
+#
+# Log calls only put the record on a queue (QueueHandler); one listener thread
+# formats and writes it, so request and sync threads never block on stderr.
+#
+# Levels:
+#   FTA_LOG_LEVEL=DEBUG                      # default level for app modules (INFO)
+#   FTA_LOG_LEVELS="db=DEBUG,sheet_cache=WARNING"   # per-module overrides
+# Row-level detail (each assignment, each rejected row) is logged at DEBUG.
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s [%(name)s] %(message)s"
+
+# Library loggers that are too chatty at the app's default level
+DEFAULT_LEVELS = {
+    "sqlalchemy": logging.WARNING,
+    "urllib3": logging.WARNING,
+    "watchdog": logging.WARNING,
+}
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+def parse_level(level):
+    """Level number for a name such as "debug" (numbers pass through), or None if unknown."""
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).strip().upper())
+    return value if isinstance(value, int) else None
+
+
+def parse_levels(spec):
+    """
+    Parse "name=LEVEL,name=LEVEL" into {name: level}.
+
+    Unknown level names are skipped rather than raised, so a typo in the
+    environment can't stop the app from starting.
+    """
+    levels = {}
+    for item in (spec or "").split(","):
+        name, _, level = item.partition("=")
+        value = parse_level(level)
+        if name.strip() and value is not None:
+            levels[name.strip()] = value
+    return levels
+
+
+def setup_logging(level=None, module_levels=None):
+    """
+    Route all logging through a queue to one stderr writer thread, once per process.
+
+    Later calls only apply the levels they are given, so Streamlit reruns of
+    app.py are free.
+
+    Args:
+        level: Root level (default: FTA_LOG_LEVEL, or INFO if it is unset or unknown)
+        module_levels: Dict of logger name -> level, applied on top of
+            DEFAULT_LEVELS and FTA_LOG_LEVELS
+
+    Returns:
+        The QueueListener writing the records
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            log_queue = queue.SimpleQueue()
+            stream_handler = logging.StreamHandler(sys.stderr)
+            stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+            root = logging.getLogger()
+            root.addHandler(logging.handlers.QueueHandler(log_queue))
+            requested = level or os.environ.get("FTA_LOG_LEVEL", "INFO")
+            root_level = parse_level(requested)
+            root.setLevel(root_level if root_level is not None else logging.INFO)
+
+            levels = {**DEFAULT_LEVELS, **parse_levels(os.environ.get("FTA_LOG_LEVELS"))}
+            for name, name_level in levels.items():
+                logging.getLogger(name).setLevel(name_level)
+
+            _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+            _listener.start()
+            # Flush what is still queued when the process exits
+            atexit.register(_listener.stop)
+            if root_level is None:
+                logging.getLogger(__name__).warning("Unknown log level %r; using INFO.", requested)
+        elif level and parse_level(level) is not None:
+            logging.getLogger().setLevel(parse_level(level))
+
+        for name, name_level in (module_levels or {}).items():
+            logging.getLogger(name).setLevel(name_level)
+        return _listener
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey, Float
+from sqlalchemy import Boolean, Column, Date, Integer, String, Text, DateTime, ForeignKey, Float, Index, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -20,14 +20,17 @@ class FtaAssignments(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255))
     fta_id = Column(String(50), unique=True)
-    assigned_to = Column(String(255))
+    assigned_to = Column(String(255), index=True)
     assigned_by = Column(Integer, ForeignKey("User.id"))
-    assigned_at = Column(DateTime)  # ✅ changed from Text to DateTime
+    assigned_at = Column(DateTime, index=True)  # ✅ changed from Text to DateTime
 
     assigned_by_user = relationship("User", back_populates="assignments")
     responses = relationship("FtaResponses", back_populates="assignment")
     submissions = relationship("FtaSubmissions", back_populates="assignment")
 
+# fta_tracking looks up the logged-in member with lower(assigned_to)
+Index("ix_fta_assignments_assigned_to_lower", func.lower(FtaAssignments.assigned_to))
+
 
 class FtaSubmissions(Base):
     __tablename__ = 'fta_submissions'
@@ -48,8 +51,11 @@ class FtaSubmissions(Base):
 
 class FtaResponses(Base):
     __tablename__ = 'fta_responses'
+    __table_args__ = (
+        Index("ux_fta_responses_fta_id", "FTA_ID", unique=True),  # Target of the sync upsert
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)  # ✅ Added primary key
-    Timestamp = Column(DateTime)  # ✅ Changed from Text to DateTime
+    Timestamp = Column(DateTime, index=True)  # ✅ Changed from Text to DateTime
     Email_address = Column(String(255))
     Full_Name = Column(String(255))
     Phone_number = Column(String(20))  # ✅ Changed from Integer to String
@@ -64,6 +70,7 @@ class FtaResponses(Base):
     Consent = Column(String(100))
     Meeting_Date = Column(DateTime)  # ✅ DateTime
     FTA_ID = Column(String(50), ForeignKey("fta_assignments.fta_id"))
+    row_digest = Column(String(64), nullable=True)  # SHA-256 of the raw sheet row, used to skip unchanged rows
 
     assignment = relationship("FtaAssignments", back_populates="responses")
 
@@ -72,8 +79,8 @@ class Feedback(Base):
     __tablename__ = 'fta_feedback'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    email = Column(String(255))  # Email of the team member submitting the feedback
-    fta_id = Column(String(50))  # ID of the FTA the feedback is about
+    email = Column(String(255), index=True)  # Email of the team member submitting the feedback
+    fta_id = Column(String(50), index=True)  # ID of the FTA the feedback is about
     call_type = Column(String(100))  # e.g. "1st call", "2nd call"
     call_success = Column(String(255))  # Success status of the call
     feedback_1 = Column(Text)  # Specific feedback from first call
@@ -81,10 +88,67 @@ class Feedback(Base):
     mg_date = Column(DateTime, nullable=True)  # Meet & Greet date
     department = Column(String(255), nullable=True)  # Department handed over to
     general_feedback = Column(Text, nullable=True)  # Overall notes
-    submitted_at = Column(DateTime)  # When the feedback was submitted
+    submitted_at = Column(DateTime, index=True)  # When the feedback was submitted
+
+
+# Sheet rows the sync left out, keyed by FTA ID, so an unchanged bad row is
+# skipped on later syncs instead of being read and reported again
+class RejectedRow(Base):
+    __tablename__ = 'rejected_rows'
+
+    fta_id = Column(String(50), primary_key=True)
+    row_digest = Column(String(64))  # Digest of the raw sheet row when it was rejected
+    reason = Column(String(255))  # e.g. "missing email"
+    rejected_at = Column(DateTime)
+
+
+# One row per FTA, derived from fta_assignments and fta_feedback by
+# fta_status.refresh_fta_status in the same transaction as every write to them
+class FtaStatus(Base):
+    __tablename__ = 'fta_status'
+    __table_args__ = (
+        Index("ix_fta_status_assigned_to_assigned_at", "assigned_to", "assigned_at"),  # A member's FTAs by date
+    )
+
+    fta_id = Column(String(50), primary_key=True)
+    assigned_to = Column(String(255), nullable=True)  # None if the FTA only has feedback left
+    assigned_at = Column(DateTime, nullable=True)
+    first_contact_at = Column(DateTime, nullable=True)  # First feedback; None means not contacted yet
+    last_call_type = Column(String(100), nullable=True)  # Call type of the latest feedback
+    stages = Column(Integer, default=0)  # Bitmask of the call types done, see fta_status.CALL_STAGES
+    last_feedback_at = Column(DateTime, nullable=True)
+
+
+# Daily rollups behind the dashboard and team charts, recomputed for the days a
+# write touched by rollups.py in the same transaction as the write
+class FeedbackDaily(Base):
+    __tablename__ = 'feedback_daily'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, index=True)  # date(submitted_at)
+    email = Column(String(255), nullable=True)  # Member who submitted the feedback
+    call_type = Column(String(100), nullable=True)
+    call_success = Column(String(255), nullable=True)
+    feedback_1 = Column(Text, nullable=True)
+    count = Column(Integer)  # fta_feedback rows with these values on this day
+
+
+class InviteeDaily(Base):
+    __tablename__ = 'invitee_daily'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, index=True)  # date(Timestamp) of the form submission
+    dimension = Column(String(50))  # "gender", "membership_interest", "consent" or "invited_by"
+    value = Column(String(255), nullable=True)  # None counts the rows with no answer
+    count = Column(Integer)  # fta_responses rows with this value on this day
+
 
 class EmailLogs(Base):
     __tablename__ = 'email_logs'
+    __table_args__ = (
+        Index("ix_email_logs_fta_id_status", "fta_id", "status"),  # "already sent?" checks
+        Index("ix_email_logs_status_timestamp", "status", "timestamp"),  # daily quota count
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     fta_id = Column(String(50))  # ID of the FTA the email was about
@@ -96,6 +160,24 @@ class EmailLogs(Base):
     timestamp = Column(DateTime)  # When the email was logged
 
 
+class EmailOutbox(Base):
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        Index("ix_email_outbox_status", "status", "created_at"),  # Dispatcher claims oldest pending first
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    fta_id = Column(String(50), unique=True)  # One welcome email per FTA
+    fta_name = Column(String(255))  # Name used in the greeting
+    email = Column(String(255))  # Recipient address
+    status = Column(String(50), default="pending")  # "pending", "sending", "sent", "failed"
+    attempts = Column(Integer, default=0)  # Send attempts so far
+    last_error = Column(Text, nullable=True)  # Error from the last failed attempt
+    created_at = Column(DateTime)  # When the email was queued
+    last_attempt_at = Column(DateTime, nullable=True)  # When a dispatcher last picked it up
+    sent_at = Column(DateTime, nullable=True)  # When it was delivered
+
+
 class ATeamMember(Base):
     __tablename__ = "a_team_members"
 
@@ -108,4 +190,40 @@ class AssignmentTracker(Base):
     __tablename__ = "assignment_tracker"
 
     id = Column(Integer, primary_key=True)
-    last_assigned_index = Column(Integer)
\ No newline at end of file
+    last_assigned_index = Column(Integer)
+
+class SyncState(Base):
+    __tablename__ = "sync_state"
+
+    id = Column(Integer, primary_key=True)
+    last_timestamp = Column(DateTime, nullable=True)  # Newest form Timestamp seen in the sheet
+    last_row_count = Column(Integer, nullable=True)  # Sheet rows seen on the last sync
+    last_sheet_digest = Column(String(64), nullable=True)  # Digest of the whole sheet on the last sync
+    last_synced_at = Column(DateTime, nullable=True)  # When the last sync finished
+
+
+# One row per sheet sync, written by sync_journal.SyncJournal
+class SyncRun(Base):
+    __tablename__ = "sync_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    started_at = Column(DateTime, index=True)  # When the sync started
+    finished_at = Column(DateTime)  # When the sync finished (or failed)
+    status = Column(String(20))  # "success" or "failed"
+    error = Column(Text, nullable=True)  # Why the sync failed
+    sheet_modified = Column(Boolean, nullable=True)  # False if the sheet answered 304 Not Modified
+    rows_fetched = Column(Integer, default=0)  # Rows in the sheet
+    rows_inserted = Column(Integer, default=0)  # New fta_responses rows
+    rows_updated = Column(Integer, default=0)  # Edited rows written again
+    rows_skipped = Column(Integer, default=0)  # Unchanged, duplicate or rejected rows
+    rows_rejected = Column(Integer, default=0)  # Rows left out because of bad data
+    emails_queued = Column(Integer, default=0)  # Welcome emails added to the outbox
+    assignments_made = Column(Integer, default=0)  # New FTAs assigned
+    # Phase durations in milliseconds
+    fetch_ms = Column(Float, default=0)  # Pulling the sheet
+    parse_ms = Column(Float, default=0)  # Schema, types and de-duplication
+    hash_ms = Column(Float, default=0)  # Row digests, change detection and PII hashing
+    upsert_ms = Column(Float, default=0)  # Writing fta_responses and committing
+    assign_ms = Column(Float, default=0)  # Assigning new FTAs
+    email_ms = Column(Float, default=0)  # Queueing welcome emails and starting the dispatcher
+    total_ms = Column(Float, default=0)
@@ -0,0 +1,127 @@
+# page_metrics.py
+# The numbers behind the dashboard and team pages, computed from plain
+# DataFrames with no Streamlit calls, so they can be benchmarked
+# (benchmarks/bench_hot_paths.py) and checked without a browser. The frames
+# come from queries.py already limited to the selected date range and member;
+# the chart counts are summed from the daily rollups (rollups.py).
+
+import pandas as pd
+
+MONTH_ORDER = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+SUMMARY_COLUMNS = ["Email", "Name", "Status", "Total Assigned", "Contacted", "Not Contacted"]
+
+
+def sum_counts(df, column):
+    """{value: count} of a rollup frame, largest first like value_counts(); missing values are left out."""
+    return df.groupby(column)["count"].sum().sort_values(ascending=False, kind="stable").to_dict()
+
+
+def dashboard_metrics(invitees, converted):
+    """
+    Cards and charts of the dashboard page for one date range.
+
+    Args:
+        invitees: invitee_daily rows in the range (queries.get_invitee_rollup)
+        converted: FTAs with M&G Attended feedback in the range (queries.count_converted)
+
+    Returns:
+        Dict with total_invitees, converted, conversion_rate, the value counts
+        membership_interest, gender, consent and invited_by, and
+        monthly_counts (Series of invitees per month name, in calendar order)
+    """
+    dimensions = {dimension: rows for dimension, rows in invitees.groupby("dimension")}
+    empty = invitees.iloc[0:0]
+
+    # Every response has one gender row, blank answers included, so these add up to all invitees
+    gender = dimensions.get("gender", empty)
+    total_invitees = int(gender["count"].sum())
+    conversion_rate = round((converted / total_invitees) * 100) if total_invitees else 0
+
+    monthly_counts = gender.groupby(gender["day"].dt.strftime("%b"))["count"].sum()
+
+    return {
+        "total_invitees": total_invitees,
+        "converted": converted,
+        "conversion_rate": conversion_rate,
+        **{
+            dimension: sum_counts(dimensions.get(dimension, empty), "value")
+            for dimension in ("membership_interest", "gender", "consent", "invited_by")
+        },
+        "monthly_counts": monthly_counts.reindex(MONTH_ORDER).dropna(),
+    }
+
+
+def assignment_summary(members_df, contact_counts):
+    """
+    Assigned / contacted / not contacted counts per A-Team member.
+
+    Every member gets a row, inactive ones included, even when the filters
+    leave them with nothing assigned.
+
+    Args:
+        members_df: Members with email and is_active (db.get_all_a_team_members_with_status)
+        contact_counts: email, total and contacted per member, already
+            filtered by date and member (fta_status.get_contact_counts)
+
+    Returns:
+        DataFrame with the SUMMARY_COLUMNS
+    """
+    counts = contact_counts.set_index("email")
+    summary_data = []
+    for _, row in members_df.iterrows():
+        email = row["email"]
+        if row.get("name"):
+            full_name = row["name"]
+        else:
+            full_name = email.split("@")[0].split(".")[0].capitalize()
+
+        if email in counts.index:
+            total, contacted = int(counts.at[email, "total"]), int(counts.at[email, "contacted"])
+        else:
+            total = contacted = 0
+
+        summary_data.append({
+            "Email": email,
+            "Name": full_name,
+            "Status": "🟢 Active" if row.get('is_active', True) else "🔴 Inactive",
+            "Total Assigned": total,
+            "Contacted": contacted,
+            "Not Contacted": total - contacted,
+        })
+
+    summary_df = pd.DataFrame(summary_data)
+    for col in SUMMARY_COLUMNS:
+        if col not in summary_df.columns:
+            if col in ["Total Assigned", "Contacted", "Not Contacted"]:
+                summary_df[col] = 0
+            elif col == "Status":
+                summary_df[col] = "🟢 Active"
+    return summary_df
+
+
+def feedback_breakdown(feedback_rollup):
+    """
+    The counts charted on the team page.
+
+    Args:
+        feedback_rollup: feedback_daily counts for the selected range and
+            member (queries.get_feedback_rollup)
+
+    Returns:
+        Dict mapping call_type, call_success and feedback_1 to a {value: count} dict
+    """
+    return {
+        column: sum_counts(feedback_rollup, column)
+        for column in ("call_type", "call_success", "feedback_1")
+    }
+
+
+def feedback_delete_options(feedback_df):
+    """Map "FTA ID - call type - submitted at" labels to feedback ids, for the delete picker."""
+    if feedback_df.empty:
+        return {}
+    labels = feedback_df.apply(
+        lambda row: f"{row['fta_id']} - {row['call_type']} - {row['submitted_at'].strftime('%Y-%m-%d %H:%M') if pd.notnull(row['submitted_at']) else 'N/A'}",
+        axis=1
+    )
+    return dict(zip(labels, feedback_df["id"]))
@@ -0,0 +1,115 @@
+# queries.py
+# Read queries behind the pages. Each one takes an inclusive date range and an
+# optional member email and puts both in the WHERE clause as plain range and
+# equality predicates, so SQLite answers them from the indexes and a page only
+# reads the rows of the window it shows.
+
+from datetime import datetime, time, timedelta
+
+import pandas as pd
+from sqlalchemy import and_, func, select
+
+from models import Feedback, FeedbackDaily, InviteeDaily
+
+FEEDBACK_COLUMNS = Feedback.__table__.columns.keys()
+
+
+def date_range(column, start_date, end_date):
+    """
+    WHERE condition for a DateTime `column` falling on or between two dates.
+
+    Compares the stored value against midnight bounds instead of applying
+    date() to it, so an index on the column can still be used.
+    """
+    return and_(
+        column >= datetime.combine(start_date, time.min),
+        column < datetime.combine(end_date + timedelta(days=1), time.min),
+    )
+
+
+def _frame(session, query, columns, date_columns=()):
+    df = pd.DataFrame(session.execute(query).all(), columns=columns)
+    for column in date_columns:
+        df[column] = pd.to_datetime(df[column], errors="coerce")
+    return df
+
+
+def get_feedback(session, start_date, end_date, member=None):
+    """
+    fta_feedback rows submitted in a date range.
+
+    Args:
+        session: Open session
+        start_date, end_date: Inclusive range of submitted_at dates (datetime.date)
+        member: Only feedback submitted by this email (None for everyone)
+
+    Returns:
+        DataFrame with every fta_feedback column and submitted_at parsed to datetimes
+    """
+    query = select(*Feedback.__table__.columns).where(date_range(Feedback.submitted_at, start_date, end_date))
+    if member is not None:
+        query = query.where(Feedback.email == member)
+    return _frame(session, query, FEEDBACK_COLUMNS, ["submitted_at"])
+
+
+def get_feedback_members(session):
+    """Emails that have submitted feedback, sorted."""
+    query = select(Feedback.email).where(Feedback.email.is_not(None)).distinct().order_by(Feedback.email)
+    return list(session.execute(query).scalars())
+
+
+def get_feedback_call_types(session, member):
+    """Call types `member` has submitted feedback for, sorted."""
+    query = (
+        select(Feedback.call_type)
+        .where(Feedback.email == member, Feedback.call_type.is_not(None))
+        .distinct()
+        .order_by(Feedback.call_type)
+    )
+    return list(session.execute(query).scalars())
+
+
+def count_converted(session, start_date, end_date):
+    """Distinct FTAs with "M&G Attended" feedback submitted in a date range."""
+    query = select(func.count(Feedback.fta_id.distinct())).where(
+        Feedback.call_type == "M&G Attended",
+        date_range(Feedback.submitted_at, start_date, end_date),
+    )
+    return session.execute(query).scalar()
+
+
+def get_feedback_rollup(session, start_date, end_date, member=None):
+    """
+    feedback_daily rows summed over a date range (see rollups.py).
+
+    Args:
+        session: Open session
+        start_date, end_date: Inclusive range of days (datetime.date)
+        member: Only feedback submitted by this email (None for everyone)
+
+    Returns:
+        DataFrame with call_type, call_success, feedback_1 and count
+    """
+    keys = [FeedbackDaily.call_type, FeedbackDaily.call_success, FeedbackDaily.feedback_1]
+    query = (
+        select(*keys, func.sum(FeedbackDaily.count))
+        .where(FeedbackDaily.day >= start_date, FeedbackDaily.day <= end_date)
+        .group_by(*keys)
+    )
+    if member is not None:
+        query = query.where(FeedbackDaily.email == member)
+    return _frame(session, query, ["call_type", "call_success", "feedback_1", "count"])
+
+
+def get_invitee_rollup(session, start_date, end_date):
+    """
+    invitee_daily rows in a date range (see rollups.py).
+
+    Returns:
+        DataFrame with day (datetimes), dimension, value and count
+    """
+    query = (
+        select(InviteeDaily.day, InviteeDaily.dimension, InviteeDaily.value, InviteeDaily.count)
+        .where(InviteeDaily.day >= start_date, InviteeDaily.day <= end_date)
+    )
+    return _frame(session, query, ["day", "dimension", "value", "count"], ["day"])
@@ -0,0 +1,112 @@
+# rollups.py
+# Daily rollup tables behind the dashboard and team charts:
+#   feedback_daily  fta_feedback rows per day, member, call_type, call_success and feedback_1
+#   invitee_daily   fta_responses rows per day and answer, for each INVITEE_DIMENSIONS column
+#
+# A write never edits a rollup row. It names the days it touched and those
+# days are recomputed from the source table with one GROUP BY, before the
+# commit, so the rollups change in the same transaction as the rows they count.
+# A chart over any date range then sums a few hundred rollup rows.
+
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import delete, func, insert, literal, select
+
+from models import Feedback, FeedbackDaily, FtaResponses, InviteeDaily
+from queries import date_range
+from sql_batches import chunked, flush_pending
+
+# invitee_daily.dimension -> fta_responses column
+INVITEE_DIMENSIONS = {
+    "gender": FtaResponses.Gender,
+    "membership_interest": FtaResponses.Membership_Interest,
+    "consent": FtaResponses.Consent,
+    "invited_by": FtaResponses.Invited_By,
+}
+FEEDBACK_KEYS = ("email", "call_type", "call_success", "feedback_1")
+
+
+def days_of(values):
+    """The distinct calendar days of datetimes, dates or Timestamps; missing values are skipped."""
+    days = set()
+    for value in values:
+        if value is None or pd.isna(value):
+            continue
+        days.add(value.date() if isinstance(value, datetime) else value)
+    return days
+
+
+def _feedback_select(column_filter):
+    day = func.date(Feedback.submitted_at)
+    keys = [getattr(Feedback, key) for key in FEEDBACK_KEYS]
+    query = select(day, *keys, func.count()).where(Feedback.submitted_at.is_not(None)).group_by(day, *keys)
+    return query if column_filter is None else query.where(column_filter(Feedback.submitted_at))
+
+
+def _invitee_selects(column_filter):
+    day = func.date(FtaResponses.Timestamp)
+    for dimension, column in INVITEE_DIMENSIONS.items():
+        query = (
+            select(day, literal(dimension), column, func.count())
+            .where(FtaResponses.Timestamp.is_not(None))
+            .group_by(day, column)
+        )
+        yield query if column_filter is None else query.where(column_filter(FtaResponses.Timestamp))
+
+
+def _day_filter(days):
+    # The range keeps the Timestamp / submitted_at index usable; date() picks the exact days
+    strings = [day.isoformat() for day in days]
+    return lambda column: date_range(column, days[0], days[-1]) & func.date(column).in_(strings)
+
+
+def refresh_feedback_days(conn, days):
+    """
+    Recompute the feedback_daily rows of the given days from fta_feedback, without committing.
+
+    Args:
+        conn: Session or Connection holding the open transaction
+        days: Days whose feedback was added, changed or deleted (see days_of)
+    """
+    flush_pending(conn)
+    columns = ["day", *FEEDBACK_KEYS, "count"]
+    for chunk in chunked(sorted(days)):
+        conn.execute(delete(FeedbackDaily).where(FeedbackDaily.day.in_(chunk)))
+        conn.execute(insert(FeedbackDaily).from_select(columns, _feedback_select(_day_filter(chunk))))
+
+
+def refresh_invitee_days(conn, days):
+    """
+    Recompute the invitee_daily rows of the given days from fta_responses, without committing.
+
+    Args:
+        conn: Session or Connection holding the open transaction
+        days: Form submission days of the responses that were written (see days_of)
+    """
+    flush_pending(conn)
+    columns = ["day", "dimension", "value", "count"]
+    for chunk in chunked(sorted(days)):
+        conn.execute(delete(InviteeDaily).where(InviteeDaily.day.in_(chunk)))
+        for query in _invitee_selects(_day_filter(chunk)):
+            conn.execute(insert(InviteeDaily).from_select(columns, query))
+
+
+def stored_response_days(conn, fta_ids):
+    """Days of the Timestamps fta_responses holds for `fta_ids`, read before the rows are overwritten."""
+    days = set()
+    for chunk in chunked(fta_ids):
+        days |= days_of(conn.execute(
+            select(FtaResponses.Timestamp).where(FtaResponses.FTA_ID.in_(chunk))
+        ).scalars())
+    return days
+
+
+def rebuild_rollups(conn):
+    """Recompute both rollup tables from scratch, without committing."""
+    flush_pending(conn)
+    conn.execute(delete(FeedbackDaily))
+    conn.execute(insert(FeedbackDaily).from_select(["day", *FEEDBACK_KEYS, "count"], _feedback_select(None)))
+    conn.execute(delete(InviteeDaily))
+    for query in _invitee_selects(None):
+        conn.execute(insert(InviteeDaily).from_select(["day", "dimension", "value", "count"], query))
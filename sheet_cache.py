@@ -0,0 +1,170 @@
+# sheet_cache.py
+# Local copy of the last successful Google Sheet pull, so the app can render
+# straight away when the sheet is slow or unreachable, and conditional
+# fetching so an unchanged sheet costs one small round-trip.
+#
+# Files (next to the database, so FTA_DB_FILE moves them too; not committed):
+#   database/sheet_cache/sheet.pkl.gz   raw sheet DataFrame, gzip-compressed pickle
+#   database/sheet_cache/sheet.json     url, fetched_at, checked_at, etag, last_modified, rows
+
+import gzip
+import io
+import json
+import logging
+import os
+import pickle
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+import pandas as pd
+
+from db_session import DB_FILE
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(os.path.dirname(DB_FILE), "sheet_cache")
+FETCH_TIMEOUT_SECONDS = 30
+
+_cache_lock = threading.Lock()
+
+
+class CachedSheet:
+    """The last successful pull of the sheet and what the server said about it."""
+
+    def __init__(self, df, url, fetched_at, checked_at=None, etag=None, last_modified=None):
+        self.df = df
+        self.url = url
+        self.fetched_at = fetched_at
+        self.checked_at = checked_at or fetched_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def metadata(self):
+        return {
+            "url": self.url,
+            "fetched_at": self.fetched_at.isoformat(),
+            "checked_at": self.checked_at.isoformat(),
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "rows": len(self.df),
+        }
+
+
+def _paths(cache_dir):
+    return os.path.join(cache_dir, "sheet.pkl.gz"), os.path.join(cache_dir, "sheet.json")
+
+
+def _write_atomic(path, data):
+    # Write next to the target and rename, so a reader never sees half a file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_cached_sheet(url, cache_dir=CACHE_DIR):
+    """
+    Read the cached pull of `url` from disk.
+
+    Returns:
+        CachedSheet, or None if there is no cache for this URL or it can't be read
+    """
+    data_path, meta_path = _paths(cache_dir)
+    try:
+        with _cache_lock:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("url") != url:
+                return None
+            with gzip.open(data_path, "rb") as f:
+                df = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable cache: %s", e)
+        return None
+
+    return CachedSheet(
+        df, url,
+        fetched_at=datetime.fromisoformat(meta["fetched_at"]),
+        checked_at=datetime.fromisoformat(meta["checked_at"]),
+        etag=meta.get("etag"),
+        last_modified=meta.get("last_modified"),
+    )
+
+
+def save_cached_sheet(cached, cache_dir=CACHE_DIR, data_changed=True):
+    """Persist `cached`; with data_changed=False only the metadata is rewritten."""
+    os.makedirs(cache_dir, exist_ok=True)
+    data_path, meta_path = _paths(cache_dir)
+    with _cache_lock:
+        if data_changed:
+            _write_atomic(data_path, gzip.compress(pickle.dumps(cached.df, protocol=pickle.HIGHEST_PROTOCOL), 6))
+        _write_atomic(meta_path, json.dumps(cached.metadata(), indent=2).encode("utf-8"))
+
+
+def _fetch_http(url, etag, last_modified, timeout):
+    """Return (csv bytes or None if not modified, etag, last_modified)."""
+    request = urllib.request.Request(url)
+    if etag:
+        request.add_header("If-None-Match", etag)
+    if last_modified:
+        request.add_header("If-Modified-Since", last_modified)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read(), response.headers.get("ETag"), response.headers.get("Last-Modified")
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, etag, last_modified
+        raise
+
+
+def _fetch_file(path, last_modified):
+    # Local CSV (development and load tests): the file's mtime stands in for Last-Modified
+    mtime = str(os.stat(path).st_mtime_ns)
+    if mtime == last_modified:
+        return None, None, mtime
+    with open(path, "rb") as f:
+        return f.read(), None, mtime
+
+
+def fetch_sheet(url, cache_dir=CACHE_DIR, timeout=FETCH_TIMEOUT_SECONDS):
+    """
+    Pull the sheet, asking the server to skip the body if nothing changed.
+
+    A 200 response replaces the cached copy. A 304 keeps the cached copy and
+    only moves its checked_at forward. Network and parse errors are raised,
+    and the cached copy is left as it was.
+
+    Args:
+        url: CSV export URL of the sheet (or a local CSV path)
+        cache_dir: Where the cached copy lives
+        timeout: Seconds to wait for the server
+
+    Returns:
+        (CachedSheet, changed) where changed is False if the server answered
+        304 Not Modified
+    """
+    cached = load_cached_sheet(url, cache_dir)
+    etag = cached.etag if cached else None
+    last_modified = cached.last_modified if cached else None
+
+    if url.startswith(("http://", "https://")):
+        body, etag, last_modified = _fetch_http(url, etag, last_modified, timeout)
+    else:
+        body, etag, last_modified = _fetch_file(url, last_modified)
+
+    now = datetime.now()
+    if body is None and cached is not None:
+        cached.checked_at = now
+        save_cached_sheet(cached, cache_dir, data_changed=False)
+        logger.debug("Sheet not modified since %s.", f"{cached.fetched_at:%Y-%m-%d %H:%M:%S}")
+        return cached, False
+
+    df = pd.read_csv(io.BytesIO(body))
+    df.columns = df.columns.str.strip()
+    fresh = CachedSheet(df, url, fetched_at=now, etag=etag, last_modified=last_modified)
+    save_cached_sheet(fresh, cache_dir)
+    return fresh, True
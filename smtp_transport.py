@@ -0,0 +1,190 @@
+# smtp_transport.py
+# A small pool of authenticated SMTP connections shared by every sender in
+# the process (db.send_email, email_utils.send_email_to_fta, the outbox
+# dispatcher). Reusing a connection skips the TCP connect, TLS handshake and
+# login that each message used to pay for.
+
+import queue
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_POOL_SIZE = 3
+CONNECT_TIMEOUT_SECONDS = 10
+SEND_TIMEOUT_SECONDS = 30
+# Connections idle longer than this are checked with NOOP before reuse;
+# Gmail drops idle sessions after a few minutes.
+MAX_IDLE_SECONDS = 60
+
+
+def _is_connection_error(error):
+    """True if the connection is unusable and a fresh one may succeed.
+
+    smtplib.SMTPException subclasses OSError, so protocol errors such as a
+    refused recipient have to be told apart from socket failures.
+    """
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+class SmtpPool:
+    """
+    Thread-safe pool of logged-in SMTP connections.
+
+    Args:
+        host, port: SMTP server address
+        username, password: Login credentials; login is skipped if the server
+            does not advertise AUTH (e.g. a local stand-in server)
+        use_ssl: True for implicit TLS (port 465), False for STARTTLS/plain
+        starttls: Upgrade plain connections with STARTTLS when supported
+        size: Maximum number of open connections
+    """
+
+    def __init__(self, host, port, username=None, password=None, use_ssl=False, starttls=True,
+                 size=DEFAULT_POOL_SIZE, connect_timeout=CONNECT_TIMEOUT_SECONDS,
+                 send_timeout=SEND_TIMEOUT_SECONDS, max_idle=MAX_IDLE_SECONDS):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.starttls = starttls
+        self.size = size
+        self.connect_timeout = connect_timeout
+        self.send_timeout = send_timeout
+        self.max_idle = max_idle
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._open = 0
+
+    def _connect(self):
+        if self.use_ssl:
+            conn = smtplib.SMTP_SSL(self.host, self.port, timeout=self.connect_timeout)
+            conn.ehlo()
+        else:
+            conn = smtplib.SMTP(self.host, self.port, timeout=self.connect_timeout)
+            conn.ehlo()
+            if self.starttls and conn.has_extn("starttls"):
+                conn.starttls()
+                conn.ehlo()
+        if self.username and self.password and conn.has_extn("auth"):
+            conn.login(self.username, self.password)
+        if conn.sock is not None:
+            conn.sock.settimeout(self.send_timeout)
+        return conn
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.quit()
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _is_alive(self, conn):
+        try:
+            return conn.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _acquire(self):
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if time.monotonic() - last_used < self.max_idle or self._is_alive(conn):
+                return conn
+            self._discard(conn)
+
+        with self._lock:
+            can_open = self._open < self.size
+            if can_open:
+                self._open += 1
+        if can_open:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._open -= 1
+                raise
+
+        # Pool is full: wait for another thread to hand a connection back
+        conn, _ = self._idle.get(timeout=self.connect_timeout + self.send_timeout)
+        return conn
+
+    def _release(self, conn):
+        self._idle.put((conn, time.monotonic()))
+
+    def _discard(self, conn):
+        self._close(conn)
+        with self._lock:
+            self._open -= 1
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; it goes back to the pool unless it raised a connection error."""
+        conn = self._acquire()
+        try:
+            yield conn
+        except Exception as e:
+            if _is_connection_error(e):
+                self._discard(conn)
+            else:
+                self._release(conn)
+            raise
+        else:
+            self._release(conn)
+
+    def send(self, message, retries=1):
+        """
+        Send an email.message.Message, reconnecting once if the pooled
+        connection turns out to be dead.
+        """
+        attempt = 0
+        while True:
+            try:
+                with self.connection() as conn:
+                    conn.send_message(message)
+                return
+            except Exception as e:
+                if not _is_connection_error(e) or attempt >= retries:
+                    raise
+                attempt += 1
+
+    def close_all(self):
+        """Close every idle connection (used on shutdown and in benchmarks)."""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """Return the process-wide SMTP pool configured from Streamlit secrets."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                import streamlit as st
+
+                secrets = st.secrets["secrets"]
+                _transport = SmtpPool(
+                    host=secrets.get("smtp_host", "smtp.gmail.com"),
+                    port=int(secrets.get("smtp_port", 587)),
+                    username=secrets["address"],
+                    password=secrets["app_password"],
+                    size=int(secrets.get("smtp_pool_size", DEFAULT_POOL_SIZE)),
+                )
+    return _transport
@@ -0,0 +1,28 @@
+# sql_batches.py
+# Small helpers shared by the modules that write within a caller's
+# transaction (fta_ingest, fta_status, rollups). They take a Session or a
+# Connection and never open one, so importing them does not create an engine.
+
+from sqlalchemy.orm import Session
+
+# Values bound per IN (...) list, well under SQLite's bound-parameter limit
+IN_LIST_CHUNK_SIZE = 500
+
+
+def chunked(values, size=IN_LIST_CHUNK_SIZE):
+    """Yield `values` as lists of at most `size` items, e.g. one per IN (...) list."""
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def flush_pending(conn):
+    """
+    Flush a Session's pending changes so the SQL that follows sees them.
+
+    SessionLocal does not autoflush, and the refreshes read the rows their
+    caller has just added, changed or deleted. A Connection has nothing
+    pending and is left alone.
+    """
+    if isinstance(conn, Session):
+        conn.flush()
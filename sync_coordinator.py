@@ -0,0 +1,169 @@
+# sync_coordinator.py
+# Process-wide, single-flight wrapper around the Google Sheet sync.
+#
+# Streamlit runs every browser session as a thread inside the same server
+# process, so state kept on this module (rather than in st.session_state) is
+# shared by everyone who is logged in.
+
+import logging
+import threading
+import time
+from dataclasses import replace
+
+from fta_snapshot import EMPTY_SNAPSHOT, build_snapshot
+
+logger = logging.getLogger(__name__)
+
+# How long a successful sync is served before the next request refreshes it
+# in the background.
+SYNC_MIN_INTERVAL_SECONDS = 300
+
+
+class SyncCoordinator:
+    """Run at most one sheet sync at a time and share its result.
+
+    Callers are served whatever data exists instead of waiting for the sheet
+    (stale-while-revalidate):
+
+    - Data synced within ``min_interval`` seconds is returned as is.
+    - Older data is returned as is while a background thread syncs.
+    - A fresh process with nothing in memory serves the last sheet pull
+      cached on disk (sheet_cache.py) and syncs in the background.
+    - Only when there is no data at all does the caller wait for the sync;
+      sessions arriving meanwhile wait for that same sync.
+    - A failed or empty sync never replaces the last good snapshot.
+
+    Each successful sync is normalized once into a new, versioned
+    fta_snapshot.FtaSnapshot that every session shares by reference.
+    """
+
+    def __init__(self, sync_func=None, min_interval=SYNC_MIN_INTERVAL_SECONDS):
+        self._sync_func = sync_func
+        self._min_interval = min_interval
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+        self._in_flight = False
+        self._snapshot = EMPTY_SNAPSHOT
+        self._last_success_at = None
+        self._last_error = None
+
+    def _run_sync(self, gsheet_url):
+        sync_func = self._sync_func
+        if sync_func is None:
+            # Imported lazily so this module stays cheap to import.
+            from db import sync_and_assign_fta_responses
+            sync_func = sync_and_assign_fta_responses
+        return sync_func(gsheet_url)
+
+    def _is_fresh(self):
+        return (
+            not self._snapshot.empty
+            and self._last_success_at is not None
+            and time.monotonic() - self._last_success_at < self._min_interval
+        )
+
+    def _snapshot_from_cache(self, gsheet_url):
+        from fta_ingest import dedupe_sheet_rows
+        from sheet_cache import load_cached_sheet
+        cached = load_cached_sheet(gsheet_url)
+        if cached is None or cached.df.empty:
+            return None
+        # The same rows a sync would publish: no repeated or missing FTA IDs
+        df, _ = dedupe_sheet_rows(cached.df)
+        if df.empty:
+            return None
+        logger.info("Serving the sheet cached at %s while it refreshes.", f"{cached.fetched_at:%Y-%m-%d %H:%M:%S}")
+        return build_snapshot(0, df)
+
+    def _sync_and_publish(self, gsheet_url):
+        """Run the sync and publish its snapshot; the caller must have set _in_flight."""
+        snapshot, error = None, None
+        try:
+            df = self._run_sync(gsheet_url)
+            if df is not None and not df.empty:
+                # Normalize once here instead of once per session
+                snapshot = build_snapshot(0, df)
+                # Rows are published even if writing them failed; the error is still reported
+                error = df.attrs.get("sync_error")
+            else:
+                error = "the sync returned no data (see Recent Sync Runs on the Manage A-Team page)"
+        except Exception as e:
+            error = str(e)
+            logger.exception("Sync failed, serving last good data: %s", e)
+        finally:
+            with self._lock:
+                self._last_error = error
+                if snapshot is not None:
+                    # Numbered under the lock, as the cached sheet may have been published meanwhile
+                    self._snapshot = replace(snapshot, version=self._snapshot.version + 1)
+                    self._last_success_at = time.monotonic()
+                self._in_flight = False
+                self._finished.notify_all()
+
+    def _start_background_sync(self, gsheet_url):
+        thread = threading.Thread(target=self._sync_and_publish, args=(gsheet_url,),
+                                  name="sheet-sync", daemon=True)
+        thread.start()
+
+    def get_snapshot(self, gsheet_url, force=False, refresh=True):
+        """Return the latest FtaSnapshot, refreshing it in the background when stale.
+
+        Args:
+            gsheet_url: CSV export URL of the FTA Google Sheet
+            force: True to sync now and wait for the result
+            refresh: False to never start a sync for stale data, e.g. when
+                sync_scheduler.py keeps it fresh
+        """
+        with self._lock:
+            if not force and not self._snapshot.empty:
+                if refresh and not self._in_flight and not self._is_fresh():
+                    self._in_flight = True
+                    self._start_background_sync(gsheet_url)
+                return self._snapshot
+            if self._in_flight:
+                while self._in_flight and (force or self._snapshot.empty):
+                    self._finished.wait()
+                return self._snapshot
+            self._in_flight = True
+
+        if not force:
+            try:
+                snapshot = self._snapshot_from_cache(gsheet_url)
+            except Exception as e:
+                logger.warning("Could not load the cached sheet: %s", e)
+                snapshot = None
+            if snapshot is not None:
+                # Still stale (_last_success_at is unset) until the refresh lands
+                with self._lock:
+                    self._snapshot = snapshot = replace(snapshot, version=self._snapshot.version + 1)
+                    self._finished.notify_all()
+                self._start_background_sync(gsheet_url)
+                return snapshot
+
+        self._sync_and_publish(gsheet_url)
+        with self._lock:
+            return self._snapshot
+
+    def current_snapshot(self):
+        """The latest snapshot without syncing (version 0 and empty before the first sync)."""
+        with self._lock:
+            return self._snapshot
+
+    def last_error(self):
+        """Why the most recent sync failed or published nothing (None if it succeeded)."""
+        with self._lock:
+            return self._last_error
+
+    def invalidate(self):
+        """Force the next request to run a fresh sync."""
+        with self._lock:
+            self._last_success_at = None
+            self._last_error = None
+
+
+_coordinator = SyncCoordinator()
+
+
+def get_sync_coordinator():
+    """Return the coordinator shared by every session in this process."""
+    return _coordinator
@@ -0,0 +1,95 @@
+# sync_journal.py
+# Records every sheet sync in the sync_runs table: what it did (rows, emails,
+# assignments) and how long each phase took, so the admin page can show how
+# the sync behaves as the sheet grows.
+
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from db_session import get_session
+from models import SyncRun
+
+logger = logging.getLogger(__name__)
+
+PHASES = ("fetch", "parse", "hash", "upsert", "assign", "email")
+
+# Runs older than this are deleted when a new run is recorded
+JOURNAL_RETENTION_DAYS = 90
+
+COUNTERS = (
+    "rows_fetched", "rows_inserted", "rows_updated", "rows_skipped",
+    "rows_rejected", "emails_queued", "assignments_made",
+)
+
+
+class SyncJournal:
+    """
+    Collects the timings and counts of one sync run.
+
+    Usage:
+        journal = SyncJournal()
+        with journal.phase("fetch"):
+            ...
+        journal.count(rows_fetched=len(df))
+        journal.finish()            # or journal.finish(error="...")
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.timings = defaultdict(float)
+        self.counts = dict.fromkeys(COUNTERS, 0)
+        self.sheet_modified = None
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block; a phase entered more than once adds up."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += (time.perf_counter() - started) * 1000
+
+    def count(self, **counts):
+        self.counts.update(counts)
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self._started) * 1000
+
+    def finish(self, error=None):
+        """
+        Write the run to sync_runs. A journal failure is logged, never raised,
+        so it can't fail the sync it describes.
+
+        Args:
+            error: Why the sync failed (None if it succeeded)
+
+        Returns:
+            The SyncRun row, or None if it could not be written
+        """
+        run = SyncRun(
+            started_at=self.started_at,
+            finished_at=datetime.now(),
+            status="failed" if error else "success",
+            error=error,
+            sheet_modified=self.sheet_modified,
+            total_ms=self.elapsed_ms(),
+            **self.counts,
+            **{f"{name}_ms": self.timings[name] for name in PHASES},
+        )
+        try:
+            with get_session() as session:
+                session.query(SyncRun).filter(
+                    SyncRun.started_at < self.started_at - timedelta(days=JOURNAL_RETENTION_DAYS)
+                ).delete(synchronize_session=False)
+                session.add(run)
+                session.commit()
+                session.refresh(run)
+                session.expunge(run)
+        except Exception as e:
+            logger.error("Could not record the sync run: %s", e)
+            return None
+        return run
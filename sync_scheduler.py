@@ -0,0 +1,134 @@
+# sync_scheduler.py
+# Runs the Google Sheet sync (which also assigns new FTAs and sends the
+# welcome emails) on a timer in a background thread, so the data stays fresh
+# even when nobody is logged in and page renders never run a sync themselves.
+#
+# Started once per process by bootstrap.start_sync_scheduler(). Interval is
+# read from secrets["secrets"]["sync_interval_minutes"] (default below).
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_MINUTES = 10
+# Each wait is the interval +/- this fraction, so several app instances
+# pointed at the same sheet don't all pull it at the same moment
+JITTER_FRACTION = 0.1
+# The first run waits this long, so it doesn't compete with the first page
+# render of a fresh process (it imports pandas and does the heavy work)
+FIRST_RUN_DELAY_SECONDS = 5
+
+
+class SyncScheduler:
+    """
+    One background thread that syncs the sheet every interval.
+
+    The first run starts FIRST_RUN_DELAY_SECONDS after the thread. request_run() wakes the
+    thread for an extra run; requests that arrive while a run is going are
+    folded into a single follow-up run.
+    """
+
+    def __init__(self, interval_minutes=DEFAULT_INTERVAL_MINUTES, jitter=JITTER_FRACTION):
+        self.interval = timedelta(minutes=interval_minutes)
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._gsheet_url = None
+        self._running = False
+        self._next_run_at = None
+        self._last_run = None
+
+    def start(self, gsheet_url):
+        """Start the thread (a no-op if it is already running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._gsheet_url = gsheet_url
+            self._thread = threading.Thread(target=self._loop, name="sync-scheduler", daemon=True)
+            self._thread.start()
+        logger.info("Syncing the sheet every %s (±%.0f%%).", self.interval, self.jitter * 100)
+        return True
+
+    def request_run(self):
+        """Ask for a sync as soon as possible, without waiting for it."""
+        with self._lock:
+            self._next_run_at = datetime.now()
+        self._wake.set()
+
+    def status(self):
+        """
+        What the scheduler is doing, for the admin page.
+
+        Returns:
+            Dict with running, next_run_at and last_run (None before the first
+            run, else a dict with started_at, duration, rows and error)
+        """
+        with self._lock:
+            return {
+                "running": self._running,
+                "next_run_at": self._next_run_at,
+                "last_run": dict(self._last_run) if self._last_run else None,
+            }
+
+    def _next_delay(self):
+        seconds = self.interval.total_seconds()
+        return max(1.0, seconds + random.uniform(-self.jitter, self.jitter) * seconds)
+
+    def _run_once(self):
+        # Imported here so starting the scheduler doesn't pull pandas into the login page
+        from sync_coordinator import get_sync_coordinator
+
+        started_at = datetime.now()
+        started = time.perf_counter()
+        rows, error = None, None
+        with self._lock:
+            self._running = True
+        try:
+            coordinator = get_sync_coordinator()
+            snapshot = coordinator.get_snapshot(self._gsheet_url, force=True)
+            rows = len(snapshot.responses)
+            error = coordinator.last_error()
+        except Exception as e:
+            error = str(e)
+            logger.exception("Sync failed: %s", e)
+        finally:
+            with self._lock:
+                self._running = False
+                self._last_run = {
+                    "started_at": started_at,
+                    "duration": time.perf_counter() - started,
+                    "rows": rows,
+                    "error": error,
+                }
+
+    def _loop(self):
+        with self._lock:
+            self._next_run_at = datetime.now() + timedelta(seconds=FIRST_RUN_DELAY_SECONDS)
+        self._wake.wait(timeout=FIRST_RUN_DELAY_SECONDS)
+        while True:
+            # Clear before running: a request made during the run wakes the next wait
+            self._wake.clear()
+            self._run_once()
+            delay = self._next_delay()
+            with self._lock:
+                if not self._wake.is_set():
+                    self._next_run_at = datetime.now() + timedelta(seconds=delay)
+            self._wake.wait(timeout=delay)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_sync_scheduler(interval_minutes=DEFAULT_INTERVAL_MINUTES):
+    """Return the scheduler shared by every session (created on first call)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SyncScheduler(interval_minutes)
+        return _scheduler
@@ -282,11 +282,16 @@ from db import (get_all_a_team_members, add_a_team_member, get_email_logs,
 from reset_db import reset_database
 import os
 from sqlalchemy import select
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from models import FtaAssignments, ATeamMember, Feedback
+from models import FtaAssignments, ATeamMember, Feedback, SyncRun
 from sqlalchemy import func
-from db_session import get_session
+from db_session import get_session, database_snapshot, DB_FILE
+from page_metrics import assignment_summary, feedback_breakdown, feedback_delete_options
+from fta_status import get_contact_counts, refresh_fta_status
+from queries import get_feedback, get_feedback_members, get_feedback_rollup
+from rollups import days_of, refresh_feedback_days
+from sync_coordinator import get_sync_coordinator
+from sync_scheduler import get_sync_scheduler
+from sync_journal import PHASES
 
 
 def show_team_page(go_to):
@@ -295,16 +300,14 @@ def show_team_page(go_to):
         st.stop()
 
     # Database setup
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    DB_FILE = os.path.join(BASE_DIR, "database", "fta.db")
     st.write(f"Using SQLite database at: {DB_FILE}")
-    os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+    # The engine's pool is shared by every session, so hand the connection
+    # back even when the page stops early with st.stop() / st.rerun()
+    with get_session() as session:
+        _render_team_page(go_to, session)
 
-    DB_PATH = f"sqlite:///{DB_FILE}"
-    engine = create_engine(DB_PATH, connect_args={"check_same_thread": False})
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    
+
+def _render_team_page(go_to, session):
     st.markdown("### 👥 A-Team Management")
 
     col1, col2 = st.columns(2)
@@ -347,12 +350,84 @@ def show_team_page(go_to):
         .all()
     )
     fta_counts = pd.DataFrame(fta_count, columns=["email", "fta_count"])
-    assignments_df = pd.read_sql(select(FtaAssignments), session.bind)
 
     # Merge carefully
     members_df = pd.merge(members_df, fta_counts, on="email", how="left")
     members_df["fta_count"] = members_df["fta_count"].fillna(0).astype(int)
 
+    # === Google Sheet Sync ===
+    st.markdown("---")
+    with st.expander("##### 🔃 Google Sheet Sync"):
+        scheduler = get_sync_scheduler()
+        status = scheduler.status()
+        last_run = status["last_run"]
+        snapshot = get_sync_coordinator().current_snapshot()
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Sync interval", f"{scheduler.interval.total_seconds() / 60:g} min")
+        col2.metric("Last sync", last_run["started_at"].strftime("%H:%M:%S") if last_run else "—")
+        col3.metric("Next sync", "running" if status["running"] else
+                    status["next_run_at"].strftime("%H:%M:%S") if status["next_run_at"] else "—")
+
+        if last_run and last_run["error"]:
+            st.error(f"Last sync failed after {last_run['duration']:.1f}s: {last_run['error']}")
+        elif last_run:
+            st.caption(f"Last sync took {last_run['duration']:.1f}s; "
+                       f"{len(snapshot.responses)} FTA responses loaded (snapshot v{snapshot.version}).")
+
+        # Only queues a run; the scheduler thread does the work
+        if st.button("🔃 Sync now"):
+            scheduler.request_run()
+            st.success("Sync queued. New data shows up on the next page load once it finishes.")
+
+        # === Sync run history (sync_runs, written by every sync) ===
+        st.markdown("###### 📈 Recent Sync Runs")
+        run_limit = st.number_input("Runs to show", min_value=5, max_value=500, value=50, step=5)
+        runs_df = pd.read_sql(
+            select(SyncRun).order_by(SyncRun.started_at.desc()).limit(int(run_limit)),
+            session.bind,
+        ).sort_values("started_at")
+
+        if runs_df.empty:
+            st.info("No sync runs recorded yet.")
+        else:
+            timing_col, rows_col = st.columns(2)
+            with timing_col:
+                # One stacked bar per run, so a phase that grows with the sheet stands out
+                fig_phases = go.Figure([
+                    go.Bar(x=runs_df["started_at"], y=runs_df[f"{phase}_ms"], name=phase)
+                    for phase in PHASES
+                ])
+                fig_phases.update_layout(
+                    barmode="stack",
+                    title_text="Sync Duration by Phase",
+                    xaxis_title="",
+                    yaxis_title="Milliseconds"
+                )
+                st.plotly_chart(fig_phases, use_container_width=True)
+
+            with rows_col:
+                fig_rows = go.Figure([
+                    go.Scatter(x=runs_df["started_at"], y=runs_df[column], mode="lines+markers", name=label)
+                    for column, label in [("rows_fetched", "Fetched"), ("rows_inserted", "Inserted"),
+                                          ("rows_updated", "Updated"), ("assignments_made", "Assigned")]
+                ])
+                fig_rows.update_layout(
+                    title_text="Rows per Sync",
+                    xaxis_title="",
+                    yaxis_title="Rows"
+                )
+                st.plotly_chart(fig_rows, use_container_width=True)
+
+            st.dataframe(
+                runs_df.sort_values("started_at", ascending=False)[[
+                    "started_at", "status", "total_ms", "rows_fetched", "rows_inserted", "rows_updated",
+                    "rows_skipped", "rows_rejected", "emails_queued", "assignments_made", "error",
+                ]],
+                use_container_width=True,
+                hide_index=True,
+            )
+
     # === Manage Active/Inactive Status ===
     st.markdown("---")
     with st.expander("##### 🔄 Manage A-Team Member Availability"):
@@ -463,17 +538,11 @@ def show_team_page(go_to):
             else:
                 st.info("No inactive members")
 
-    # --- Load members and assignments ---
-    assignments_df = pd.read_sql(select(FtaAssignments), session.bind)
-    all_feedback = pd.read_sql(select(Feedback), session.bind)
+    # --- Feedback is read per date window below; assigned / contacted counts come from fta_status ---
+    feedback_members = get_feedback_members(session)
 
-    if all_feedback.empty:
+    if not feedback_members:
         st.write("✅ No feedback has been submitted yet.")
-        contacted_ids = []
-    else:
-        all_feedback["submitted_at"] = pd.to_datetime(all_feedback["submitted_at"], errors="coerce")
-        all_feedback["Feedback_id"] = all_feedback["fta_id"] + " - " + all_feedback["call_type"]
-        contacted_ids = all_feedback["fta_id"].unique()
 
     st.markdown("---")
     st.markdown("##### Summary of Assigned & Contacted Calls")
@@ -483,7 +552,6 @@ def show_team_page(go_to):
         st.write("")
     with col2:
         min_date_str = "01/01/2025"
-        assignments_df["assigned_at"] = pd.to_datetime(assignments_df["assigned_at"], errors="coerce")
         min_date = datetime.strptime(min_date_str, "%m/%d/%Y").date()
         max_date = datetime.today().date()
         start_date = st.date_input("Start Date",
@@ -500,58 +568,12 @@ def show_team_page(go_to):
     with col4:
         selected_member = st.selectbox(
             label="Filter by A-Team Member",
-            options=["All"] + assignments_df["assigned_to"].dropna().drop_duplicates().tolist()
+            options=["All"] + fta_counts["email"].dropna().tolist()
         )
 
-    # Filter by date
-    filtered_df = assignments_df[
-        (assignments_df["assigned_at"].dt.date >= start_date) &
-        (assignments_df["assigned_at"].dt.date <= end_date)
-    ]
-
-    # Filter by selected A-Team member
-    if selected_member != "All":
-        filtered_df = filtered_df[filtered_df["assigned_to"] == selected_member]
-
     # --- Compute assignment summary (showing ALL members including inactive) ---
-    summary_data = []
-
-    for _, member in members_df.iterrows():
-        email = member["email"]
-        if member.get("name"):
-            full_name = member["name"]
-        else:
-            full_name = email.split("@")[0].split(".")[0].capitalize()
-
-        # Get all assignments for the current member
-        member_ftas = filtered_df[filtered_df["assigned_to"] == email]
-        total = len(member_ftas)
-        contacted = member_ftas["fta_id"].isin(contacted_ids).sum()
-        not_contacted = total - contacted
-        
-        # Add status indicator
-        status = "🟢 Active" if member.get('is_active', True) else "🔴 Inactive"
-
-        summary_data.append({
-            "Email": email,
-            "Name": full_name,
-            "Status": status,
-            "Total Assigned": total,
-            "Contacted": contacted,
-            "Not Contacted": not_contacted
-        })
-
-    # --- Convert to DataFrame and show ---
-    expected_cols = ["Email", "Name", "Status", "Total Assigned", "Contacted", "Not Contacted"]
-    summary_df = pd.DataFrame(summary_data)
-
-    # Ensure DataFrame has the expected columns
-    for col in expected_cols:
-        if col not in summary_df.columns:
-            if col in ["Total Assigned", "Contacted", "Not Contacted"]:
-                summary_df[col] = 0
-            elif col == "Status":
-                summary_df[col] = "🟢 Active"
+    contact_counts = get_contact_counts(session, start_date, end_date, selected_member)
+    summary_df = assignment_summary(members_df, contact_counts)
 
     # Compute totals safely
     total_assigned = summary_df["Total Assigned"].sum()
@@ -652,22 +674,17 @@ def show_team_page(go_to):
         with col4:
             selected_member = st.selectbox(
             label="Filter by A-Team Member",
-            options=["All"] + all_feedback["email"].dropna().drop_duplicates().tolist()
+            options=["All"] + feedback_members
         )
     
-        # Filter by date
-        filtered_df = all_feedback[
-            (all_feedback["submitted_at"].dt.date >= start_date) &
-            (all_feedback["submitted_at"].dt.date <= end_date)
-        ]
-    
-        # Filter by selected A-Team member
-        if selected_member != "All":
-            filtered_df = filtered_df[filtered_df["email"] == selected_member]
+        # Read only the selected window (and member); the charts sum the daily rollups
+        member = None if selected_member == "All" else selected_member
+        filtered_df = get_feedback(session, start_date, end_date, member)
+        feedback_counts = feedback_breakdown(get_feedback_rollup(session, start_date, end_date, member))
     
         calltype, callsuccess, feedback = st.columns(3)
         with calltype:
-            call_type = filtered_df["call_type"].value_counts().to_dict()
+            call_type = feedback_counts["call_type"]
     
             if call_type:
                 labels = list(call_type.keys())
@@ -694,7 +711,7 @@ def show_team_page(go_to):
                 st.info("No type of calls recorded yet.")
         
         with callsuccess:
-            call_success = filtered_df["call_success"].value_counts().to_dict()
+            call_success = feedback_counts["call_success"]
     
             if call_success:
                 labels = list(call_success.keys())
@@ -721,7 +738,7 @@ def show_team_page(go_to):
                 st.info("No successful calls made yet.")
         
         with feedback:
-            call_feedback = filtered_df["feedback_1"].value_counts().to_dict()
+            call_feedback = feedback_counts["feedback_1"]
     
             if call_feedback:
                 labels = list(call_feedback.keys())
@@ -755,17 +772,11 @@ def show_team_page(go_to):
         st.markdown("###### ❌ Delete Feedback from A-Team Members")
     
         # Ensure there's a primary key column for deletion (id), otherwise fallback
-        if "id" not in all_feedback.columns:
+        if "id" not in filtered_df.columns:
             st.warning("Feedback table must include an 'id' column for proper deletion.")
         else:
-            # Create display labels for multiselect
-            all_feedback["display_label"] = all_feedback.apply(
-                lambda row: f"{row['fta_id']} - {row['call_type']} - {row['submitted_at'].strftime('%Y-%m-%d %H:%M') if pd.notnull(row['submitted_at']) else 'N/A'}",
-                axis=1
-            )
-    
-            # Build options as a dictionary: display_label -> id
-            delete_options = {row["display_label"]: row["id"] for _, row in all_feedback.iterrows()}
+            # Build options as a dictionary: display label -> id (feedback in the window above)
+            delete_options = feedback_delete_options(filtered_df)
     
             selected_labels = st.multiselect(
                 "Select Feedback to Delete:",
@@ -789,7 +800,11 @@ def show_team_page(go_to):
                     selected_ids = [delete_options[label] for label in selected_labels]
                     
                     with get_session() as session:
+                        deleted = session.query(Feedback.fta_id, Feedback.submitted_at).filter(
+                            Feedback.id.in_(selected_ids)).all()
                         session.query(Feedback).filter(Feedback.id.in_(selected_ids)).delete(synchronize_session=False)
+                        refresh_fta_status(session, [fta_id for fta_id, _ in deleted])
+                        refresh_feedback_days(session, days_of(submitted_at for _, submitted_at in deleted))
                         session.commit()
                     
                     st.success(f"Deleted {len(selected_ids)} feedback record(s).")
@@ -858,6 +873,7 @@ def show_team_page(go_to):
                 with get_session() as session:
                     for fta_id in selected_ftas:
                         session.query(FtaAssignments).filter(FtaAssignments.fta_id == fta_id).delete()
+                    refresh_fta_status(session, selected_ftas)
                     session.commit()
 
                 st.success(f"{len(selected_ftas)} FTA(s) deleted.")
@@ -977,6 +993,7 @@ def show_team_page(go_to):
                                 if assignment:
                                     assignment.assigned_to = new_member
                                     assignment.assigned_at = datetime.now()  # use datetime object, not string
+                            refresh_fta_status(session, selected_ftas)
                             session.commit()
                         st.success(f"{len(selected_ftas)} FTA(s) reassigned from {selected_source_member} to {new_member}.")
                         st.experimental_rerun()
@@ -1237,11 +1254,10 @@ def show_team_page(go_to):
     except Exception as e:
         st.warning("⚠️ No feedback data available at the moment.")
     # Provide download button in the app for the actual DB file
-    with open(DB_FILE, "rb") as f:
-        db_bytes = f.read()
+    # (the copy is only made when the button is clicked)
     st.download_button(
         label="Download Current SQLite Database",
-        data=db_bytes,
+        data=database_snapshot,
         file_name="fta.db",
         mime="application/octet-stream"
     )